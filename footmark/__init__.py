@@ -1,26 +1,73 @@
 #
 import logging
-import logging.config
 import os
-
-from footmark.pyami.config import Config, FootmarkLoggingConfig, DefaultLoggingConfig
+import threading
 
 __version__ = '1.1.17'
 Version = __version__  # for backware compatibility
 
+# The default endpoints file, see footmark.regioninfo.
+ENDPOINTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'endpoints.json')
+
+_logging_lock = threading.Lock()
+_logging_initialized = False
+
 
 def init_logging():
-    try:
-        Config().init_config()
+    """
+    Configure the footmark logger, with its handlers behind a queue. Runs
+    once, on the first use of :data:`log`, so that importing footmark has
+    no side effects.
+    """
+    global _logging_initialized
+    with _logging_lock:
+        if _logging_initialized:
+            return
+        _logging_initialized = True
+        import logging.config
+        from footmark.pyami.config import Config, FootmarkLoggingConfig, DefaultLoggingConfig
         try:
-            logging.config.fileConfig(os.path.expanduser(FootmarkLoggingConfig))
+            Config().init_config()
+            try:
+                logging.config.fileConfig(os.path.expanduser(FootmarkLoggingConfig))
+            except:
+                logging.config.dictConfig(DefaultLoggingConfig)
         except:
-            logging.config.dictConfig(DefaultLoggingConfig)
-    except:
-        pass
+            pass
+        from footmark.logs import use_queue_handler
+        use_queue_handler(logging.getLogger('footmark'))
+
+
+class LazyLogger(object):
+    """
+    Stands for the ``footmark`` logger and sets up logging on first use.
+    """
 
-init_logging()
-log = logging.getLogger('footmark')
+    def __init__(self, name):
+        self._name = name
+        self._logger = None
+
+    def __getattr__(self, name):
+        if self._logger is None:
+            init_logging()
+            self._logger = logging.getLogger(self._name)
+        return getattr(self._logger, name)
+
+
+log = LazyLogger('footmark')
+
+
+def profile():
+    """
+    Return a :class:`footmark.profiler.Profiler`, to use as a context
+    manager around the connection calls to profile::
+
+        with footmark.profile() as profiler:
+            conn.get_all_instances()
+        profiler.write_folded('instances.folded')
+    """
+    from footmark.profiler import Profiler
+    return Profiler()
 
 
 def connect_ecs(acs_access_key_id=None, acs_secret_access_key=None, **kwargs):
@@ -0,0 +1,138 @@
+"""
+Builds typed columns from the normalized items of a listing, without
+creating a model object per item.
+"""
+import array
+
+import six
+
+# NumPy is imported when the first numeric column is built, see _numpy().
+NotImported = object()
+numpy = NotImported
+
+try:
+    array.array('q')
+    Int64Code = 'q'
+except ValueError:
+    Int64Code = 'l'
+
+
+class Columns(dict):
+    """
+    A dict mapping each field name to its column. ``size`` is the number
+    of rows; every column has that length.
+
+    Numeric columns are NumPy arrays, or ``array.array`` when NumPy is not
+    installed: int64 when every row has an integer, float64 with NaN for
+    missing values otherwise, and bool when every row has a boolean. String
+    columns are lists in which equal values share one string object. Any
+    other column, e.g. nested tags, is a plain list with None for missing
+    values.
+    """
+
+    def __init__(self, columns=None, size=0):
+        super(Columns, self).__init__(columns or {})
+        self.size = size
+
+    def __repr__(self):
+        return 'Columns(%d rows: %s)' % (self.size, ', '.join(sorted(self)))
+
+
+class ColumnBuilder(object):
+    """
+    Collects items row by row into per-field value lists, and converts them
+    to typed columns in :meth:`build`.
+
+    :type fields: list
+    :param fields: The snake_cased field names to keep. All fields seen in
+        any row are kept by default.
+    """
+
+    def __init__(self, fields=None):
+        self.fields = list(fields) if fields is not None else None
+        self.size = 0
+        self._values = dict((name, []) for name in self.fields or ())
+        self._order = list(self.fields or ())
+
+    def add(self, row):
+        values = self._values
+        if self.fields is None:
+            for name in row:
+                if name not in values:
+                    values[name] = [None] * self.size
+                    self._order.append(name)
+            for name, column in values.items():
+                column.append(row.get(name))
+        else:
+            for name in self.fields:
+                values[name].append(row.get(name))
+        self.size += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def build(self):
+        """
+        :rtype: :class:`Columns`
+        """
+        return Columns(dict((name, typed_column(self._values[name])) for name in self._order), self.size)
+
+
+def build_columns(rows, fields=None):
+    """
+    Build a :class:`Columns` from a list of normalized item dicts.
+    """
+    builder = ColumnBuilder(fields)
+    builder.extend(rows)
+    return builder.build()
+
+
+def typed_column(values):
+    """
+    Convert a list of values to the column type described in :class:`Columns`.
+    """
+    kinds = set()
+    missing = False
+    for value in values:
+        if value is None:
+            missing = True
+        elif isinstance(value, bool):
+            kinds.add(bool)
+        elif isinstance(value, six.integer_types):
+            kinds.add(int)
+        elif isinstance(value, float):
+            kinds.add(float)
+        elif isinstance(value, six.string_types):
+            kinds.add(str)
+        else:
+            kinds.add(object)
+
+    if kinds == set([str]):
+        canonical = {}
+        return [canonical.setdefault(value, value) if value is not None else None for value in values]
+    if kinds == set([bool]) and not missing:
+        return numeric_column(values, bool)
+    if kinds == set([int]) and not missing:
+        return numeric_column(values, int)
+    if kinds and kinds <= set([int, float]):
+        return numeric_column([float('nan') if value is None else value for value in values], float)
+    return values
+
+
+def _numpy():
+    global numpy
+    if numpy is NotImported:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+
+def numeric_column(values, kind):
+    numpy = _numpy()
+    if numpy is not None:
+        dtype = {bool: numpy.bool_, int: numpy.int64, float: numpy.float64}[kind]
+        return numpy.array(values, dtype=dtype)
+    return array.array({bool: 'b', int: Int64Code, float: 'd'}[kind], values)
@@ -1,26 +1,29 @@
 # coding:utf-8
-import sys
-import time
-
-reload(sys)
-sys.setdefaultencoding("utf-8")
 """
 Handles basic connections to ACS
 """
+import time
+import warnings
 
 import footmark
-import importlib
+from footmark.columns import ColumnBuilder, build_columns
 from footmark.exception import FootmarkServerError
+from footmark.identitymap import IdentityMap
+from footmark.instrumentation import Instrumentation
+from footmark.jsonstream import Wildcard, iter_items
+from footmark.interning import DefaultInternFields, default_interner
+from footmark.logs import default_body_logger
 from footmark.provider import Provider
 import json
-import yaml
+import six
 from footmark.resultset import ResultSet
+from footmark.utils import to_native
 
-from pprint import pprint
-
-from aliyunsdkcore import client
 from aliyunsdkcore.acs_exception.exceptions import ServerException
 
+# Response key names already converted by convert_name.
+_converted_names = {}
+
 
 class ACSAuthConnection(object):
     def __init__(self, acs_access_key_id=None, acs_secret_access_key=None,
@@ -70,10 +73,32 @@ class ACSAuthConnection(object):
 
 class ACSQueryConnection(ACSAuthConnection):
     ResponseError = FootmarkServerError
+    # Logs request parameters and response bodies, see footmark.logs.BodyLogger.
+    body_logger = default_body_logger
+    _instrumentation = None
+    # Sends the requests instead of the SDK client when set, see footmark.transport.
+    transport = None
 
     def __init__(self, acs_access_key_id=None, acs_secret_access_key=None, region=None,
                  product=None, security_token=None, provider='acs',
-                 user_agent='Alicloud-Footmark-v'+footmark.__version__):
+                 user_agent='Alicloud-Footmark-v'+footmark.__version__, identity_map=False,
+                 intern_fields=None, interner=None):
+        """
+        :type identity_map: bool or :class:`footmark.identitymap.IdentityMap`
+        :param identity_map: Keep one live model object per resource: describe
+            results update the existing object in place instead of creating a
+            copy. Pass True for a map of this connection, or a map to share.
+
+        :type intern_fields: iterable
+        :param intern_fields: Response fields whose string values are interned
+            while parsing. Defaults to
+            :data:`footmark.interning.DefaultInternFields`; pass an empty
+            list to intern key names only.
+
+        :type interner: :class:`footmark.interning.Interner`
+        :param interner: The table of canonical strings. Defaults to the one
+            shared by all connections.
+        """
 
         super(ACSQueryConnection, self).__init__(
             acs_access_key_id,
@@ -85,8 +110,59 @@ class ACSQueryConnection(ACSAuthConnection):
 
         self.product = product
         self.user_agent = user_agent
+        if identity_map is True:
+            identity_map = IdentityMap()
+        self.identity_map = identity_map if isinstance(identity_map, IdentityMap) else None
+        self.intern_fields = DefaultInternFields if intern_fields is None else frozenset(intern_fields)
+        self.interner = interner or default_interner
+
+    @property
+    def instrumentation(self):
+        """
+        The :class:`footmark.instrumentation.Instrumentation` of the
+        requests of this connection, created with statistics enabled on
+        first access. Assign one to share it between connections.
+        """
+        if self._instrumentation is None:
+            self._instrumentation = Instrumentation()
+        return self._instrumentation
+
+    @instrumentation.setter
+    def instrumentation(self, instrumentation):
+        self._instrumentation = instrumentation
+
+    def stats(self):
+        """
+        Return the request statistics per (product, action, region), see
+        :meth:`footmark.instrumentation.Instrumentation.stats`.
+        """
+        return self.instrumentation.stats()
 
     def make_request(self, action, params=None):
+        self.body_logger.log_request(action, params)
+        instrumentation = self._instrumentation
+        call = instrumentation.start(self.product, action, self.region, params) if instrumentation else None
+        try:
+            if self.transport is not None:
+                body = self.transport.request(self, action, params)
+            else:
+                body = self.send_request(action, params, call)
+        except Exception as e:
+            if call is not None:
+                instrumentation.finish(call, error=e)
+            raise
+        if call is not None:
+            instrumentation.finish(call, body=body)
+        return body
+
+    def send_request(self, action, params=None, call=None):
+        """
+        Send a request with the SDK client, retrying while the server is
+        unreachable, and return the response body. ``call`` is the
+        :class:`footmark.instrumentation.RequestCall` counting the retries.
+        """
+        import importlib
+        from aliyunsdkcore import client
         conn = client.AcsClient(self.acs_access_key_id, self.acs_secret_access_key, self.region, user_agent=self.user_agent)
         if not conn:
             footmark.log.error('%s %s' % ('Null AcsClient ', conn))
@@ -107,9 +183,11 @@ class ACSQueryConnection(ACSAuthConnection):
                             request.add_query_param(k[4:], v)
                 return conn.do_action_with_exception(request)
             except Exception as e:
-                if str(e.error_code) == "SDK.ServerUnreachable" \
-                        or str(e.message).__contains__("SDK.ServerUnreachable") \
-                        or str(e.message).__contains__("Unable to connect server: timed out"):
+                if str(getattr(e, 'error_code', None)) == "SDK.ServerUnreachable" \
+                        or to_native(getattr(e, 'message', e)).__contains__("SDK.ServerUnreachable") \
+                        or to_native(getattr(e, 'message', e)).__contains__("Unable to connect server: timed out"):
+                    if call is not None:
+                        call.retries += 1
                     time.sleep(delay)
                     timeout -= delay
                     continue
@@ -118,17 +196,19 @@ class ACSQueryConnection(ACSAuthConnection):
         return None
 
     def build_list_params(self, params, items, label):
-        params['set_%s' % label] = str(items).strip()
+        params['set_%s' % label] = to_native(items).strip()
 
     def parse_response(self, markers, body, connection):
+        import yaml
         results = []
         body = yaml.safe_load(body)
         if not markers:
             markers = ["", ResultSet]
 
-        result_set = ResultSet
-        if not markers[0] and markers[1] is not ResultSet:
+        if not markers[0]:
             result_set = markers[1](connection)
+        else:
+            result_set = ResultSet(connection)
 
         for key, value in body.items():
             self.parse_value(value)
@@ -138,15 +218,9 @@ class ACSQueryConnection(ACSAuthConnection):
             for value in getattr(result_set, self.convert_name(markers[0])).itervalues():
                 if isinstance(value, list):
                     for sub_value in value:
-                        element = markers[1](connection)
-                        for k, v in sub_value.items():
-                            setattr(element, k, v)
-                        results.append(element)
+                        results.append(self.build_element(markers[1], sub_value, connection))
                 elif isinstance(value, dict):
-                    element = markers[1](connection)
-                    for k, v in value.items():
-                        setattr(element, k, v)
-                    results.append(element)
+                    results.append(self.build_element(markers[1], value, connection))
                 else:
                     element = markers[1](connection)
                     setattr(element, k, v)
@@ -154,24 +228,41 @@ class ACSQueryConnection(ACSAuthConnection):
             return results
         return result_set
 
+    def build_element(self, cls, values, connection=None):
+        """
+        Build one model object of type ``cls`` from a dict of normalized
+        (already ``parse_value``-d) response fields. With an identity map the
+        fields are merged into the live object of the resource, if any.
+        """
+        element = cls(connection or self)
+        for k, v in values.items():
+            setattr(element, k, v)
+        if self.identity_map is not None:
+            return self.identity_map.merge(element)
+        return element
+
     def parse_value(self, value):
         if isinstance(value, list):
             for item in value:
                 self.parse_value(item)
         if isinstance(value, dict):
-            for k, v in value.items():
+            intern_fields = self.intern_fields
+            for k, v in list(value.items()):
                 if isinstance(v, dict) or isinstance(v, list):
                     self.parse_value(v)
-                else:
+                name = self.convert_name(k)
+                if name in intern_fields and isinstance(v, six.string_types):
+                    v = self.interner.intern(v)
+                if name != k:
                     value.pop(k)
-                    value[self.convert_name(k)] = v
-            for k, v in value.items():
-                value.pop(k)
-                value[self.convert_name(k)] = v
-        # setattr(element, self.convert_name(key), value)
+                value[name] = v
         return
 
     def convert_name(self, name):
+        try:
+            return _converted_names[name]
+        except (KeyError, TypeError):
+            pass
         if name:
             new_name = ''
             tmp = ''
@@ -188,48 +279,240 @@ class ACSQueryConnection(ACSAuthConnection):
             if new_name.startswith('_'):
                 new_name = new_name[1:]
 
+            new_name = self.interner.intern(new_name)
+            _converted_names[name] = new_name
             return new_name
 
+    def intern_stats(self):
+        """
+        Return the statistics of the string table, see
+        :meth:`footmark.interning.Interner.stats`.
+        """
+        return self.interner.stats()
+
+    def project_value(self, value, fields):
+        """
+        Return the normalized fields of item dict ``value`` whose converted
+        names are in ``fields``. The subtrees of the other fields are dropped
+        without being normalized.
+        """
+        projected = {}
+        for k, v in value.items():
+            name = self.convert_name(k)
+            if name not in fields:
+                continue
+            if isinstance(v, dict) or isinstance(v, list):
+                self.parse_value(v)
+            elif name in self.intern_fields and isinstance(v, six.string_types):
+                v = self.interner.intern(v)
+            projected[name] = v
+        return projected
+
+    def projection(self, cls, fields):
+        """
+        Return the set of response fields a projection on the attributes
+        ``fields`` of model class ``cls`` keeps. Aliases are resolved, and
+        the ID field of the model is always kept.
+        """
+        resolve = getattr(cls, '_resolve', None)
+        if resolve is None:
+            return frozenset(fields)
+        return frozenset([resolve(name) for name in fields] + [resolve('id')])
+
+    def iter_rows(self, markers, body, fields=None):
+        """
+        Yield the normalized item dicts listed under ``markers[0]`` of a
+        response body one by one, without decoding the whole body at once or
+        building model objects. ``body`` is the response text already read
+        by ``make_request``, so this saves the decoded copy of the response,
+        not the body itself. With ``fields``, a set of snake_cased names,
+        only those fields are kept.
+        """
+        for row in iter_items(body, [markers[0], Wildcard]):
+            if fields is not None:
+                yield self.project_value(row, fields)
+            else:
+                self.parse_value(row)
+                yield row
+
+    def parse_rows(self, markers, body, fields=None):
+        return list(self.iter_rows(markers, body, fields))
+
+    def iter_elements(self, markers, body, fields=None):
+        """
+        Like ``iter_rows``, but yield a model object of type ``markers[1]``
+        per item, set only with the attributes in ``fields`` if given.
+        """
+        if fields is not None:
+            fields = self.projection(markers[1], fields)
+        for row in self.iter_rows(markers, body, fields):
+            yield self.build_element(markers[1], row)
+
     # generics
-    def get_list(self, action, params, markers):
+    def get_list(self, action, params, markers, as_columns=False, fields=None, lazy=False, stream=None):
+        """
+        :type as_columns: bool
+        :param as_columns: Return a :class:`footmark.columns.Columns` of the
+            listed items instead of a list of model objects.
+
+        :type fields: list
+        :param fields: Only keep these fields of the listed items: the
+            attributes the model objects are built with, aliases included, or
+            with ``as_columns`` the snake_cased columns. Other fields are
+            dropped before they are normalized. Only the items under
+            ``markers[0]`` are returned.
+
+        :type lazy: bool
+        :param lazy: Return an iterator that decodes the items of the
+            response and builds their model objects one by one, instead of a
+            list. The response body is still read into memory in full before
+            the first item is returned: this only avoids decoding it as a
+            whole. Only the items under ``markers[0]`` are returned. Errors
+            raised while it is consumed are handled as in ``get_parsed``.
+
+        :type stream: bool
+        :param stream: Deprecated name of ``lazy``.
+        """
+        if stream is not None:
+            warnings.warn('The stream parameter of get_list is deprecated, use lazy.', DeprecationWarning)
+            lazy = stream
+        if as_columns:
+            columns = frozenset(fields) if fields is not None else None
+            return self.get_parsed(action, params,
+                                   lambda body: build_columns(self.iter_rows(markers, body, columns), fields))
+        if lazy:
+            return self.iter_parsed(self.get_parsed(action, params,
+                                                    lambda body: self.iter_elements(markers, body, fields)))
+        if fields is not None:
+            return self.get_parsed(action, params, lambda body: list(self.iter_elements(markers, body, fields)))
+        return self.get_parsed(action, params, lambda body: self.parse_response(markers, body, self))
+
+    def get_rows(self, action, params, markers, fields=None):
+        """
+        Like ``get_list``, but return the normalized item dicts.
+        """
+        return self.get_parsed(action, params, lambda body: self.parse_rows(markers, body, fields))
+
+    def get_parsed(self, action, params, parse):
         try:
             body = self.make_request(action, params)
-            footmark.log.debug('body= %s' % body)
-            return self.parse_response(markers, body, self)
+            self.body_logger.log_response(action, body)
+            return parse(body)
         except ServerException as e:
-            footmark.log.error('%s' % e)
+            footmark.log.error(to_native(e))
             raise self.ResponseError(e)
         except Exception as e:
-            footmark.log.error('%s' % e)
+            footmark.log.error(to_native(e))
             raise e
 
+    def iter_parsed(self, items):
+        """
+        Yield the elements of a lazily parsed response, handling the errors
+        raised while parsing it as ``get_parsed``.
+        """
+        try:
+            for item in items:
+                yield item
+        except ServerException as e:
+            footmark.log.error(to_native(e))
+            raise self.ResponseError(e)
+        except Exception as e:
+            footmark.log.error(to_native(e))
+            raise e
+
+    def iter_pages(self, action, params, markers, pagesize, max_results=None, rows=False, fields=None):
+        """
+        Yield the pages of a listing until a page shorter than ``pagesize``
+        is returned, or ``max_results`` elements were yielded. Each page is a
+        list of model objects, or of normalized item dicts with ``rows``,
+        projected on ``fields`` if given, see ``get_list``. ``params`` must
+        already carry the page size; the page number is set on a copy.
+        """
+        count = 0
+        page_number = 1
+        while True:
+            page_params = dict(params)
+            self.build_list_params(page_params, page_number, 'PageNumber')
+            if rows:
+                page = self.get_rows(action, page_params, markers, fields)
+            else:
+                page = self.get_list(action, page_params, markers, fields=fields)
+            count += len(page)
+            yield page
+            if len(page) < pagesize or (max_results is not None and count >= max_results):
+                return
+            page_number += 1
+
+    def get_paged_list(self, action, params, markers, pagesize, max_results=None, as_columns=False, fields=None):
+        """
+        Return all elements of a listing fetched page by page, see
+        ``iter_pages``. With ``as_columns`` the elements are returned as one
+        :class:`footmark.columns.Columns`. See ``get_list`` for ``fields``.
+        """
+        if as_columns:
+            builder = ColumnBuilder(fields)
+            columns = frozenset(fields) if fields is not None else None
+            for page in self.iter_pages(action, params, markers, pagesize, max_results, rows=True, fields=columns):
+                builder.extend(page)
+            return builder.build()
+        results = []
+        for page in self.iter_pages(action, params, markers, pagesize, max_results, fields=fields):
+            results.extend(page)
+        return results
+
+    def iter_paged_list(self, action, params, markers, pagesize, max_results=None, as_columns=False, fields=None):
+        """
+        Like ``get_paged_list``, but fetch each page only when the previous
+        one is consumed and decode it lazily: yield the model objects
+        one by one, or with ``as_columns`` one :class:`footmark.columns.Columns`
+        per page.
+        """
+        count = 0
+        page_number = 1
+        while True:
+            page_params = dict(params)
+            self.build_list_params(page_params, page_number, 'PageNumber')
+            if as_columns:
+                page = self.get_list(action, page_params, markers, as_columns=True, fields=fields)
+                size = page.size
+                yield page
+            else:
+                size = 0
+                for element in self.get_list(action, page_params, markers, fields=fields, lazy=True):
+                    size += 1
+                    yield element
+            count += size
+            if size < pagesize or (max_results is not None and count >= max_results):
+                return
+            page_number += 1
+
     def get_status(self, action, params):
         try:
             body = self.make_request(action, params)
-            footmark.log.debug('body= %s' % body)
-            body = json.loads(body, encoding='UTF-8')
+            self.body_logger.log_response(action, body)
+            body = json.loads(to_native(body))
             if body:
                 return True
             return False
         except ServerException as e:
-            footmark.log.error('%s' % e)
+            footmark.log.error(to_native(e))
             raise e
         except Exception as e:
-            footmark.log.error('%s' % e)
+            footmark.log.error(to_native(e))
             raise e
 
     def get_object(self, action, params, obj):
         try:
             body = self.make_request(action, params)
-            footmark.log.debug(body)
+            self.body_logger.log_response(action, body)
             markers = ["", obj]
             obj = self.parse_response(markers, body, self)
             if obj:
                 return obj
             return None
         except ServerException as e:
-            footmark.log.error('%s' % e)
+            footmark.log.error(to_native(e))
             raise e
         except Exception as e:
-            footmark.log.error('%s' % e)
+            footmark.log.error(to_native(e))
             raise e
@@ -2,6 +2,7 @@
 This module provides an interface to the Elastic Compute Service (ECS) service from Alicloud.
 """
 from footmark.ecs.connection import ECSConnection
+from footmark import regioninfo
 from footmark.regioninfo import get_regions
 
 
@@ -39,6 +40,8 @@ def get_region(region_id, **kw_params):
     """
     Find and return a :class:`footmark.ecs.regioninfo.RegionInfo` object
     given a region name.
+    Any additional keyword arguments, e.g. ``region_cls``, are passed on to
+    :func:`footmark.regioninfo.get_region`.
 
     :type: str
     :param: The name of the region.
@@ -47,7 +50,5 @@ def get_region(region_id, **kw_params):
     :return: The RegionInfo object for the given region or None if
              an invalid region name is provided.
     """
-    for region in regions(**kw_params):
-        if region.id == region_id:
-            return region
-    return None
+    kw_params.setdefault('connection_cls', ECSConnection)
+    return regioninfo.get_region('ecs', region_id, **kw_params)
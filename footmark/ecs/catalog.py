@@ -0,0 +1,239 @@
+"""
+Represents a disk-backed cache of the ECS region catalog: zones, instance
+types and instance type families.
+"""
+import copy
+import errno
+import hashlib
+import json
+import os
+import time
+
+import footmark
+from footmark.ecs.config import DefaultCatalogTTL
+from footmark.ecs.instance_type import InstanceType, InstanceTypeFamily
+from footmark.ecs.zone import Zone
+from footmark.pyami.config import UserConfigPath
+
+CatalogCachePath = os.path.join(UserConfigPath, 'catalog')
+
+# kind -> (action, response marker, id field, model class, needs RegionId)
+CatalogKinds = {
+    'zones': ('DescribeZones', 'Zones', 'zone_id', Zone, True),
+    'instance_types': ('DescribeInstanceTypes', 'InstanceTypes', 'instance_type_id', InstanceType, False),
+    'instance_type_families': ('DescribeInstanceTypeFamilies', 'InstanceTypeFamilies',
+                               'instance_type_family_id', InstanceTypeFamily, True),
+}
+
+
+def _replace(src, dst):
+    # os.rename fails over an existing file on Windows, and os.replace only
+    # exists on Python 3.
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+        return
+    if os.name == 'nt' and os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
+
+class CatalogEntry(object):
+    """
+    One cached catalog listing for a region.
+
+    :ivar items: The normalized items, in response order.
+    :ivar index: A dict mapping item ID to its position in ``items``.
+    :ivar digest: SHA1 of the canonical JSON of the listing. When an
+        expired entry is fetched again with the same digest, the listing is
+        neither re-normalized nor re-written.
+    :ivar fetched_at: The epoch time the entry was last validated.
+    """
+
+    def __init__(self, items, id_key, digest, fetched_at):
+        self.items = items
+        self.digest = digest
+        self.fetched_at = fetched_at
+        self.index = {}
+        for pos, item in enumerate(items):
+            self.index[item.get(id_key)] = pos
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+
+class CatalogStore(object):
+    """
+    Persists the rarely changing region catalog on disk so that each process
+    does not need to call ``DescribeZones``, ``DescribeInstanceTypes`` and
+    ``DescribeInstanceTypeFamilies`` again.
+
+    Every kind is stored per region and account, under
+    ``<region>/<account>/`` where the account is a hash of the access key
+    ID, as two files: ``<kind>.json`` holding the normalized items and
+    ``<kind>.meta`` holding the digest and fetch time.
+    Once an entry is older than ``ttl`` the listing is fetched again in
+    full, as these actions have no conditional requests. The digest only
+    avoids work on unchanged listings: if it matches, only the small meta
+    file is rewritten.
+
+    :type path: str
+    :param path: The cache directory, ``~/.footmark/catalog`` by default.
+
+    :type ttl: int
+    :param ttl: Seconds an entry is served before the listing is fetched
+        again. An expired entry is still served if that fetch fails.
+
+    :type persistent: bool
+    :param persistent: Set to False to keep entries in memory only.
+    """
+
+    def __init__(self, path=None, ttl=DefaultCatalogTTL, persistent=True):
+        self.path = path or CatalogCachePath
+        self.ttl = ttl
+        self.persistent = persistent
+        self._entries = {}
+
+    def _scope(self, connection):
+        # Accounts may see different zones and instance types in a region.
+        access_key = connection.access_key or ''
+        account = hashlib.sha1(access_key.encode('utf-8')).hexdigest()[:16]
+        return str(connection.region), account
+
+    def _files(self, scope, kind):
+        base = os.path.join(self.path, scope[0], scope[1], kind)
+        return base + '.json', base + '.meta'
+
+    def _load(self, scope, kind):
+        if not self.persistent:
+            return None
+        items_file, meta_file = self._files(scope, kind)
+        try:
+            with open(meta_file, 'r') as f:
+                meta = json.load(f)
+            with open(items_file, 'r') as f:
+                items = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        return CatalogEntry(items, CatalogKinds[kind][2], meta.get('digest'), meta.get('fetched_at', 0))
+
+    def _write(self, filename, data):
+        tmp = '%s.%d.tmp' % (filename, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        _replace(tmp, filename)
+
+    def _save(self, scope, kind, entry, items_changed=True):
+        if not self.persistent:
+            return
+        items_file, meta_file = self._files(scope, kind)
+        try:
+            directory = os.path.dirname(items_file)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            if items_changed:
+                self._write(items_file, entry.items)
+            self._write(meta_file, {'digest': entry.digest, 'fetched_at': entry.fetched_at})
+        except (IOError, OSError) as e:
+            footmark.log.debug('Unable to persist catalog %s/%s: %s' % (scope[0], kind, e))
+
+    def _fetch(self, connection, kind):
+        action, marker, id_key, cls, regional = CatalogKinds[kind]
+        params = {}
+        if regional:
+            connection.build_list_params(params, connection.region, 'RegionId')
+        body = json.loads(connection.make_request(action, params))
+        listing = body.get(marker) or {}
+        digest = hashlib.sha1(json.dumps(listing, sort_keys=True).encode('utf-8')).hexdigest()
+        items = []
+        for value in listing.values():
+            if isinstance(value, list):
+                items.extend(value)
+            elif isinstance(value, dict):
+                items.append(value)
+        return items, digest
+
+    def invalidate(self, region=None, kind=None):
+        """
+        Drop in-memory and on-disk entries, for all regions and kinds by default.
+        """
+        kinds = [kind] if kind else list(CatalogKinds.keys())
+        for key in list(self._entries):
+            if (region is None or key[0][0] == str(region)) and key[1] in kinds:
+                del self._entries[key]
+        if not self.persistent:
+            return
+        if region is not None:
+            regions = [str(region)]
+        elif os.path.isdir(self.path):
+            regions = os.listdir(self.path)
+        else:
+            regions = []
+        for r in regions:
+            directory = os.path.join(self.path, r)
+            accounts = os.listdir(directory) if os.path.isdir(directory) else []
+            for account in accounts:
+                for k in kinds:
+                    for filename in self._files((r, account), k):
+                        try:
+                            os.remove(filename)
+                        except OSError as e:
+                            if e.errno != errno.ENOENT:
+                                raise
+
+    def entry(self, connection, kind):
+        """
+        Return the valid :class:`CatalogEntry` of ``kind`` for the connection's
+        region, loading it from disk or fetching it when missing or expired.
+        """
+        if kind not in CatalogKinds:
+            raise ValueError('Unknown catalog kind %s' % kind)
+        key = (self._scope(connection), kind)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(*key)
+        if entry is not None and entry.age() < self.ttl:
+            self._entries[key] = entry
+            return entry
+
+        try:
+            items, digest = self._fetch(connection, kind)
+        except Exception as e:
+            if entry is None:
+                raise
+            footmark.log.warn('Unable to revalidate catalog %s/%s, serving stale data: %s' % (key[0][0], kind, e))
+            self._entries[key] = entry
+            return entry
+
+        if entry is not None and entry.digest == digest:
+            entry.fetched_at = time.time()
+            self._save(key[0], kind, entry, items_changed=False)
+        else:
+            connection.parse_value(items)
+            entry = CatalogEntry(items, CatalogKinds[kind][2], digest, time.time())
+            self._save(key[0], kind, entry)
+        self._entries[key] = entry
+        return entry
+
+    def list(self, connection, kind, fields=None):
+        """
+        Return model objects for every item of ``kind``, set only with the
+        attributes in ``fields`` if given.
+        """
+        cls = CatalogKinds[kind][3]
+        return [self._build(connection, cls, item, fields) for item in self.entry(connection, kind).items]
+
+    def lookup(self, connection, kind, item_id, fields=None):
+        """
+        Return the model object of ``kind`` identified by ``item_id``, or None.
+        """
+        entry = self.entry(connection, kind)
+        pos = entry.index.get(item_id)
+        if pos is None:
+            return None
+        return self._build(connection, CatalogKinds[kind][3], entry.items[pos], fields)
+
+    def _build(self, connection, cls, item, fields):
+        if fields is not None:
+            keep = connection.projection(cls, fields)
+            item = dict((k, v) for k, v in item.items() if k in keep)
+        return connection.build_element(cls, copy.deepcopy(item))
@@ -1,3 +1,32 @@
 # Common
 DefaultTimeOut = 300
 DefaultWaitForInterval = 10
+
+# Bulk describe
+MaxDescribeIds = 100
+MaxPageSize = 100
+DefaultMaxWorkers = 8
+
+# Catalog cache
+DefaultCatalogTTL = 86400
+
+# Snapshot tracking
+SnapshotTimeOut = 1200
+SnapshotMinPollInterval = 5
+SnapshotMaxPollInterval = 60
+SnapshotCreateRate = 10
+SnapshotThrottleRetries = 3
+# Throttled CreateSnapshot calls are retried after this many seconds, doubled
+# on every retry and jittered.
+SnapshotThrottleDelay = 1
+# A snapshot is reported missing only after this many consecutive polls
+# without it, as a new snapshot may not be listed right away.
+SnapshotMissingPolls = 3
+
+# Above this many instances, disks are found with one paged scan of the region
+# grouped by instance, instead of one DescribeDisks per instance, so that the
+# number of requests does not grow with the number of instances.
+DiskScanThreshold = 20
+
+# Image catalog
+DefaultImageCatalogTTL = 300
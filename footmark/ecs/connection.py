@@ -7,6 +7,7 @@ import warnings
 
 import six
 import time
+import random
 import json
 import base64
 from footmark.ecs.config import *
@@ -17,14 +18,27 @@ from footmark.ecs.regioninfo import RegionInfo
 from footmark.ecs.instance import Instance
 from footmark.ecs.securitygroup import SecurityGroup
 from footmark.ecs.volume import Disk
-from footmark.exception import ECSResponseError
+from footmark.ecs.snapshot import Snapshot, SnapshotTracker
+from footmark.ecs.image import Image, ImageCatalog
+from footmark.ecs.catalog import CatalogStore
+from footmark.exception import ECSResponseError, FootmarkClientError
 from functools import wraps
 from footmark.resultset import ResultSet
+from footmark.columns import ColumnBuilder
+from footmark.utils import chunked, run_concurrently, RateLimiter
 from aliyunsdkcore.acs_exception.exceptions import ServerException
 # from aliyunsdkecs.request.v20140526.AttachKeyPairRequest import Request import
 # from aliyunsdkcore.auth.composer.rpc_signature_composer import ServerException
 # from aliyunsdkecs.request.v20140526.DescribeInstancesRequest import
 
+# model class -> (Describe action, parameter taking a JSON list of IDs, response markers)
+RefreshSources = {
+    Instance: ('DescribeInstances', 'InstanceIds', ['Instances', Instance]),
+    Disk: ('DescribeDisks', 'DiskIds', ['Disks', Disk]),
+    SecurityGroup: ('DescribeSecurityGroups', 'SecurityGroupIds', ['SecurityGroups', SecurityGroup]),
+    Snapshot: ('DescribeSnapshots', 'SnapshotIds', ['Snapshots', Snapshot]),
+}
+
 
 class ECSConnection(ACSQueryConnection):
     SDKVersion = '2014-05-26'
@@ -33,10 +47,28 @@ class ECSConnection(ACSQueryConnection):
     ResponseError = ECSResponseError
 
     def __init__(self, acs_access_key_id=None, acs_secret_access_key=None,
-                 region=None, sdk_version=None, security_token=None, user_agent=None):
+                 region=None, sdk_version=None, security_token=None, user_agent=None, catalog=None,
+                 identity_map=False, intern_fields=None, interner=None):
         """
         Init method to create a new connection to ECS.
+
+        :type catalog: :class:`footmark.ecs.catalog.CatalogStore` or bool
+        :param catalog: Serve zones, instance types and instance type families
+            from a disk-backed catalog cache. Pass True to use the default store.
+
+        The images of the region are indexed lazily in ``self.images``, a
+        :class:`footmark.ecs.image.ImageCatalog`.
+
+        :type identity_map: bool or :class:`footmark.identitymap.IdentityMap`
+        :param identity_map: Keep one live model object per resource, see
+            :class:`footmark.connection.ACSQueryConnection`.
+
+        ``intern_fields`` and ``interner`` configure string interning of the
+        parsed responses, see :class:`footmark.connection.ACSQueryConnection`.
         """
+        if catalog is True:
+            catalog = CatalogStore()
+        self.catalog = catalog or None
         if not region:
             # region = RegionInfo(self, self.DefaultRegionName,
             #                     self.DefaultRegionId)
@@ -50,7 +82,10 @@ class ECSConnection(ACSQueryConnection):
         super(ECSConnection, self).__init__(acs_access_key_id=acs_access_key_id,
                                             acs_secret_access_key=acs_secret_access_key,
                                             region=self.region, product=self.ECSSDK,
-                                            security_token=security_token, user_agent=user_agent)
+                                            security_token=security_token, user_agent=user_agent,
+                                            identity_map=identity_map,
+                                            intern_fields=intern_fields, interner=interner)
+        self.images = ImageCatalog(self)
 
     def build_filter_params(self, params, filters):
         if not isinstance(filters, dict):
@@ -100,10 +135,25 @@ class ECSConnection(ACSQueryConnection):
                           instance_network_type=None, private_ip_addresses=None, inner_ip_addresses=None,
                           public_ip_addresses=None, security_group_id=None, instance_charge_type=None,
                           spot_strategy=None, internet_charge_type=None, image_id=None, status=None,
-                          io_optimized=None, pagenumber=None, pagesize=100):
+                          io_optimized=None, pagenumber=None, pagesize=100, as_columns=False, fields=None):
         """
         Retrieve all the instance associated with your account. 
 
+        :type as_columns: bool
+        :param as_columns: Return the DescribeInstances fields as a
+            :class:`footmark.columns.Columns` instead of Instance objects,
+            without looking up the disks and security groups of each instance.
+
+        :type fields: list
+        :param fields: Only keep these fields of the instances, see
+            :meth:`footmark.connection.ACSQueryConnection.get_list`. The disks
+            and security groups of each instance are only looked up when
+            ``block_device_mapping`` or ``security_groups`` is listed.
+
+        The disks are looked up with :meth:`get_disks_by_instances`, one
+        DescribeDisks per instance run concurrently, and the security groups
+        once per distinct group with :meth:`get_security_groups_by_ids`.
+
         :rtype: list
         :return: A list of  :class:`footmark.ecs.instance`
 
@@ -153,40 +203,60 @@ class ECSConnection(ACSQueryConnection):
 
             self.build_list_params(params, pagesize, 'PageSize')
 
+            if as_columns:
+                if pagenumber:
+                    self.build_list_params(params, pagenumber, 'PageNumber')
+                    return self.get_list('DescribeInstances', params, ['Instances', Instance], True, fields)
+                return self.get_paged_list('DescribeInstances', params, ['Instances', Instance], pagesize,
+                                           as_columns=True, fields=fields)
+
+            lookup_disks = fields is None or 'block_device_mapping' in fields
+            lookup_groups = fields is None or 'security_groups' in fields
+            if fields is not None and lookup_groups:
+                fields = list(fields) + ['security_group_ids']
+
             pNum = pagenumber
             if not pNum:
                 pNum = 1
             while True:
                 self.build_list_params(params, pNum, 'PageNumber')
-                instance_list = self.get_list('DescribeInstances', params, ['Instances', Instance])
-                for inst in instance_list:
-                    filters = {}
-                    filters['instance_id'] = inst.id
-                    volumes = self.get_all_volumes(filters=filters)
+                instance_list = self.get_list('DescribeInstances', params, ['Instances', Instance], fields=fields)
+                instances.extend(instance_list)
+                if pagenumber or len(instance_list) < pagesize:
+                    break
+                pNum += 1
+
+            if lookup_disks and instances:
+                instance_disks = self.get_disks_by_instances([inst.id for inst in instances])
+                for inst in instances:
                     block_device_mapping = {}
-                    for vol in volumes:
+                    for vol in instance_disks.get(str(inst.id), []):
                         block_device_mapping[vol.id] = vol
                     setattr(inst, 'block_device_mapping', block_device_mapping)
+            if lookup_groups:
+                instance_groups = {}
+                for inst in instances:
                     if inst.security_group_ids:
-                        group_ids = []
-                        for sg_id in inst.security_group_ids['security_group_id']:
-                            group_ids.append(str(sg_id))
-                            security_groups = self.get_all_security_groups(group_ids=group_ids)
-                            setattr(inst, 'security_groups', security_groups)
-                    instances.append(inst)
-                if pagenumber or len(instance_list) < pagesize:
-                    break
-                pNum += 1
+                        instance_groups[inst] = [str(sg_id) for sg_id in inst.security_group_ids['security_group_id']]
+                groups = self.get_security_groups_by_ids(
+                    [group_id for group_ids in instance_groups.values() for group_id in group_ids])
+                for inst, group_ids in instance_groups.items():
+                    setattr(inst, 'security_groups', [groups[group_id] for group_id in group_ids
+                                                      if group_id in groups])
 
         except Exception as e:
             raise e
 
         return instances
 
-    def describe_instances(self, instance_ids=None, filters=None, max_results=None):
+    def describe_instances(self, instance_ids=None, filters=None, max_results=None, fields=None):
         """
         Retrieve all the instance associated with your account.
 
+        :type fields: list
+        :param fields: Only set these attributes of the instances, see
+            :meth:`footmark.connection.ACSQueryConnection.get_list`.
+
         :rtype: list
         :return: A list of  :class:`footmark.ecs.instance`
 
@@ -205,7 +275,7 @@ class ECSConnection(ACSQueryConnection):
             params['MaxResults'] = max_results
 
         try:
-            instances = self.get_list('DescribeInstances', params, ['Instances', Instance])
+            instances = self.get_list('DescribeInstances', params, ['Instances', Instance], fields=fields)
         except Exception as ex:
             instances = None
 
@@ -315,59 +385,95 @@ class ECSConnection(ACSQueryConnection):
                     result.append(instance_id)
         return result
 
-    def describe_instance_types(self, instance_type_family=None):
+    def describe_instance_types(self, instance_type_family=None, fields=None):
         """
         Retrieve all the instance types associated with your account.
 
         :type instance_type_family: str
         :param instance_type_family: Family name of instance type
 
+        :type fields: list
+        :param fields: Only keep these fields of the instance types, see
+            :meth:`footmark.connection.ACSQueryConnection.get_list`.
+
         :rtype: list
         :return: A list of  :class:`footmark.ecs.instance_type`
 
         """
+        if self.catalog:
+            if fields is not None and instance_type_family:
+                fields = list(fields) + ['instance_type_family']
+            types = self.catalog.list(self, 'instance_types', fields)
+            if instance_type_family:
+                types = [t for t in types if t.instance_type_family == instance_type_family]
+            return types
+
         params = {}
 
         if instance_type_family:
             self.build_list_params(params, instance_type_family, 'InstanceTypeFamily')
-        return self.get_list('DescribeInstanceTypes', params, ['InstanceTypes', InstanceType])
+        return self.get_list('DescribeInstanceTypes', params, ['InstanceTypes', InstanceType], fields=fields)
 
-    def describe_zones(self, zone_id=None):
+    def describe_zones(self, zone_id=None, fields=None):
         """
             Retrieve all zones in the region.
 
             :type zone_id: str
             :param zone_id: Filter the zone which id is equal to zone_id
 
+            :type fields: list
+            :param fields: Only keep these fields of the zones, see
+                :meth:`footmark.connection.ACSQueryConnection.get_list`.
+
             :rtype: list
             :return: A list of  :class:`footmark.ecs.zone`
 
         """
+        if self.catalog:
+            if zone_id:
+                zone = self.catalog.lookup(self, 'zones', zone_id, fields)
+                return [zone] if zone else []
+            return self.catalog.list(self, 'zones', fields)
+
         params = {}
         self.build_list_params(params, self.region, 'RegionId')
-        zones = self.get_list('DescribeZones', params, ['Zones', Zone])
+        zones = self.get_list('DescribeZones', params, ['Zones', Zone], fields=fields)
         if zone_id:
             zones = [zone for zone in zones if zone.id == zone_id]
         return zones
 
-    def describe_instance_type_families(self, generation=None):
+    def describe_instance_type_families(self, generation=None, fields=None):
         """
             Retrieve all the instance type families associated with your account.
 
             :type generation: str
             :param generation: Filter the families by generation
 
+            :type fields: list
+            :param fields: Only keep these fields of the families, see
+                :meth:`footmark.connection.ACSQueryConnection.get_list`.
+
             :rtype: list
             :return: A list of  :class:`footmark.ecs.instance_type_family`
 
         """
+        if self.catalog:
+            if fields is not None and generation:
+                fields = list(fields) + ['generation']
+            families = self.catalog.list(self, 'instance_type_families', fields)
+            if generation:
+                families = [f for f in families if f.generation == generation]
+            return families
+
         params = {}
         self.build_list_params(params, self.region, 'RegionId')
         if generation:
             self.build_list_params(params, generation, "Generation")
-        return self.get_list('DescribeInstanceTypeFamilies', params, ['InstanceTypeFamilies', InstanceTypeFamily])
+        return self.get_list('DescribeInstanceTypeFamilies', params, ['InstanceTypeFamilies', InstanceTypeFamily],
+                             fields=fields)
 
-    def get_all_volumes(self, zone_id=None, volume_ids=None, volume_name=None, filters=None):
+    def get_all_volumes(self, zone_id=None, volume_ids=None, volume_name=None, filters=None, as_columns=False,
+                        fields=None):
         """
         Get all Volumes associated with the current credentials.
 
@@ -389,23 +495,146 @@ class ECSConnection(ACSQueryConnection):
         :type dry_run: bool
         :param dry_run: Set to True if the operation should not actually run.
 
+        :type as_columns: bool
+        :param as_columns: Page through all matching disks and return their
+            fields as a :class:`footmark.columns.Columns` instead of Disk objects.
+
+        :type fields: list
+        :param fields: Only keep these fields of the disks, see
+            :meth:`footmark.connection.ACSQueryConnection.get_list`.
+
         :rtype: list of Volume
         :return: The requested Volume objects
         """
         params = {}
         if zone_id:
             self.build_list_params(params, zone_id, 'ZoneId')
-        if volume_ids:
-            ids = "["
-            for id in volume_ids:
-                ids += "\"" + str(id) + "\""
-            ids += "]"
-            self.build_list_params(params, ids, 'DiskIds')
         if volume_name:
             self.build_list_params(params, volume_name, 'DiskName')
         if filters:
             self.build_filter_params(params, filters)
-        return self.get_list('DescribeDisks', params, ['Disks', Disk])
+        if volume_ids:
+            if as_columns:
+                return self.get_by_ids('DescribeDisks', 'DiskIds', ['Disks', Disk], volume_ids, params=params,
+                                       as_columns=True, fields=fields)
+            volumes = self.get_volumes_by_ids(volume_ids, params=params, fields=fields)
+            return [volumes[str(id)] for id in volume_ids if str(id) in volumes]
+        if as_columns:
+            self.build_list_params(params, MaxPageSize, 'PageSize')
+            return self.get_paged_list('DescribeDisks', params, ['Disks', Disk], MaxPageSize,
+                                       as_columns=True, fields=fields)
+        return self.get_list('DescribeDisks', params, ['Disks', Disk], fields=fields)
+
+    def get_volumes_by_ids(self, volume_ids, params=None, chunk_size=MaxDescribeIds, max_workers=DefaultMaxWorkers,
+                           fields=None):
+        """
+        Look up many disks by ID. The IDs are split into chunks of at most
+        ``chunk_size``, the chunks are described concurrently and each chunk
+        is paged through.
+
+        :type volume_ids: list
+        :param volume_ids: The disk IDs to look up.
+
+        :type params: dict
+        :param params: Optional extra DescribeDisks parameters applied to every chunk.
+
+        :type chunk_size: int
+        :param chunk_size: The maximum number of IDs sent in one request.
+
+        :type max_workers: int
+        :param max_workers: The maximum number of concurrent requests.
+
+        :type fields: list
+        :param fields: Only set these attributes of the disks.
+
+        :rtype: dict
+        :return: A dict mapping disk ID to :class:`footmark.ecs.volume.Disk`.
+            Disks that were not found are absent.
+        """
+        return self.get_by_ids('DescribeDisks', 'DiskIds', ['Disks', Disk], volume_ids, params=params,
+                               chunk_size=chunk_size, max_workers=max_workers, fields=fields)
+
+    def refresh(self, objects, fields=None, max_workers=DefaultMaxWorkers):
+        """
+        Refresh many model objects in place. Objects are grouped by type and
+        every group is fetched with chunked multi-ID Describe* calls, so
+        refreshing hundreds of instances takes a few calls.
+
+        :type objects: list
+        :param objects: Instance, Disk, SecurityGroup or Snapshot objects
+
+        :type fields: list
+        :param fields: Only fetch and refresh these attributes, e.g.
+            ['status']. All attributes are refreshed by default.
+
+        :rtype: list
+        :return: The objects that no longer exist
+        """
+        groups = {}
+        for obj in objects:
+            if type(obj) not in RefreshSources:
+                raise FootmarkClientError('Refreshing %s objects is not supported.' % type(obj).__name__)
+            groups.setdefault(type(obj), []).append(obj)
+
+        missing = []
+        for cls, group in groups.items():
+            action, ids_label, markers = RefreshSources[cls]
+            fresh = self.get_by_ids(action, ids_label, markers, [obj.id for obj in group], max_workers=max_workers,
+                                    fields=fields)
+            for obj in group:
+                updated = fresh.get(obj.id)
+                if updated is None:
+                    missing.append(obj)
+                    continue
+                obj._update(updated, fields)
+        return missing
+
+    def get_by_ids(self, action, ids_label, markers, ids, params=None, chunk_size=MaxDescribeIds,
+                   max_workers=DefaultMaxWorkers, as_columns=False, fields=None):
+        """
+        Describe many resources by ID with a Describe* action that accepts a
+        JSON list of IDs, such as DescribeDisks with ``DiskIds``. The IDs are
+        de-duplicated and split into chunks of at most ``chunk_size``, the
+        chunks are described concurrently and each chunk is paged through.
+
+        :rtype: dict
+        :return: A dict mapping resource ID to the model object, or with
+            ``as_columns`` a :class:`footmark.columns.Columns` of the found
+            resources. See :meth:`footmark.connection.ACSQueryConnection.get_list`
+            for ``as_columns`` and ``fields``.
+        """
+        columns = frozenset(fields) if as_columns and fields is not None else None
+        unique_ids = []
+        seen = set()
+        for resource_id in ids:
+            resource_id = str(resource_id)
+            if resource_id not in seen:
+                seen.add(resource_id)
+                unique_ids.append(resource_id)
+
+        def describe_chunk(chunk):
+            chunk_params = dict(params or {})
+            self.build_list_params(chunk_params, json.dumps(chunk), ids_label)
+            self.build_list_params(chunk_params, MaxPageSize, 'PageSize')
+            if as_columns:
+                rows = []
+                for page in self.iter_pages(action, chunk_params, markers, MaxPageSize, len(chunk), rows=True,
+                                            fields=columns):
+                    rows.extend(page)
+                return rows
+            return self.get_paged_list(action, chunk_params, markers, MaxPageSize, len(chunk), fields=fields)
+
+        if as_columns:
+            builder = ColumnBuilder(fields)
+            for rows in run_concurrently(describe_chunk, chunked(unique_ids, chunk_size), max_workers):
+                builder.extend(rows)
+            return builder.build()
+
+        resources = {}
+        for elements in run_concurrently(describe_chunk, chunked(unique_ids, chunk_size), max_workers):
+            for element in elements:
+                resources[element.id] = element
+        return resources
 
     def create_instance(self, image_id, instance_type, group_id=None, zone_id=None, instance_name=None,
                         description=None, internet_charge_type=None, max_bandwidth_in=None, max_bandwidth_out=None,
@@ -1042,7 +1271,7 @@ class ECSConnection(ACSQueryConnection):
 
         return self.get_object('DescribeSecurityGroupAttribute', params, SecurityGroup)
 
-    def get_all_security_groups(self, group_ids=None, vpc_id=None, filters=None):
+    def get_all_security_groups(self, group_ids=None, vpc_id=None, filters=None, fields=None):
         """
         Get all security groups associated with your account in a region.
     
@@ -1062,6 +1291,12 @@ class ECSConnection(ACSQueryConnection):
                         names/values is dependent on the request
                         being performed.  Check the ECS API guide
                         for details.
+
+        :type fields: list
+        :param fields: Only keep these fields of the security groups, see
+            :meth:`footmark.connection.ACSQueryConnection.get_list`. The
+            rules of each group are only looked up when ``permissions`` is
+            listed.
     
         :rtype: list
         :return: A list of SecurityGroup
@@ -1074,7 +1309,9 @@ class ECSConnection(ACSQueryConnection):
             self.build_list_params(params, vpc_id, 'VpcId')
         if filters:
             self.build_filter_params(params, filters)
-        results = self.get_list('DescribeSecurityGroups', params, ['SecurityGroups', SecurityGroup])
+        results = self.get_list('DescribeSecurityGroups', params, ['SecurityGroups', SecurityGroup], fields=fields)
+        if fields is not None and 'permissions' not in self.projection(SecurityGroup, fields):
+            return results
         if results:
             for group in results:
                 groups.append(self.get_security_group_attribute(group_id=group.id))
@@ -1082,6 +1319,27 @@ class ECSConnection(ACSQueryConnection):
             return groups
         return results
 
+    def get_security_groups_by_ids(self, group_ids, max_workers=DefaultMaxWorkers):
+        """
+        Look up many security groups by ID, with their rules. Each distinct
+        group is described once: the IDs are described in chunks, see
+        :meth:`get_by_ids`, then the attributes of the found groups are
+        described concurrently.
+
+        :type group_ids: list
+        :param group_ids: The security group IDs to look up.
+
+        :rtype: dict
+        :return: A dict mapping security group ID to the result of
+            :meth:`get_security_group_attribute`
+        """
+        found = self.get_by_ids('DescribeSecurityGroups', 'SecurityGroupIds', ['SecurityGroups', SecurityGroup],
+                                group_ids, max_workers=max_workers)
+        group_ids = sorted(found)
+        groups = run_concurrently(lambda group_id: self.get_security_group_attribute(group_id=group_id),
+                                  group_ids, max_workers)
+        return dict(zip(group_ids, groups))
+
     def delete_security_group(self, group_id):
         """
         Delete Security Group , delete security group inside particular region.
@@ -1234,15 +1492,26 @@ class ECSConnection(ACSQueryConnection):
         :return: A list of the total number of security groups, region ID of the security group,
                  the ID of the VPC to which the security group belongs
         """
-        params = {}
+        return self.attach_disks([(disk_id, instance_id)], delete_with_instance=delete_with_instance)
 
-        # Instance Id, which is used to attach disk
-        self.build_list_params(params, instance_id, 'InstanceId')
+    def attach_disks(self, disk_instance_pairs, delete_with_instance=None, delay=5, timeout=120,
+                     max_workers=DefaultMaxWorkers):
+        """
+        Attach many disks concurrently and wait until all of them are in use.
 
-        # Disk Id, the disk_id to be mapped
-        self.build_list_params(params, disk_id, 'DiskId')
+        :type disk_instance_pairs: list or dict
+        :param disk_instance_pairs: (disk_id, instance_id) pairs, or a dict
+            mapping disk ID to instance ID.
+
+        :type delete_with_instance: string
+        :param delete_with_instance: value depicting should disks be deleted with instance.
+
+        :rtype: bool
+        :return: True once every disk is in use
+        """
+        if isinstance(disk_instance_pairs, dict):
+            disk_instance_pairs = list(disk_instance_pairs.items())
 
-        # should the disk be deleted with instance
         if delete_with_instance:
             if str(delete_with_instance).lower().strip() == 'yes':
                 delete_with_instance = 'true'
@@ -1251,11 +1520,17 @@ class ECSConnection(ACSQueryConnection):
             else:
                 delete_with_instance = str(delete_with_instance).lower().strip()
 
-            self.build_list_params(params, delete_with_instance, 'DeleteWithInstance')
+        def attach(pair):
+            params = {}
+            self.build_list_params(params, pair[1], 'InstanceId')
+            self.build_list_params(params, pair[0], 'DiskId')
+            if delete_with_instance:
+                self.build_list_params(params, delete_with_instance, 'DeleteWithInstance')
+            return self.get_status('AttachDisk', params)
 
-        # Method Call, to perform adding action
-        self.get_status('AttachDisk', params)
-        return self.wait_for_disk_status(disk_id=disk_id, status="in_use", delay=5, timeout=120)
+        run_concurrently(attach, disk_instance_pairs, max_workers)
+        return self.wait_for_disks_status([pair[0] for pair in disk_instance_pairs], "in_use",
+                                          delay=delay, timeout=timeout)
 
     def detach_disk(self, disk_id, instance_id):
         """
@@ -1266,16 +1541,31 @@ class ECSConnection(ACSQueryConnection):
 
         :return: Return status of Operation
         """
-        params = {}
+        return self.detach_disks([(disk_id, instance_id)])
 
-        # Instance Id, which is to be added to a detach disk
-        self.build_list_params(params, instance_id, 'InstanceId')
+    def detach_disks(self, disk_instance_pairs, delay=5, timeout=120, max_workers=DefaultMaxWorkers):
+        """
+        Detach many disks concurrently and wait until all of them are available.
 
-        # Disk Id, the disk_id to be mapped
-        self.build_list_params(params, disk_id, 'DiskId')
+        :type disk_instance_pairs: list or dict
+        :param disk_instance_pairs: (disk_id, instance_id) pairs, or a dict
+            mapping disk ID to instance ID.
 
-        self.get_status('DetachDisk', params)
-        return self.wait_for_disk_status(disk_id=disk_id, status="available", delay=5, timeout=120)
+        :rtype: bool
+        :return: True once every disk is available
+        """
+        if isinstance(disk_instance_pairs, dict):
+            disk_instance_pairs = list(disk_instance_pairs.items())
+
+        def detach(pair):
+            params = {}
+            self.build_list_params(params, pair[1], 'InstanceId')
+            self.build_list_params(params, pair[0], 'DiskId')
+            return self.get_status('DetachDisk', params)
+
+        run_concurrently(detach, disk_instance_pairs, max_workers)
+        return self.wait_for_disks_status([pair[0] for pair in disk_instance_pairs], "available",
+                                          delay=delay, timeout=timeout)
 
     def retrieve_instance_for_disk(self, disk_id):
         # method is used to retrieve instance_id from disk_id, it is required in detach disk.
@@ -1317,30 +1607,53 @@ class ECSConnection(ACSQueryConnection):
 
         :return: Return status of Operation
         """
-        params = {}
+        return self.delete_disks([disk_id])
 
-        # the disk to be deleted
-        self.build_list_params(params, disk_id, 'DiskId')
+    def delete_disks(self, disk_ids, delay=3, timeout=DefaultTimeOut, max_workers=DefaultMaxWorkers):
+        """
+        Delete many disks concurrently. Rejected deletions, e.g. because a disk
+        is still initializing, are retried, and all disks are tracked with one
+        batched DescribeDisks per interval until none of them exists.
 
-        delay = 3
-        timeout = DefaultTimeOut
+        :type disk_ids: list
+        :param disk_ids: IDs of the disks to delete
 
-        while True:
+        :rtype: bool
+        :return: True once every disk is deleted
+        """
+        pending = set(str(disk_id) for disk_id in disk_ids)
+        requested = set()
+        tm = timeout
+        error = None
+
+        def delete(disk_id):
+            params = {}
+            self.build_list_params(params, disk_id, 'DiskId')
             try:
                 self.get_status('DeleteDisk', params)
-                volume = self.get_volume_attribute(disk_id)
-                if volume is None or not volume.id:
-                    return True
             except ServerException as e:
-                if str(e.error_code) == "InvalidDiskId.NotFound":
-                    return True
-                elif str(e.error_code) == "IncorrectInstanceStatus.Initializing":
-                    pass
-            time.sleep(delay)
-            timeout -= delay
-            if timeout <= 0:
+                if str(e.error_code) != "InvalidDiskId.NotFound":
+                    # e.g. IncorrectInstanceStatus.Initializing, retried next round
+                    return None, e
+            return disk_id, None
+
+        while True:
+            for disk_id, e in run_concurrently(delete, sorted(pending - requested), max_workers):
+                if disk_id:
+                    requested.add(disk_id)
+                elif e:
+                    error = e
+
+            existing = self.get_volumes_by_ids(list(pending), max_workers=max_workers, fields=['id'])
+            pending = set(disk_id for disk_id in pending if disk_id in existing)
+            if not pending:
+                return True
+
+            tm -= delay
+            if tm <= 0:
                 raise Exception("Timeout: Waiting for deleting volume {0}, time-consuming {1} seconds. "
-                                "Error: {2}".format(disk_id, DefaultTimeOut, e))
+                                "Error: {2}".format(', '.join(sorted(pending)), timeout, error))
+            time.sleep(delay)
 
     def modify_disk(self, disk_id, disk_name=None, description=None, delete_with_instance=None):
         """
@@ -1419,10 +1732,14 @@ class ECSConnection(ACSQueryConnection):
         image_id = ''
         request_id = ''
 
-        # the snapshot id for creating image
-        if snapshot_id:
-            # Verifying progress of snapshot_id, snapshot_id should be 100% completed
-            snapshot_results, snapshot_progress, snapshot_changed = self.get_snapshot_image(snapshot_id)
+        # Every snapshot, the base one and those of the disk mapping, should be 100% completed.
+        snapshot_ids = [snapshot_id]
+        for mapping in disk_mapping or []:
+            if mapping and 'snapshot_id' in mapping:
+                snapshot_ids.append(mapping['snapshot_id'])
+        snapshot_ids = [i for i in snapshot_ids if i]
+        if snapshot_ids:
+            snapshot_results, snapshot_progress, snapshot_changed = self.get_snapshots_image(snapshot_ids)
 
             if snapshot_results:
                 if 'error code' in str(snapshot_results).lower():
@@ -1466,17 +1783,6 @@ class ECSConnection(ACSQueryConnection):
                     if 'snapshot_id' in mapping:
                         self.build_list_params(params, mapping[
                             'snapshot_id'], 'DiskDeviceMapping.' + str(mapping_no) + '.SnapshotId')
-                        snapshot_map_results, snapshot_map_progress, snapshot_map_changed \
-                            = self.get_snapshot_image(mapping['snapshot_id'])
-                        if snapshot_map_results:
-                            if 'error code' in str(snapshot_map_results).lower():
-                                results = snapshot_map_results
-                                return changed, image_id, results, request_id
-
-                        if not snapshot_map_changed:
-                            results.append(
-                                {"Error Code": "Snapshot.NotReady", "Error Message": "snapshot is not ready"})
-                            return changed, image_id, results, request_id
 
                     mapping_no += 1
 
@@ -1494,11 +1800,12 @@ class ECSConnection(ACSQueryConnection):
                     tag_no += 1
 
         try:
-            response = self.get_status('CreateImage', params)
+            response = self.get_object('CreateImage', params, Image)
 
             if response:
-                image_id = response['ImageId']
-                request_id = response['RequestId']
+                image_id = response.image_id
+                request_id = response.request_id
+                self.images.invalidate()
 
             image_sharing_results = []
             if launch_permission and image_id:
@@ -1583,62 +1890,92 @@ class ECSConnection(ACSQueryConnection):
         :param image_id: ID of an Image        
         :rtype: Return status of Operation
         """
-        params = {}
-        results = []
-        changed = False
+        return self._delete_images([image_id], self.images.lookup)
 
-        self.build_list_params(params, image_id, 'ImageId')
+    def delete_images(self, image_ids, max_workers=DefaultMaxWorkers):
+        """
+        Delete many images concurrently. Existence is checked against the
+        image catalog rather than one DescribeImages per image, falling back
+        to a DescribeImages for images missing from it, and deleted images
+        are dropped from the catalog.
 
+        :type image_ids: list
+        :param image_ids: IDs or names of the images to delete
+
+        :rtype: tuple
+        :return: Whether any image was deleted, and one result per image in
+            input order: the status of the DeleteImage, as returned by
+            :meth:`delete_image`, or an error
+        """
+        return self._delete_images(image_ids, self.images.resolve, max_workers)
+
+    def _delete_images(self, image_ids, resolve, max_workers=DefaultMaxWorkers):
         try:
-            response = self.get_status('DescribeImages', params)
-            if len(response) > 0:
-                json_obj = response
-                total_instance = json_obj['TotalCount']
-                if total_instance > 0:
-                    for items in json_obj['Images']['Image']:
-                        if image_id == items['ImageId']:
-                            response = self.get_status('DeleteImage', params)
-                            results.append(response)
-                            changed = True
-                else:
-                    results.append({"Error Code": "Image does not exist", "Error Message": "Image does not exist"})
+            resolved = [resolve(name_or_id) for name_or_id in image_ids]
         except ServerException as e:
-            results.append({"Error Code": e.error_code, "Error Message": e.message,
-                            "RequestId": e.request_id, "Http Status": e.http_status})
-            changed = False
+            return False, [{"Error Code": e.error_code, "Error Message": e.message,
+                            "RequestId": e.request_id, "Http Status": e.http_status}]
         except Exception as e:
-            results.append({"Error:": e})
-            changed = False
+            return False, [{"Error:": e}]
 
-        return changed, results
+        # Returns the ID of the deleted image, or None, and the result.
+        def delete(image_id):
+            if image_id is None:
+                return None, {"Error Code": "Image does not exist", "Error Message": "Image does not exist"}
+            params = {}
+            self.build_list_params(params, image_id, 'ImageId')
+            try:
+                return image_id, self.get_status('DeleteImage', params)
+            except ServerException as e:
+                return None, {"Error Code": e.error_code, "Error Message": e.message,
+                              "RequestId": e.request_id, "Http Status": e.http_status}
+            except Exception as e:
+                return None, {"Error:": e}
+
+        outcomes = run_concurrently(delete, resolved, max_workers)
+        deleted = [image_id for image_id, result in outcomes if image_id is not None]
+        self.images.invalidate(deleted)
+        return len(deleted) > 0, [result for image_id, result in outcomes]
 
     def get_snapshot_image(self, snapshot_id):
-        params = {}
+        return self.get_snapshots_image([snapshot_id])
+
+    def get_snapshots_image(self, snapshot_ids, callback=None, timeout=SnapshotTimeOut):
+        """
+        Wait until every snapshot is 100% completed, following all of them
+        with one :class:`footmark.ecs.snapshot.SnapshotTracker`.
+
+        :type snapshot_ids: list
+        :param snapshot_ids: IDs of the snapshots to wait for
+
+        :type callback: callable
+        :param callback: Called as ``callback(snapshot, eta)`` on every progress change
+
+        :return: A tuple of the error results, the progress of the slowest
+            snapshot and whether every snapshot completed
+        """
         results = []
         progress = ''
         changed = False
-        counter = 0
+        tracker = self.track_snapshots(snapshot_ids, callback=callback)
         try:
-            while changed == False:
-                self.build_list_params(params, [snapshot_id], 'SnapshotIds')
-
-                if counter > 20:
-                    break
-                obtained_results = self.get_status('DescribeSnapshots', params)
-                counter += 1
-                if obtained_results and len(obtained_results['Snapshots']['Snapshot']) > 0:
-                    status = obtained_results['Snapshots']['Snapshot'][0]['Status']
-                    progress = obtained_results['Snapshots']['Snapshot'][0]['Progress']
-
-                    if not '100%' in progress:
-                        time.sleep(60)
-                    else:
-                        changed = True
-                        progress = '100'
-                        break
-                else:
-                    results.append({"Error Code": "Invalid.SnapshotId", "Error Message": "The snapshot id not found"})
-                    break
+            changed = tracker.wait(timeout)
+            if changed:
+                progress = '100'
+            elif tracker.missing:
+                results.append({"Error Code": "Invalid.SnapshotId", "Error Message": "The snapshot id not found"})
+            elif tracker.failed:
+                results.append({"Error Code": "Snapshot.Failed",
+                                "Error Message": "The snapshot %s failed" % ', '.join(tracker.failed)})
+            else:
+                seen = [tracker.snapshots[i] for i in tracker.pending if i in tracker.snapshots]
+                unseen = [i for i in tracker.pending if i not in tracker.snapshots]
+                if seen:
+                    progress = min(seen, key=lambda s: s.percent).progress
+                if unseen:
+                    results.append({"Error Code": "Invalid.SnapshotId",
+                                    "Error Message": "The snapshot %s was not found before the timeout"
+                                                     % ', '.join(unseen)})
         except ServerException as e:
             results.append({"Error Code": e.error_code, "Error Message": e.message,
                             "RequestId": e.request_id, "Http Status": e.http_status})
@@ -1647,6 +1984,141 @@ class ECSConnection(ACSQueryConnection):
 
         return results, progress, changed
 
+    def get_snapshots_by_ids(self, snapshot_ids, params=None, chunk_size=MaxDescribeIds,
+                             max_workers=DefaultMaxWorkers, fields=None):
+        """
+        Look up many snapshots by ID, see :meth:`get_by_ids`.
+
+        :rtype: dict
+        :return: A dict mapping snapshot ID to :class:`footmark.ecs.snapshot.Snapshot`
+        """
+        return self.get_by_ids('DescribeSnapshots', 'SnapshotIds', ['Snapshots', Snapshot], snapshot_ids,
+                               params=params, chunk_size=chunk_size, max_workers=max_workers, fields=fields)
+
+    def track_snapshots(self, snapshot_ids, callback=None):
+        """
+        Return a :class:`footmark.ecs.snapshot.SnapshotTracker` following the snapshots.
+        """
+        return SnapshotTracker(self, snapshot_ids, callback=callback)
+
+    def get_disks_by_instances(self, instance_ids, disk_type=None, max_workers=DefaultMaxWorkers):
+        """
+        Find the disks attached to many instances. DescribeDisks filters on
+        a single InstanceId, so up to ``DiskScanThreshold`` instances are
+        described concurrently, one DescribeDisks per instance; for larger
+        fleets the disks of the region are paged through once, ``MaxPageSize``
+        at a time, and grouped by instance.
+
+        :type instance_ids: list
+        :param instance_ids: IDs of the instances
+
+        :type disk_type: str
+        :param disk_type: Only return "system" or "data" disks
+
+        :rtype: dict
+        :return: A dict mapping instance ID to a list of :class:`footmark.ecs.volume.Disk`
+        """
+        instance_ids = list(set(str(instance_id) for instance_id in instance_ids))
+        params = {}
+        self.build_list_params(params, MaxPageSize, 'PageSize')
+        if disk_type and disk_type != 'all':
+            self.build_list_params(params, disk_type, 'DiskType')
+
+        def describe(instance_id):
+            instance_params = dict(params)
+            self.build_list_params(instance_params, instance_id, 'InstanceId')
+            return self.get_paged_list('DescribeDisks', instance_params, ['Disks', Disk], MaxPageSize)
+
+        if len(instance_ids) > DiskScanThreshold:
+            disks = self.get_paged_list('DescribeDisks', params, ['Disks', Disk], MaxPageSize)
+        else:
+            disks = [disk for found in run_concurrently(describe, instance_ids, max_workers) for disk in found]
+
+        instance_disks = dict((instance_id, []) for instance_id in instance_ids)
+        for disk in disks:
+            instance_id = str(getattr(disk, 'instance_id', '') or '')
+            if instance_id in instance_disks:
+                instance_disks[instance_id].append(disk)
+        return instance_disks
+
+    def snapshot_instances(self, instance_ids, snapshot_name=None, description=None, snapshot_tags=None,
+                           disk_type=None, client_token=None, rate=SnapshotCreateRate,
+                           max_workers=DefaultMaxWorkers, callback=None):
+        """
+        Snapshot every disk of many instances. The disks are discovered in
+        bulk, CreateSnapshot calls are issued concurrently, at most ``rate``
+        per second, and throttled calls are retried with exponential
+        backoff and jitter.
+
+        :type instance_ids: list
+        :param instance_ids: IDs of the instances to back up
+
+        :type snapshot_name: str
+        :param snapshot_name: A name template formatted with ``instance_id``,
+            ``disk_id`` and ``device``, e.g. "backup-{instance_id}-{device}"
+
+        :type description: str
+        :param description: Description of every snapshot
+
+        :type snapshot_tags: dict
+        :param snapshot_tags: Tags applied to every snapshot, maximum 5
+
+        :type disk_type: str
+        :param disk_type: Only snapshot "system" or "data" disks
+
+        :type client_token: str
+        :param client_token: Suffixed with the disk ID to make every CreateSnapshot idempotent
+
+        :type rate: float
+        :param rate: Maximum number of CreateSnapshot calls per second
+
+        :type callback: callable
+        :param callback: Progress callback of the returned tracker
+
+        :rtype: :class:`footmark.ecs.snapshot.SnapshotTracker`
+        :return: A tracker following every created snapshot; disks whose
+            snapshot could not be created are listed in its ``errors``
+        """
+        limiter = RateLimiter(rate)
+        disks = []
+        for instance_id, instance_disks in self.get_disks_by_instances(instance_ids, disk_type=disk_type,
+                                                                       max_workers=max_workers).items():
+            disks.extend((instance_id, disk) for disk in instance_disks)
+
+        def create(pair):
+            instance_id, disk = pair
+            params = {}
+            self.build_list_params(params, disk.id, 'DiskId')
+            if snapshot_name:
+                name = snapshot_name.format(instance_id=instance_id, disk_id=disk.id,
+                                            device=str(getattr(disk, 'device', '') or '').split('/')[-1])
+                self.build_list_params(params, name, 'SnapshotName')
+            if description:
+                self.build_list_params(params, description, 'Description')
+            self.build_tags_params(params, snapshot_tags, max_tag_number=5)
+            if client_token:
+                self.build_list_params(params, "%s-%s" % (client_token, disk.id), 'ClientToken')
+
+            attempt = 0
+            while True:
+                limiter.acquire()
+                try:
+                    return disk.id, self.get_object('CreateSnapshot', params, Snapshot).snapshot_id, None
+                except ServerException as e:
+                    if str(e.error_code).startswith('Throttling') and attempt < SnapshotThrottleRetries:
+                        time.sleep(SnapshotThrottleDelay * 2 ** attempt * (0.5 + random.random() / 2))
+                        attempt += 1
+                        continue
+                    return disk.id, None, e
+
+        created = run_concurrently(create, disks, max_workers)
+        tracker = self.track_snapshots([snapshot_id for _, snapshot_id, _ in created if snapshot_id],
+                                       callback=callback)
+        for disk_id, _, error in created:
+            if error is not None:
+                tracker.errors[disk_id] = error
+        return tracker
+
     def get_instance_details(self, instance_id):
         """
         Get details of an Instance
@@ -1684,22 +2156,45 @@ class ECSConnection(ACSQueryConnection):
         """
         To verify disk status has become expected after attaching or detaching disk
         """
-        tm = timeout
-        try:
-            while True:
-                volume = self.get_volume_attribute(disk_id)
-                if volume and str(volume.status).lower() in [status, str(status).lower()]:
-                    return True
-
-                tm -= delay
-
-                if tm <= 0:
-                    raise Exception("Timeout Error: Waiting for Disk status is %s, time-consuming %d seconds." % (status, timeout))
+        return self.wait_for_disks_status([disk_id], status, delay=delay, timeout=timeout)
 
-                time.sleep(delay)
-            return False
-        except Exception as e:
-            raise e
+    def wait_for_disks_status(self, disk_ids, status, delay=DefaultWaitForInterval, timeout=DefaultTimeOut,
+                              min_delay=1):
+        """
+        To verify that all the disks have reached the expected status. Pending
+        disks are described with one batched DescribeDisks per interval. The
+        interval shrinks with the share of disks still pending and is halved
+        while every pending disk is in a transitional state (e.g. attaching),
+        but never drops below ``min_delay``.
+        """
+        status = str(status).lower()
+        pending = set(str(disk_id) for disk_id in disk_ids)
+        total = len(pending)
+        tm = timeout
+        while pending:
+            volumes = self.get_volumes_by_ids(list(pending), fields=['status'])
+            transitional = True
+            for disk_id in list(pending):
+                volume = volumes.get(disk_id)
+                current = str(volume.status).lower() if volume else ''
+                if current == status:
+                    pending.discard(disk_id)
+                elif not current.endswith('ing'):
+                    transitional = False
+            if not pending:
+                break
+
+            interval = delay * float(len(pending)) / total
+            if transitional:
+                interval /= 2
+            interval = min(max(min_delay, interval), delay)
+
+            tm -= interval
+            if tm <= 0:
+                raise Exception("Timeout Error: Waiting for Disk status is %s, time-consuming %d seconds." % (status, timeout))
+
+            time.sleep(interval)
+        return True
 
     def delete_instance_retry(self, action, params, instance_id, delay=DefaultWaitForInterval, timeout=DefaultTimeOut):
         while True:
@@ -1,4 +1,9 @@
-class ECSObject(object):
+from footmark.model import Model, tag_dict
+
+
+class ECSObject(Model):
+    _fields = ('connection', 'region')
+
     def __init__(self, connection=None):
         self.connection = connection
         if self.connection and hasattr(self.connection, 'region'):
@@ -17,6 +22,8 @@ class TaggedECSObject(ECSObject):
     into a dict that is stored in the "tags" attribute of the
     object.
     """
+    _fields = ('tags',)
+    _converters = {'tags': tag_dict}
 
     def __init__(self, connection=None):
         super(TaggedECSObject, self).__init__(connection)
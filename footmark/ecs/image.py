@@ -0,0 +1,180 @@
+"""
+Represents an ECS image and an in-memory catalog of the images of a region.
+"""
+import threading
+import time
+
+from footmark.ecs.config import DefaultImageCatalogTTL, MaxPageSize
+from footmark.ecs.ecsobject import TaggedECSObject
+from footmark.model import lower
+
+ImageStatuses = 'Creating,Available,UnAvailable,CreateFailed'
+
+
+class Image(TaggedECSObject):
+    """
+    Represents a custom or public image.
+
+    :ivar id: The unique ID of the image.
+    :ivar name: The name of the image.
+    :ivar status: The status of the image, e.g. available or creating.
+    :ivar tags: A dict of the image tags.
+    """
+
+    _fields = ('image_id', 'image_name', 'image_version', 'image_owner_alias', 'description', 'status', 'progress',
+               'size', 'architecture', 'os_name', 'os_name_en', 'os_type', 'platform', 'usage', 'creation_time',
+               'is_self_shared', 'is_subscribed', 'is_copied', 'is_support_io_optimized', 'is_support_cloudinit',
+               'disk_device_mappings', 'product_code', 'request_id')
+    _aliases = {'id': 'image_id', 'name': 'image_name', 'state': 'status'}
+    _converters = {'status': lower}
+
+    def __init__(self, connection=None):
+        super(Image, self).__init__(connection)
+        self.tags = {}
+
+    def __repr__(self):
+        return 'Image:%s' % self.id
+
+    def delete(self):
+        return self.connection.delete_images([self.id])
+
+
+class ImageCatalog(object):
+    """
+    Pages through all images of a region once and indexes them by ID, name
+    and tag, so that names can be resolved and images looked up without a
+    DescribeImages call each time. The listing is reloaded when it is older
+    than ``ttl`` seconds or has been invalidated.
+
+    :type connection: :class:`footmark.ecs.connection.ECSConnection`
+    :param connection: The connection used to list the images.
+
+    :type owner_alias: str
+    :param owner_alias: Which images to list: self, system, others or marketplace.
+
+    :type ttl: int
+    :param ttl: Seconds the listing is served without reloading.
+    """
+
+    def __init__(self, connection, owner_alias='self', ttl=DefaultImageCatalogTTL):
+        self.connection = connection
+        self.owner_alias = owner_alias
+        self.ttl = ttl
+        self.by_id = {}
+        self.by_name = {}
+        self.by_tag = {}
+        self.loaded_at = None
+        self._lock = threading.Lock()
+
+    def _index(self, image):
+        self.by_id[image.id] = image
+        name = getattr(image, 'image_name', None)
+        if name:
+            self.by_name[name] = image
+        for item in (image.tags or {}).items():
+            self.by_tag.setdefault(item, {})[image.id] = image
+
+    def _unindex(self, image_id):
+        image = self.by_id.pop(image_id, None)
+        if image is None:
+            return
+        name = getattr(image, 'image_name', None)
+        if name and self.by_name.get(name) is image:
+            del self.by_name[name]
+        for item in (image.tags or {}).items():
+            images = self.by_tag.get(item)
+            if images is not None:
+                images.pop(image_id, None)
+                if not images:
+                    del self.by_tag[item]
+
+    def load(self):
+        """
+        List all images page by page and rebuild the indexes.
+        """
+        params = {}
+        self.connection.build_list_params(params, self.owner_alias, 'ImageOwnerAlias')
+        self.connection.build_list_params(params, ImageStatuses, 'Status')
+        self.connection.build_list_params(params, MaxPageSize, 'PageSize')
+        images = self.connection.get_paged_list('DescribeImages', params, ['Images', Image], MaxPageSize)
+        with self._lock:
+            self.by_id, self.by_name, self.by_tag = {}, {}, {}
+            for image in images:
+                self._index(image)
+            self.loaded_at = time.time()
+
+    def _ensure(self):
+        if self.loaded_at is None or time.time() - self.loaded_at >= self.ttl:
+            self.load()
+
+    def invalidate(self, image_ids=None):
+        """
+        Drop the given images from the indexes, or the whole listing by default.
+        """
+        with self._lock:
+            if image_ids is None:
+                self.loaded_at = None
+                return
+            for image_id in image_ids:
+                self._unindex(image_id)
+
+    def all(self):
+        self._ensure()
+        return list(self.by_id.values())
+
+    def get(self, image_id):
+        """
+        Return the image with ID ``image_id``, or None.
+        """
+        self._ensure()
+        return self.by_id.get(image_id)
+
+    def find(self, name=None, tags=None):
+        """
+        Return the images having the given name and all of the given tags.
+
+        :type tags: dict
+        :param tags: Tag keys and values every returned image must have.
+        """
+        self._ensure()
+        if name is not None:
+            image = self.by_name.get(name)
+            candidates = {image.id: image} if image is not None else {}
+        else:
+            candidates = self.by_id
+        for item in (tags or {}).items():
+            tagged = self.by_tag.get(item, {})
+            candidates = dict((image_id, image) for image_id, image in candidates.items() if image_id in tagged)
+        return list(candidates.values())
+
+    def resolve(self, name_or_id):
+        """
+        Return the ID of the image identified by ID or name, or None. An
+        image missing from the listing, e.g. created since it was loaded,
+        is looked up with :meth:`lookup`.
+        """
+        self._ensure()
+        if name_or_id in self.by_id:
+            return name_or_id
+        image = self.by_name.get(name_or_id)
+        if image is not None:
+            return image.id
+        return self.lookup(name_or_id)
+
+    def lookup(self, name_or_id):
+        """
+        Return the ID of the image identified by ID or name, or None, with
+        one DescribeImages by ID and, if not found, one by name, without
+        loading the listing. A found image is added to the indexes.
+        """
+        for label in ('ImageId', 'ImageName'):
+            params = {}
+            self.connection.build_list_params(params, self.owner_alias, 'ImageOwnerAlias')
+            self.connection.build_list_params(params, ImageStatuses, 'Status')
+            self.connection.build_list_params(params, name_or_id, label)
+            images = self.connection.get_list('DescribeImages', params, ['Images', Image])
+            if images:
+                with self._lock:
+                    self._index(images[0])
+                return images[0].id
+        return None
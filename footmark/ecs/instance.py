@@ -2,12 +2,48 @@
 Represents an ECS Instance
 """
 from footmark.ecs.ecsobject import TaggedECSObject
+from footmark.model import first_ip, lower
 
 
 class Instance(TaggedECSObject):
     """
     Represents an instance.
     """
+    _fields = ('instance_id', 'instance_name', 'description', 'image_id', 'region_id', 'zone_id', 'cpu', 'memory',
+               'instance_type', 'instance_type_family', 'host_name', 'serial_number', 'status',
+               'security_group_ids', 'public_ip_address', 'inner_ip_address', 'instance_network_type',
+               'internet_max_bandwidth_in', 'internet_max_bandwidth_out', 'internet_charge_type', 'creation_time',
+               'start_time', 'expired_time', 'vpc_attributes', 'eip_address', 'instance_charge_type', 'spot_strategy',
+               'spot_price_limit', 'device_available', 'deployment_set_id', 'network_interfaces', 'io_optimized',
+               'key_pair_name', 'operation_locks', 'stopped_mode', 'gpu_amount', 'gpu_spec', 'os_name', 'os_type',
+               'auto_release_time', 'recyclable', 'sale_cycle', 'local_storage_amount', 'local_storage_capacity',
+               'cluster_id', 'request_id', 'block_device_mapping', 'security_groups', 'security_group_id',
+               'security_group_name', 'private_ip_address', 'vswitch_id', 'vpc_id')
+    _aliases = {
+        'id': 'instance_id', 'name': 'instance_name', 'state': 'status',
+        'inner_ip': 'inner_ip_address',
+        'public_ip': 'public_ip_address', 'assign_public_ip': 'public_ip_address',
+        'private_ip': 'private_ip_address', 'vpc_private_ip': 'private_ip_address',
+        'vpc_private_ip_address': 'private_ip_address',
+        'vpc_vswitch_id': 'vswitch_id', 'vpc_subnet_id': 'vswitch_id', 'subnet_id': 'vswitch_id',
+        'eip': 'eip_address', 'elastic_ip_address': 'eip_address',
+        'group_id': 'security_group_id', 'group_name': 'security_group_name', 'groups': 'security_groups',
+        'key_name': 'key_pair_name', 'keypair': 'key_pair_name', 'key_pair': 'key_pair_name',
+    }
+    _converters = {
+        'status': lower,
+        'public_ip_address': first_ip, 'inner_ip_address': first_ip, 'private_ip_address': first_ip,
+        'eip_address': lambda value: value['ip_address'] if isinstance(value, dict) and value.get('ip_address') else value,
+        'security_group_id': lambda value: value[0] if isinstance(value, list) and value else value,
+    }
+    # Fallbacks for attributes that are not set directly
+    _computed = {
+        'private_ip_address': lambda self: self.vpc_attributes['private_ip_address']['ip_address'][0],
+        'vswitch_id': lambda self: self.vpc_attributes['vswitch_id'],
+        'vpc_id': lambda self: self.vpc_attributes['vpc_id'],
+        'security_group_name': lambda self: self.security_groups[0].security_group_name,
+        'key_pair_name': lambda self: '',
+    }
 
     def __init__(self, connection=None):
         super(Instance, self).__init__(connection)
@@ -16,85 +52,6 @@ class Instance(TaggedECSObject):
     def __repr__(self):
         return 'Instance:%s' % self.id
 
-    def __getattr__(self, name):
-        if name == 'id':
-            return self.instance_id
-        if name == 'name':
-            return self.instance_name
-        if name == 'state':
-            return self.status
-        if name in ('inner_ip', 'inner_ip_address'):
-            return self.inner_ip_address['ip_address'][0]
-        if name in ('public_ip', 'assign_public_ip', 'public_ip_address'):
-                return self.public_ip_address['ip_address'][0]
-        if name in ('private_ip', 'private_ip_address', 'vpc_private_ip', 'vpc_private_ip_address'):
-            return self.vpc_attributes['private_ip_address']['ip_address'][0]
-        if name in ('vpc_vswitch_id', 'vswitch_id', 'vpc_subnet_id', 'subnet_id'):
-            return self.vpc_attributes['vswitch_id']
-        if name == 'vpc_id':
-            return self.vpc_attributes['vpc_id']
-        if name in ('eip', 'elastic_ip_address'):
-            return self.eip_address
-        if name in ('group_id', 'security_group_id'):
-            return self.security_group_id
-        if name in ('group_name', 'security_group_name') and self.security_groups:
-            return self.security_groups[0].security_group_name
-        if name == 'groups':
-            return self.security_groups
-        if name in ('key_name', 'keypair', 'key_pair'):
-            return getattr(self, 'key_pair_name', '')
-        raise AttributeError("Object {0} does not have attribute {1}".format(self.__repr__(), name))
-
-    def __setattr__(self, name, value):
-        if name == 'id':
-            self.instance_id = value
-        if name == 'name':
-            self.instance_name = value
-        if name == 'status':
-            value = value.lower()
-        if name == 'state':
-            self.status = value
-        if name in ('public_ip_address', 'inner_ip_address', 'private_ip_address'):
-            if isinstance(value, dict):
-                if value['ip_address']:
-                    value = value['ip_address'][0]
-                else:
-                    value = None
-        if name  == 'eip_address' and isinstance(value, dict) and value['ip_address']:
-            value = value['ip_address']
-        if name == 'inner_ip':
-            self.inner_ip_address = value
-        if name in ('public_ip', 'assign_public_ip'):
-            self.public_ip_address = value
-        if name in ('private_ip', 'vpc_private_ip', 'vpc_private_ip_address'):
-            self.vpc_attributes['private_ip_address'] = value
-            self.private_ip_address = value
-        if name in ('vpc_vswitch_id', 'vswitch_id', 'vpc_subnet_id', 'subnet_id'):
-            self.vpc_attributes['vswitch_id'] = value
-        if name == 'vpc_id':
-            self.vpc_attributes['vpc_id'] = value
-        if name in ('eip', 'elastic_ip_address'):
-            self.eip_address = value
-        if name in ('group_id', 'security_group_id'):
-            if isinstance(value, list) and value:
-                value = value[0]
-        if name in ('group_name', 'security_group_name') and self.security_groups:
-            self.security_groups[0].security_group_name = value
-        if name == 'groups':
-            self.security_groups = value
-        if name in ('key_name', 'keypair', 'key_pair'):
-            self.key_pair_name = value
-        if name == 'tags' and value:
-            v = {}
-            for tag in value['tag']:
-                if tag.get('tag_key'):
-                    v[tag.get('tag_key')] = tag.get('tag_value', None)
-            value = v
-        super(TaggedECSObject, self).__setattr__(name, value)
-
-    def _update(self, updated):
-        self.__dict__.update(updated.__dict__)
-
     def update(self, validate=False):
         """
         Update the instance's state information by making a call to fetch
@@ -107,12 +64,7 @@ class Instance(TaggedECSObject):
                          raise a ValueError exception if no data is
                          returned from ECS.
         """
-        rs = self.connection.get_all_instances([self.id])
-        if len(rs) > 0:
-            for r in rs:
-                if r.id == self.id:
-                    self._update(r)
-        elif validate:
+        if self.connection.refresh([self]) and validate:
             raise ValueError('%s is not a valid Instance ID' % self.id)
         return self.state
 
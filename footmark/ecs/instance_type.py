@@ -9,6 +9,10 @@ class InstanceType(TaggedECSObject):
     Represents an instance type.
     """
 
+    _fields = ('instance_type_id', 'instance_type_family', 'cpu_core_count', 'memory_size', 'gpu_amount', 'gpu_spec',
+               'local_storage_amount', 'local_storage_capacity', 'local_storage_category', 'eni_quantity')
+    _aliases = {'id': 'instance_type_id', 'family': 'instance_type_family'}
+
     def __init__(self, connection=None):
         super(InstanceType, self).__init__(connection)
         self.tags = {}
@@ -16,40 +20,18 @@ class InstanceType(TaggedECSObject):
     def __repr__(self):
         return 'InstanceType:%s' % self.id
 
-    def __getattr__(self, name):
-        if name == 'id':
-            return self.instance_type_id
-        if name == 'family':
-            return self.instance_type_family
-        raise AttributeError
-
-    def __setattr__(self, name, value):
-        if name == 'id':
-            self.instance_type_id = value
-        if name == 'family':
-            self.instance_type_family = value
-        super(TaggedECSObject, self).__setattr__(name, value)
-
 
 class InstanceTypeFamily(TaggedECSObject):
     """
        Represents an instance type family.
     """
 
+    _fields = ('instance_type_family_id', 'generation')
+    _aliases = {'id': 'instance_type_family_id'}
+
     def __init__(self, connection=None):
         super(InstanceTypeFamily, self).__init__(connection)
         self.tags = {}
 
     def __repr__(self):
         return 'InstanceTypeFamily:%s' % self.id
-
-    def __getattr__(self, name):
-        if name == 'id':
-            return self.instance_type_family_id
-        raise AttributeError
-
-    def __setattr__(self, name, value):
-        if name == 'id':
-            self.instance_type_family_id = value
-        super(TaggedECSObject, self).__setattr__(name, value)
-
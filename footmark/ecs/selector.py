@@ -0,0 +1,191 @@
+"""
+Represents a vectorized instance type selection engine over the ECS region catalog.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import six
+
+from footmark.ecs.catalog import CatalogStore
+from footmark.exception import FootmarkClientError
+
+# Columns loaded from the catalog, as (column name, default value).
+NumericColumns = (('cpu_core_count', 0), ('memory_size', 0.0), ('gpu_amount', 0),
+                  ('local_storage_amount', 0), ('eni_quantity', 0))
+CategoricalColumns = ('instance_type_id', 'instance_type_family', 'generation')
+
+Operators = {
+    'eq': lambda col, v: col == v,
+    'ne': lambda col, v: col != v,
+    'lt': lambda col, v: col < v,
+    'le': lambda col, v: col <= v,
+    'gt': lambda col, v: col > v,
+    'ge': lambda col, v: col >= v,
+    'between': lambda col, v: (col >= v[0]) & (col <= v[1]),
+}
+
+
+class InstanceTypeSelector(object):
+    """
+    Loads the instance type catalog of a region into NumPy columns once and
+    evaluates selection constraints as vectorized boolean masks.
+
+    Constraints are keyword arguments of the form ``<column>__<operator>``,
+    e.g. ``cpu_core_count__ge=2`` or ``instance_type_family__in=['ecs.n4']``.
+    The operator defaults to ``eq``. Numeric columns support ``eq``, ``ne``,
+    ``lt``, ``le``, ``gt``, ``ge``, ``between`` and ``in``; categorical columns
+    support ``eq``, ``ne`` and ``in``.
+
+    :type connection: :class:`footmark.ecs.connection.ECSConnection`
+    :param connection: The connection used to load the catalog.
+
+    :type catalog: :class:`footmark.ecs.catalog.CatalogStore`
+    :param catalog: The catalog to load from. Defaults to the connection's
+        catalog, or an in-memory one.
+    """
+
+    def __init__(self, connection, catalog=None):
+        if numpy is None:
+            raise FootmarkClientError('InstanceTypeSelector requires numpy to be installed.')
+        self.connection = connection
+        self.catalog = catalog or connection.catalog or CatalogStore(persistent=False)
+        self.reload()
+
+    def reload(self):
+        """
+        Rebuild the columns from the current catalog entries.
+        """
+        types = self.catalog.entry(self.connection, 'instance_types').items
+        families = self.catalog.entry(self.connection, 'instance_type_families').items
+        zones = self.catalog.entry(self.connection, 'zones').items
+
+        generations = dict((f.get('instance_type_family_id'), f.get('generation')) for f in families)
+
+        self.size = len(types)
+        self.numeric = {}
+        for name, default in NumericColumns:
+            dtype = numpy.float64 if isinstance(default, float) else numpy.int64
+            self.numeric[name] = numpy.array([t.get(name) or default for t in types], dtype=dtype)
+
+        # Categorical columns are stored as integer codes into a sorted vocabulary.
+        raw = {
+            'instance_type_id': [t.get('instance_type_id') or '' for t in types],
+            'instance_type_family': [t.get('instance_type_family') or '' for t in types],
+            'generation': [generations.get(t.get('instance_type_family')) or '' for t in types],
+        }
+        self.vocabulary = {}
+        self.codes = {}
+        for name in CategoricalColumns:
+            vocabulary, codes = numpy.unique(numpy.array(raw[name], dtype=object), return_inverse=True)
+            self.vocabulary[name] = dict((v, i) for i, v in enumerate(vocabulary))
+            self.codes[name] = codes
+        self.ids = numpy.array(raw['instance_type_id'], dtype=object)
+
+        # availability[z, t] is True when zone z offers instance type t.
+        self.zone_ids = [z.get('zone_id') for z in zones]
+        self.zone_index = dict((zone_id, i) for i, zone_id in enumerate(self.zone_ids))
+        type_index = dict((type_id, i) for i, type_id in enumerate(raw['instance_type_id']))
+        self.availability = numpy.zeros((len(zones), self.size), dtype=bool)
+        for z, zone in enumerate(zones):
+            available = (zone.get('available_instance_types') or {}).get('instance_types') or []
+            positions = [type_index[t] for t in available if t in type_index]
+            self.availability[z, positions] = True
+
+    def columns(self):
+        """
+        Return a dict of the numeric columns, keyed by column name.
+        """
+        return dict(self.numeric)
+
+    def _categorical_mask(self, name, op, value):
+        vocabulary = self.vocabulary[name]
+        codes = self.codes[name]
+        if op == 'in':
+            wanted = [vocabulary[v] for v in value if v in vocabulary]
+            return numpy.in1d(codes, wanted)
+        if op not in ('eq', 'ne'):
+            raise FootmarkClientError("Operator '%s' is not supported on column '%s'." % (op, name))
+        code = vocabulary.get(value, -1)
+        return codes == code if op == 'eq' else codes != code
+
+    def mask(self, **constraints):
+        """
+        Evaluate constraints into a boolean array over the catalog's instance types.
+        """
+        mask = numpy.ones(self.size, dtype=bool)
+        for key, value in constraints.items():
+            name, _, op = key.partition('__')
+            op = op or 'eq'
+            if name in self.codes:
+                mask &= self._categorical_mask(name, op, value)
+            elif name in self.numeric:
+                column = self.numeric[name]
+                if op == 'in':
+                    mask &= numpy.in1d(column, list(value))
+                elif op in Operators:
+                    mask &= Operators[op](column, value)
+                else:
+                    raise FootmarkClientError("Unknown operator '%s' in constraint '%s'." % (op, key))
+            else:
+                raise FootmarkClientError("Unknown column '%s' in constraint '%s'." % (name, key))
+        return mask
+
+    def score(self, cost=None, fit=None):
+        """
+        Return a score array over all instance types, lower is better.
+
+        :type cost: dict or callable
+        :param cost: Either a dict mapping instance type ID to price, or a
+            callable taking the dict of numeric columns and returning an array.
+
+        :type fit: tuple
+        :param fit: A ``(cpu_core_count, memory_size)`` target. Types are scored
+            by their relative oversize against it.
+        """
+        if cost is not None:
+            if callable(cost):
+                return numpy.asarray(cost(self.columns()), dtype=numpy.float64)
+            return numpy.array([cost.get(type_id, numpy.inf) for type_id in self.ids], dtype=numpy.float64)
+        if fit is not None:
+            cpu, memory = fit
+            return self.numeric['cpu_core_count'] / float(cpu) + self.numeric['memory_size'] / float(memory)
+        return self.numeric['cpu_core_count'] * 1024.0 + self.numeric['memory_size']
+
+    def select(self, zone_ids=None, cost=None, fit=None, limit=None, **constraints):
+        """
+        Select and rank instance types matching the constraints.
+
+        :type zone_ids: str or list
+        :param zone_ids: When given, candidates are crossed with the zones
+            offering them and one result is returned per (type, zone) pair.
+
+        :type limit: int
+        :param limit: Return at most this many results.
+
+        :rtype: list
+        :return: A list of ``(instance_type_id, zone_id, score)`` tuples ordered
+            by score; ``zone_id`` is None when ``zone_ids`` is not given.
+        """
+        mask = self.mask(**constraints)
+        scores = self.score(cost=cost, fit=fit)
+        mask &= numpy.isfinite(scores)
+        candidates = numpy.nonzero(mask)[0]
+        candidates = candidates[numpy.argsort(scores[candidates], kind='mergesort')]
+
+        if zone_ids is None:
+            if limit is not None:
+                candidates = candidates[:limit]
+            return [(self.ids[i], None, float(scores[i])) for i in candidates]
+
+        if isinstance(zone_ids, six.string_types):
+            zone_ids = [zone_ids]
+        zones = [self.zone_index[z] for z in zone_ids if z in self.zone_index]
+        # Rows are candidates in score order, columns the requested zones.
+        available = self.availability[zones][:, candidates].T
+        rows, cols = numpy.nonzero(available)
+        if limit is not None:
+            rows, cols = rows[:limit], cols[:limit]
+        return [(self.ids[candidates[r]], self.zone_ids[zones[c]], float(scores[candidates[r]]))
+                for r, c in zip(rows, cols)]
@@ -0,0 +1,200 @@
+"""
+Represents an ECS snapshot and a tracker following the progress of many snapshots.
+"""
+import time
+
+from footmark.ecs.config import SnapshotTimeOut, SnapshotMinPollInterval, SnapshotMaxPollInterval, \
+    SnapshotMissingPolls
+from footmark.ecs.ecsobject import TaggedECSObject
+from footmark.model import lower
+
+
+class Snapshot(TaggedECSObject):
+    """
+    Represents a disk snapshot.
+
+    :ivar id: The unique ID of the snapshot.
+    :ivar name: The name of the snapshot.
+    :ivar status: The status of the snapshot: progressing, accomplished or failed.
+    :ivar progress: The progress reported by ECS, e.g. "45%".
+    :ivar percent: The progress as an int between 0 and 100.
+    :ivar source_disk_id: The ID of the disk the snapshot was taken from.
+    """
+
+    _fields = ('snapshot_id', 'snapshot_name', 'description', 'status', 'progress', 'source_disk_id',
+               'source_disk_size', 'source_disk_type', 'product_code', 'creation_time', 'last_modified_time',
+               'usage', 'encrypted', 'remain_time', 'retention_days', 'request_id')
+    _aliases = {'id': 'snapshot_id', 'name': 'snapshot_name', 'state': 'status'}
+    _converters = {'status': lower}
+
+    def __init__(self, connection=None):
+        super(Snapshot, self).__init__(connection)
+        self.tags = {}
+
+    def __repr__(self):
+        return 'Snapshot:%s' % self.id
+
+    @property
+    def percent(self):
+        try:
+            return int(str(self.progress).strip().rstrip('%') or 0)
+        except (AttributeError, ValueError):
+            return 0
+
+    @property
+    def completed(self):
+        return self.status == 'accomplished' or self.percent >= 100
+
+    @property
+    def failed(self):
+        return self.status == 'failed'
+
+
+class SnapshotTracker(object):
+    """
+    Follows the progress of many snapshots with one batched DescribeSnapshots
+    call per poll.
+
+    The first and the latest progress sample of every snapshot give its
+    progress rate, from which its completion time is extrapolated. The next
+    poll is scheduled for the earliest expected completion among the pending
+    snapshots, bounded by ``min_delay`` and ``max_delay``. While no estimate
+    is available yet the interval doubles from ``min_delay``. A snapshot is
+    considered missing once ``missing_polls`` consecutive polls did not
+    return it.
+
+    :type connection: :class:`footmark.ecs.connection.ECSConnection`
+    :param connection: The connection used to describe the snapshots.
+
+    :type snapshot_ids: list
+    :param snapshot_ids: The IDs of the snapshots to follow.
+
+    :type callback: callable
+    :param callback: Called as ``callback(snapshot, eta)`` whenever the status
+        or progress of a snapshot changes. ``eta`` is the estimated number of
+        seconds to completion, or None when it is not known yet.
+
+    :ivar errors: A dict mapping disk ID to the exception raised while
+        creating its snapshot, filled by
+        :meth:`footmark.ecs.connection.ECSConnection.snapshot_instances`.
+    """
+
+    def __init__(self, connection, snapshot_ids, callback=None,
+                 min_delay=SnapshotMinPollInterval, max_delay=SnapshotMaxPollInterval,
+                 missing_polls=SnapshotMissingPolls):
+        self.connection = connection
+        self.snapshot_ids = []
+        for snapshot_id in snapshot_ids:
+            if snapshot_id and str(snapshot_id) not in self.snapshot_ids:
+                self.snapshot_ids.append(str(snapshot_id))
+        self.callback = callback
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.missing_polls = missing_polls
+        self.snapshots = {}
+        self.missing = set()
+        self._misses = {}
+        self.errors = {}
+        self._samples = {}
+        self._blind_polls = 0
+
+    @property
+    def pending(self):
+        """
+        The IDs of the snapshots that are neither completed, failed nor missing.
+        """
+        return [snapshot_id for snapshot_id in self.snapshot_ids
+                if snapshot_id not in self.missing and not self._finished(snapshot_id)]
+
+    @property
+    def completed(self):
+        return [snapshot_id for snapshot_id in self.snapshot_ids
+                if snapshot_id in self.snapshots and self.snapshots[snapshot_id].completed]
+
+    @property
+    def failed(self):
+        return [snapshot_id for snapshot_id in self.snapshot_ids
+                if snapshot_id in self.snapshots and self.snapshots[snapshot_id].failed]
+
+    def _finished(self, snapshot_id):
+        snapshot = self.snapshots.get(snapshot_id)
+        return snapshot is not None and (snapshot.completed or snapshot.failed)
+
+    def poll(self):
+        """
+        Describe all pending snapshots at once and record their progress.
+
+        :rtype: list
+        :return: The IDs still pending after this poll.
+        """
+        pending = self.pending
+        if not pending:
+            return pending
+        found = self.connection.get_snapshots_by_ids(pending)
+        now = time.time()
+        for snapshot_id in pending:
+            snapshot = found.get(snapshot_id)
+            if snapshot is None:
+                self._misses[snapshot_id] = self._misses.get(snapshot_id, 0) + 1
+                if self._misses[snapshot_id] >= self.missing_polls:
+                    self.missing.add(snapshot_id)
+                continue
+            self._misses.pop(snapshot_id, None)
+            previous = self.snapshots.get(snapshot_id)
+            self.snapshots[snapshot_id] = snapshot
+            samples = self._samples.setdefault(snapshot_id, [])
+            if len(samples) < 2:
+                samples.append((now, snapshot.percent))
+            else:
+                samples[1] = (now, snapshot.percent)
+            if self.callback and (previous is None or previous.progress != snapshot.progress or
+                                  previous.status != snapshot.status):
+                self.callback(snapshot, self.eta(snapshot_id, now))
+        return self.pending
+
+    def eta(self, snapshot_id, now=None):
+        """
+        Return the estimated number of seconds until the snapshot completes,
+        or None when its progress rate is not known yet.
+        """
+        if self._finished(snapshot_id):
+            return 0
+        samples = self._samples.get(snapshot_id)
+        if not samples or len(samples) < 2:
+            return None
+        (t0, p0), (t1, p1) = samples
+        if p1 <= p0 or t1 <= t0:
+            return None
+        rate = float(p1 - p0) / (t1 - t0)
+        if now is None:
+            now = time.time()
+        return max(0.0, (100 - p1) / rate - (now - t1))
+
+    def next_delay(self, now=None):
+        """
+        Return the number of seconds to wait before the next poll.
+        """
+        estimates = [eta for eta in (self.eta(snapshot_id, now) for snapshot_id in self.pending) if eta is not None]
+        if estimates:
+            self._blind_polls = 0
+            delay = min(estimates)
+        else:
+            delay = self.min_delay * 2 ** self._blind_polls
+            self._blind_polls += 1
+        return min(max(delay, self.min_delay), self.max_delay)
+
+    def wait(self, timeout=SnapshotTimeOut):
+        """
+        Poll until no snapshot is pending or ``timeout`` seconds have passed.
+
+        :rtype: bool
+        :return: True if every snapshot completed; False if any failed, was
+            not found, could not be created or is still pending at the timeout.
+        """
+        deadline = time.time() + timeout
+        while self.poll():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.next_delay(), remaining))
+        return not self.errors and len(self.completed) == len(self.snapshot_ids)
@@ -2,6 +2,7 @@
 Represents an ECS Elastic Block Storage Volume
 """
 from footmark.ecs.ecsobject import TaggedECSObject
+from footmark.model import lower
 
 
 class Disk(TaggedECSObject):
@@ -22,49 +23,24 @@ class Disk(TaggedECSObject):
     :ivar encrypted: True if this volume is encrypted.
     """
 
+    _fields = ('disk_id', 'disk_name', 'description', 'region_id', 'zone_id', 'category', 'type', 'size', 'status',
+               'instance_id', 'device', 'delete_with_instance', 'delete_auto_snapshot', 'enable_auto_snapshot',
+               'portable', 'encrypted', 'image_id', 'source_snapshot_id', 'product_code', 'creation_time',
+               'attached_time', 'detached_time', 'expired_time', 'disk_charge_type', 'operation_locks',
+               'mount_instances', 'auto_snapshot_policy_id', 'enable_automated_snapshot_policy', 'iops',
+               'iops_read', 'iops_write', 'request_id')
+    _aliases = {'id': 'disk_id', 'name': 'disk_name', 'state': 'status',
+                'delete_on_termination': 'delete_with_instance'}
+    _prefix_aliases = (('volume', 'disk'),)
+    _converters = {'status': lower}
+
     def __init__(self, connection=None):
         super(Disk, self).__init__(connection)
-        self.tag = {}
+        self.tags = {}
 
     def __repr__(self):
         return 'Disk:%s' % self.id
 
-    def __getattr__(self, name):
-        if name.startswith('volume'):
-            return getattr(self, 'disk' + name[6:])
-        if name == 'id':
-            return self.disk_id
-        if name == 'name':
-            return self.disk_name
-        if name == 'state':
-            return self.status
-        if name == 'delete_on_termination':
-            return self.delete_with_instance
-        raise AttributeError
-
-    def __setattr__(self, name, value):
-        if name.startswith('volume'):
-            return setattr(self, 'disk' + name[6:])
-        if name == 'id':
-            self.disk_id = value
-        if name == 'name':
-            self.disk_name = value
-        if name == 'status':
-            value = value.lower()
-        if name == 'state':
-            self.status = value
-        if name == 'delete_on_termination':
-            self.delete_with_instance = value
-        if name == 'tags' and value:
-            v = {}
-            for tag in value['tag']:
-                v[tag.get('TagKey')] = tag.get('TagValue', None)
-            value = v
-        super(TaggedECSObject, self).__setattr__(name, value)
-
-    def _update(self, updated):
-        self.__dict__.update(updated.__dict__)
-
     def update(self, validate=False):
         """
         Update the data associated with this volume by querying ECS.
@@ -76,17 +52,7 @@ class Disk(TaggedECSObject):
                          raise a ValueError exception if no data is
                          returned from ECS.
         """
-        # Check the resultset since Eucalyptus ignores the volumeId param
-        unfiltered_rs = self.connection.get_all_volumes([self.id])
-        rs = [x for x in unfiltered_rs if x.id == self.id]
-        if len(rs) > 0:
-            self._update(rs[0])
-        # rs = self.connection.get_all_volumes([self.id])
-        # if len(rs) > 0:
-        #     for r in rs:
-        #         if r.id == self.id:
-        #             self._update(r)
-        elif validate:
+        if self.connection.refresh([self]) and validate:
             raise ValueError('%s is not a valid Volume ID' % self.id)
         return self.status
 
@@ -9,19 +9,13 @@ class Zone(TaggedECSObject):
        Represents an instance type family.
     """
 
+    _fields = ('zone_id', 'local_name', 'available_resource_creation', 'available_disk_categories',
+               'available_instance_types', 'available_resources', 'available_volume_categories')
+    _aliases = {'id': 'zone_id'}
+
     def __init__(self, connection=None):
         super(Zone, self).__init__(connection)
         self.tags = {}
 
     def __repr__(self):
         return 'Zone:%s' % self.id
-
-    def __getattr__(self, name):
-        if name == 'id':
-            return self.zone_id
-        raise AttributeError
-
-    def __setattr__(self, name, value):
-        if name == 'id':
-            self.zone_id = value
-        super(TaggedECSObject, self).__setattr__(name, value)
@@ -0,0 +1,523 @@
+"""
+An in-process stand-in for the ECS, VPC, SLB and RDS APIs, keeping the
+state of the resources it creates.
+"""
+import ast
+import itertools
+import json
+import random
+import threading
+import time
+
+from footmark.transport import Transport
+
+# Seconds, on the emulator clock, each transitional status lasts.
+DefaultTransitions = {
+    'Pending': 2.0,
+    'Starting': 2.0,
+    'Stopping': 2.0,
+    'Creating': 1.0,
+    'Attaching': 1.0,
+    'Detaching': 1.0,
+}
+
+DefaultPageSize = 10
+MaxPageSize = 100
+
+
+class ManualClock(object):
+    """
+    A clock advanced only by :meth:`sleep`, to run waiters without waiting::
+
+        clock = ManualClock()
+        conn.transport = Emulator(clock=clock)
+        with mock.patch('time.sleep', clock.sleep):
+            conn.create_instance(...)
+    """
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += seconds
+
+
+class Resource(object):
+    """
+    A resource of the emulator: the fields returned by the describe actions,
+    and the statuses it goes through, each with the time it starts.
+    """
+
+    def __init__(self, kind, fields, status, now):
+        self.kind = kind
+        self.fields = fields
+        self._statuses = [(now, status)]
+
+    @property
+    def id(self):
+        return self.fields[self.kind + 'Id']
+
+    def status(self, now):
+        current = self._statuses[0][1]
+        for start, status in self._statuses:
+            if start > now:
+                break
+            current = status
+        return current
+
+    def transition(self, now, transitions, *statuses):
+        """
+        Go through ``statuses``, each transitional one lasting its time in
+        ``transitions``.
+        """
+        start = now
+        self._statuses = [(now, self.status(now))]
+        for status in statuses:
+            self._statuses.append((start, status))
+            start += transitions.get(status, 0)
+
+    def describe(self, now):
+        fields = dict(self.fields)
+        fields['Status'] = self.status(now)
+        return fields
+
+
+class Emulator(Transport):
+    """
+    Answers the requests of the connections it is assigned to, as
+    ``connection.transport``, from resources kept in memory. Created
+    resources go through the statuses of the real services, e.g. an
+    instance is Pending, then Stopped; StartInstance makes it Starting,
+    then Running. Listings are paged with PageNumber and PageSize and carry
+    TotalCount. Unknown IDs and operations on a resource in the wrong
+    status raise the ServerException of the real service.
+
+    :type clock: callable
+    :param clock: Returns the current time; ``time.time`` by default. Use a
+        :class:`ManualClock` to advance it from the waiters' sleeps.
+
+    :type transitions: dict
+    :param transitions: The seconds each transitional status lasts,
+        overriding DefaultTransitions.
+
+    :type latency: float
+    :param latency: Seconds slept with ``time.sleep`` before each response.
+    """
+
+    def __init__(self, clock=None, transitions=None, latency=None):
+        self.clock = clock or time.time
+        self.latency = latency
+        self.transitions = dict(DefaultTransitions, **(transitions or {}))
+        self.calls = {}
+        self._resources = {}
+        self._errors = []
+        self._throttles = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def request(self, connection, action, params):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[action] = self.calls.get(action, 0) + 1
+            request_id = self._new_id('req').upper()
+            try:
+                self._throttle(action)
+                self._injected_error(action)
+                handler = getattr(self, '_' + action, None)
+                if handler is None:
+                    raise _server_error('InvalidAction.NotFound', 'Specified api is not found, please check your '
+                                        'url and method.', 404)
+                values = dict((name[4:] if name.startswith('set_') else name, value)
+                              for name, value in (params or {}).items())
+                result = handler(connection.region, values)
+            except Exception as e:
+                if getattr(e, 'request_id', '') is None:
+                    e.request_id = request_id
+                raise
+            result['RequestId'] = request_id
+            return json.dumps(result)
+
+    def calls_count(self):
+        return sum(self.calls.values())
+
+    def inject_error(self, action, code, message='Injected error.', http_status=400, times=1, probability=1.0):
+        """
+        Make the next ``times`` requests of ``action`` (any action when
+        None) raise a ServerException with ``code``, each with the given
+        ``probability``.
+        """
+        with self._lock:
+            self._errors.append([action, code, message, http_status, times, probability])
+
+    def throttle(self, rate, burst=None, action=None):
+        """
+        Allow ``rate`` requests per second of ``action`` (of all actions when
+        None) on the emulator clock, with bursts of ``burst``; requests over
+        the limit raise a Throttling ServerException.
+        """
+        burst = burst or max(1, int(rate))
+        with self._lock:
+            self._throttles[action] = [float(rate), burst, float(burst), self.clock()]
+
+    def add(self, kind, region, status, **fields):
+        """
+        Create a resource directly, e.g. to seed large listings, and return
+        its ID.
+        """
+        with self._lock:
+            prefix = {'Instance': 'i', 'Disk': 'd', 'SecurityGroup': 'sg', 'Vpc': 'vpc', 'VSwitch': 'vsw',
+                      'LoadBalancer': 'lb', 'DBInstance': 'rm'}[kind]
+            fields.setdefault(kind + 'Id', self._new_id(prefix))
+            fields.setdefault('RegionId', region)
+            resource = Resource(kind, fields, status, self.clock())
+            self._resources.setdefault(kind, {})[resource.id] = resource
+            return resource.id
+
+    def get(self, kind, resource_id):
+        """
+        Return the fields of a resource as described, or None.
+        """
+        resource = self._resources.get(kind, {}).get(resource_id)
+        return resource.describe(self.clock()) if resource is not None else None
+
+    def _new_id(self, prefix):
+        return '%s-emu%08x' % (prefix, next(self._ids))
+
+    def _throttle(self, action):
+        for key in (action, None):
+            bucket = self._throttles.get(key)
+            if bucket is None:
+                continue
+            rate, burst, tokens, last = bucket
+            now = self.clock()
+            tokens = min(burst, tokens + (now - last) * rate)
+            bucket[3] = now
+            if tokens < 1:
+                bucket[2] = tokens
+                raise _server_error('Throttling', 'Request was denied due to request throttling.', 400)
+            bucket[2] = tokens - 1
+
+    def _injected_error(self, action):
+        for error in self._errors:
+            if error[0] in (None, action) and error[4] > 0:
+                if random.random() >= error[5]:
+                    continue
+                error[4] -= 1
+                if not error[4]:
+                    self._errors.remove(error)
+                raise _server_error(error[1], error[2], error[3])
+
+    def _find(self, kind, region, resource_id, code=None):
+        resource = self._resources.get(kind, {}).get(resource_id)
+        if resource is None or resource.fields.get('RegionId') != region:
+            raise _server_error(code or 'Invalid%sId.NotFound' % kind,
+                                'The specified %s does not exist.' % kind, 404)
+        return resource
+
+    def _list(self, kind, region, params, filters, ids_param=None):
+        now = self.clock()
+        ids = _id_list(params.get(ids_param)) if params.get(ids_param) else None
+        items = []
+        for resource in self._resources.get(kind, {}).values():
+            if resource.fields.get('RegionId') != region or (ids is not None and resource.id not in ids):
+                continue
+            described = resource.describe(now)
+            if all(described.get(field) == params[name] for name, field in filters.items() if params.get(name)):
+                items.append(described)
+        return items
+
+    def _page(self, items, params, outer, inner):
+        page_number = max(int(params.get('PageNumber') or 1), 1)
+        page_size = min(max(int(params.get('PageSize') or DefaultPageSize), 1), MaxPageSize)
+        start = (page_number - 1) * page_size
+        return {
+            outer: {inner: items[start:start + page_size]},
+            'TotalCount': len(items),
+            'PageNumber': page_number,
+            'PageSize': page_size,
+        }
+
+    def _expect(self, resource, statuses, code):
+        status = resource.status(self.clock())
+        if status not in statuses:
+            raise _server_error(code, 'The current status of the resource does not support this operation.', 403)
+
+    # ECS
+
+    def _DescribeRegions(self, region, params):
+        regions = sorted(set(r.fields['RegionId'] for kind in self._resources.values() for r in kind.values())
+                         | set([region]))
+        return {'Regions': {'Region': [{'RegionId': r, 'LocalName': r} for r in regions]}}
+
+    def _DescribeZones(self, region, params):
+        return {'Zones': {'Zone': [{'ZoneId': '%s-%s' % (region, suffix), 'LocalName': suffix}
+                                   for suffix in ('a', 'b')]}}
+
+    def _CreateInstance(self, region, params):
+        group_id = params.get('SecurityGroupId')
+        if group_id:
+            self._find('SecurityGroup', region, group_id)
+        vswitch_id = params.get('VSwitchId')
+        vpc_id = self._find('VSwitch', region, vswitch_id).fields['VpcId'] if vswitch_id else ''
+        instance_id = self.add('Instance', region, 'Pending',
+                               InstanceName=params.get('InstanceName', ''),
+                               HostName=params.get('HostName', ''),
+                               ZoneId=params.get('ZoneId') or '%s-a' % region,
+                               InstanceType=params.get('InstanceType', ''),
+                               ImageId=params.get('ImageId', ''),
+                               InstanceChargeType=params.get('InstanceChargeType', 'PostPaid'),
+                               InternetChargeType=params.get('InternetChargeType', 'PayByTraffic'),
+                               InstanceNetworkType='vpc' if vswitch_id else 'classic',
+                               VpcAttributes={'VpcId': vpc_id, 'VSwitchId': vswitch_id or '',
+                                              'PrivateIpAddress': {'IpAddress': []}},
+                               SecurityGroupIds={'SecurityGroupId': [group_id] if group_id else []},
+                               PublicIpAddress={'IpAddress': []},
+                               InnerIpAddress={'IpAddress': []},
+                               Tags={'Tag': []},
+                               CreationTime=time.strftime('%Y-%m-%dT%H:%MZ', time.gmtime()))
+        self._resources['Instance'][instance_id].transition(self.clock(), self.transitions, 'Pending', 'Stopped')
+        return {'InstanceId': instance_id}
+
+    def _DescribeInstances(self, region, params):
+        items = self._list('Instance', region, params, {'ZoneId': 'ZoneId', 'InstanceName': 'InstanceName',
+                                                        'Status': 'Status', 'InstanceType': 'InstanceType',
+                                                        'ImageId': 'ImageId'}, 'InstanceIds')
+        return self._page(items, params, 'Instances', 'Instance')
+
+    def _DescribeInstanceAttribute(self, region, params):
+        return self._find('Instance', region, params.get('InstanceId')).describe(self.clock())
+
+    def _StartInstance(self, region, params):
+        instance = self._find('Instance', region, params.get('InstanceId'))
+        self._expect(instance, ['Stopped'], 'IncorrectInstanceStatus')
+        instance.transition(self.clock(), self.transitions, 'Starting', 'Running')
+        return {}
+
+    def _StopInstance(self, region, params):
+        instance = self._find('Instance', region, params.get('InstanceId'))
+        self._expect(instance, ['Running'], 'IncorrectInstanceStatus')
+        instance.transition(self.clock(), self.transitions, 'Stopping', 'Stopped')
+        return {}
+
+    def _RebootInstance(self, region, params):
+        instance = self._find('Instance', region, params.get('InstanceId'))
+        self._expect(instance, ['Running'], 'IncorrectInstanceStatus')
+        instance.transition(self.clock(), self.transitions, 'Stopping', 'Starting', 'Running')
+        return {}
+
+    def _DeleteInstance(self, region, params):
+        instance = self._find('Instance', region, params.get('InstanceId'))
+        if str(params.get('Force')).lower() != 'true':
+            self._expect(instance, ['Stopped'], 'IncorrectInstanceStatus')
+        del self._resources['Instance'][instance.id]
+        for disk in self._resources.get('Disk', {}).values():
+            if disk.fields.get('InstanceId') == instance.id:
+                disk.fields['InstanceId'] = ''
+                disk.transition(self.clock(), self.transitions, 'Available')
+        return {}
+
+    def _CreateDisk(self, region, params):
+        disk_id = self.add('Disk', region, 'Creating',
+                           DiskName=params.get('DiskName', ''),
+                           Description=params.get('Description', ''),
+                           ZoneId=params.get('ZoneId') or '%s-a' % region,
+                           Category=params.get('DiskCategory', 'cloud'),
+                           Size=int(params.get('Size') or 40),
+                           Type='data',
+                           InstanceId='',
+                           Portable=True,
+                           DeleteWithInstance=False,
+                           Tags={'Tag': []})
+        self._resources['Disk'][disk_id].transition(self.clock(), self.transitions, 'Creating', 'Available')
+        return {'DiskId': disk_id}
+
+    def _DescribeDisks(self, region, params):
+        items = self._list('Disk', region, params, {'ZoneId': 'ZoneId', 'DiskName': 'DiskName',
+                                                    'InstanceId': 'InstanceId', 'Status': 'Status'}, 'DiskIds')
+        return self._page(items, params, 'Disks', 'Disk')
+
+    def _AttachDisk(self, region, params):
+        disk = self._find('Disk', region, params.get('DiskId'))
+        instance = self._find('Instance', region, params.get('InstanceId'))
+        self._expect(disk, ['Available'], 'IncorrectDiskStatus')
+        self._expect(instance, ['Running', 'Stopped'], 'IncorrectInstanceStatus')
+        disk.fields['InstanceId'] = instance.id
+        disk.transition(self.clock(), self.transitions, 'Attaching', 'In_use')
+        return {}
+
+    def _DetachDisk(self, region, params):
+        disk = self._find('Disk', region, params.get('DiskId'))
+        self._expect(disk, ['In_use'], 'IncorrectDiskStatus')
+        disk.fields['InstanceId'] = ''
+        disk.transition(self.clock(), self.transitions, 'Detaching', 'Available')
+        return {}
+
+    def _DeleteDisk(self, region, params):
+        disk = self._find('Disk', region, params.get('DiskId'))
+        self._expect(disk, ['Available'], 'IncorrectDiskStatus')
+        del self._resources['Disk'][disk.id]
+        return {}
+
+    def _CreateSecurityGroup(self, region, params):
+        group_id = self.add('SecurityGroup', region, 'Available',
+                            SecurityGroupName=params.get('SecurityGroupName', ''),
+                            Description=params.get('Description', ''),
+                            VpcId=params.get('VpcId', ''),
+                            Tags={'Tag': []})
+        return {'SecurityGroupId': group_id}
+
+    def _DescribeSecurityGroups(self, region, params):
+        items = self._list('SecurityGroup', region, params, {'VpcId': 'VpcId'}, 'SecurityGroupIds')
+        return self._page(items, params, 'SecurityGroups', 'SecurityGroup')
+
+    def _DescribeSecurityGroupAttribute(self, region, params):
+        group = self._find('SecurityGroup', region, params.get('SecurityGroupId'))
+        result = dict(group.fields)
+        result['Permissions'] = {'Permission': []}
+        return result
+
+    def _DeleteSecurityGroup(self, region, params):
+        group = self._find('SecurityGroup', region, params.get('SecurityGroupId'))
+        for instance in self._resources.get('Instance', {}).values():
+            if group.id in instance.fields['SecurityGroupIds']['SecurityGroupId']:
+                raise _server_error('DependencyViolation', 'There is still instance(s) in the specified '
+                                    'security group.', 403)
+        del self._resources['SecurityGroup'][group.id]
+        return {}
+
+    # VPC
+
+    def _CreateVpc(self, region, params):
+        vpc_id = self.add('Vpc', region, 'Pending',
+                          VpcName=params.get('VpcName', ''),
+                          CidrBlock=params.get('CidrBlock', '172.16.0.0/12'),
+                          Description=params.get('Description', ''),
+                          VRouterId=self._new_id('vrt'),
+                          VSwitchIds={'VSwitchId': []},
+                          IsDefault=False)
+        self._resources['Vpc'][vpc_id].transition(self.clock(), self.transitions, 'Pending', 'Available')
+        return {'VpcId': vpc_id, 'VRouterId': self._resources['Vpc'][vpc_id].fields['VRouterId']}
+
+    def _DescribeVpcs(self, region, params):
+        items = self._list('Vpc', region, params, {'VpcId': 'VpcId', 'VpcName': 'VpcName'})
+        return self._page(items, params, 'Vpcs', 'Vpc')
+
+    def _DeleteVpc(self, region, params):
+        vpc = self._find('Vpc', region, params.get('VpcId'))
+        if vpc.fields['VSwitchIds']['VSwitchId']:
+            raise _server_error('DependencyViolation.VSwitch', 'Specified VPC has vswitches.', 400)
+        del self._resources['Vpc'][vpc.id]
+        return {}
+
+    def _CreateVSwitch(self, region, params):
+        vpc = self._find('Vpc', region, params.get('VpcId'))
+        self._expect(vpc, ['Available'], 'IncorrectVpcStatus')
+        vswitch_id = self.add('VSwitch', region, 'Pending',
+                              VpcId=vpc.id,
+                              ZoneId=params.get('ZoneId') or '%s-a' % region,
+                              CidrBlock=params.get('CidrBlock', ''),
+                              VSwitchName=params.get('VSwitchName', ''),
+                              Description=params.get('Description', ''),
+                              AvailableIpAddressCount=252)
+        self._resources['VSwitch'][vswitch_id].transition(self.clock(), self.transitions, 'Pending', 'Available')
+        vpc.fields['VSwitchIds']['VSwitchId'].append(vswitch_id)
+        return {'VSwitchId': vswitch_id}
+
+    def _DescribeVSwitches(self, region, params):
+        items = self._list('VSwitch', region, params, {'VpcId': 'VpcId', 'VSwitchId': 'VSwitchId',
+                                                       'ZoneId': 'ZoneId'})
+        return self._page(items, params, 'VSwitches', 'VSwitch')
+
+    def _DeleteVSwitch(self, region, params):
+        vswitch = self._find('VSwitch', region, params.get('VSwitchId'))
+        for instance in self._resources.get('Instance', {}).values():
+            if instance.fields['VpcAttributes']['VSwitchId'] == vswitch.id:
+                raise _server_error('DependencyViolation', 'Specified vswitch has instances.', 400)
+        del self._resources['VSwitch'][vswitch.id]
+        vpc = self._resources.get('Vpc', {}).get(vswitch.fields['VpcId'])
+        if vpc is not None:
+            vpc.fields['VSwitchIds']['VSwitchId'].remove(vswitch.id)
+        return {}
+
+    # SLB
+
+    def _CreateLoadBalancer(self, region, params):
+        load_balancer_id = self.add('LoadBalancer', region, 'active',
+                                    LoadBalancerName=params.get('LoadBalancerName', ''),
+                                    AddressType=params.get('AddressType', 'internet'),
+                                    Address='10.%d.%d.%d' % (random.randint(0, 255), random.randint(0, 255),
+                                                             random.randint(1, 254)),
+                                    VpcId=params.get('VpcId', ''),
+                                    VSwitchId=params.get('VSwitchId', ''),
+                                    NetworkType='vpc' if params.get('VSwitchId') else 'classic')
+        fields = self._resources['LoadBalancer'][load_balancer_id].fields
+        return {'LoadBalancerId': load_balancer_id, 'LoadBalancerName': fields['LoadBalancerName'],
+                'Address': fields['Address'], 'VpcId': fields['VpcId'], 'VSwitchId': fields['VSwitchId']}
+
+    def _DescribeLoadBalancers(self, region, params):
+        items = self._list('LoadBalancer', region, params, {'LoadBalancerName': 'LoadBalancerName',
+                                                            'AddressType': 'AddressType'}, 'LoadBalancerId')
+        for item in items:
+            item['LoadBalancerStatus'] = item.pop('Status')
+        return self._page(items, params, 'LoadBalancers', 'LoadBalancer')
+
+    def _DescribeLoadBalancerAttribute(self, region, params):
+        item = self._find('LoadBalancer', region, params.get('LoadBalancerId')).describe(self.clock())
+        item['LoadBalancerStatus'] = item.pop('Status')
+        return item
+
+    def _DeleteLoadBalancer(self, region, params):
+        load_balancer = self._find('LoadBalancer', region, params.get('LoadBalancerId'))
+        del self._resources['LoadBalancer'][load_balancer.id]
+        return {}
+
+    # RDS
+
+    def _CreateDBInstance(self, region, params):
+        db_instance_id = self.add('DBInstance', region, 'Creating',
+                                  Engine=params.get('Engine', 'MySQL'),
+                                  EngineVersion=params.get('EngineVersion', ''),
+                                  DBInstanceClass=params.get('DBInstanceClass', ''),
+                                  DBInstanceDescription=params.get('DBInstanceDescription', ''),
+                                  ZoneId=params.get('ZoneId') or '%s-a' % region,
+                                  PayType=params.get('PayType', 'Postpaid'))
+        self._resources['DBInstance'][db_instance_id].transition(self.clock(), self.transitions,
+                                                                 'Creating', 'Running')
+        return {'DBInstanceId': db_instance_id,
+                'ConnectionString': '%s.mysql.rds.aliyuncs.com' % db_instance_id, 'Port': '3306'}
+
+    def _DescribeDBInstances(self, region, params):
+        items = self._list('DBInstance', region, params, {'Engine': 'Engine'}, 'DBInstanceId')
+        for item in items:
+            item['DBInstanceStatus'] = item.pop('Status')
+        return self._page(items, params, 'Items', 'DBInstance')
+
+    def _DeleteDBInstance(self, region, params):
+        db_instance = self._find('DBInstance', region, params.get('DBInstanceId'))
+        del self._resources['DBInstance'][db_instance.id]
+        return {}
+
+
+def _id_list(value):
+    """
+    Read a list of IDs given as JSON, as a Python list repr or as a
+    comma-separated string.
+    """
+    value = value.strip()
+    if value.startswith('['):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return ast.literal_eval(value)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _server_error(code, message, http_status):
+    from aliyunsdkcore.acs_exception.exceptions import ServerException
+    return ServerException(code, message, http_status, None)
@@ -0,0 +1,64 @@
+"""
+Represents an identity map keeping one live model object per resource.
+"""
+import threading
+import weakref
+
+
+class IdentityMap(object):
+    """
+    Maps ``(model class, resource ID)`` to the one live object representing
+    the resource. When a describe returns a resource that is already mapped,
+    the fresh fields are merged into the existing object and that object is
+    returned instead of the new copy, so every holder sees the update.
+
+    Objects are held by weak references: the map never keeps an object
+    alive, and an entry disappears once nothing else refers to its object.
+    """
+
+    def __init__(self):
+        self._objects = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, cls, resource_id):
+        """
+        Return the live object of type ``cls`` with ID ``resource_id``, or None.
+        """
+        return self._objects.get((cls, resource_id))
+
+    def merge(self, obj):
+        """
+        Register ``obj``, or merge it into the object already registered for
+        the same resource, and return the registered object. Objects without
+        an ID are returned unchanged.
+        """
+        try:
+            resource_id = obj.id
+        except AttributeError:
+            return obj
+        if not resource_id:
+            return obj
+        key = (type(obj), resource_id)
+        with self._lock:
+            existing = self._objects.get(key)
+            if existing is None or existing is obj:
+                self._objects[key] = obj
+                return obj
+            existing._update(obj)
+            return existing
+
+    def discard(self, obj):
+        """
+        Forget ``obj``, e.g. once its resource was deleted.
+        """
+        with self._lock:
+            key = (type(obj), obj.id)
+            if self._objects.get(key) is obj:
+                del self._objects[key]
+
+    def clear(self):
+        with self._lock:
+            self._objects.clear()
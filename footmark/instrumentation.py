@@ -0,0 +1,212 @@
+"""
+Hooks around the API requests of a connection, and per-action statistics.
+"""
+import bisect
+import threading
+import time
+
+# Upper bounds, in seconds, of the buckets of the latency histograms.
+DefaultLatencyBuckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class RequestCall(object):
+    """
+    One API request, passed to the before- and after-request hooks. The
+    ``body``, ``error``, ``error_code`` and ``elapsed`` attributes are set
+    when the request completes; ``retries`` counts the attempts retried
+    because the server was unreachable.
+    """
+
+    __slots__ = ('product', 'action', 'region', 'params', 'start', 'elapsed', 'retries',
+                 'body', 'error', 'error_code')
+
+    def __init__(self, product, action, region, params):
+        self.product = product
+        self.action = action
+        self.region = region
+        self.params = params
+        self.start = time.time()
+        self.elapsed = None
+        self.retries = 0
+        self.body = None
+        self.error = None
+        self.error_code = None
+
+    @property
+    def key(self):
+        return self.product, self.action, self.region
+
+    def __repr__(self):
+        return 'RequestCall:%s' % self.action
+
+
+class LatencyHistogram(object):
+    """
+    Counts latencies into fixed buckets, so that its size does not grow with
+    the number of requests.
+    """
+
+    def __init__(self, bounds=DefaultLatencyBuckets):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        """
+        The upper bound of the bucket holding the given fraction of the
+        latencies, or the largest latency for the last bucket.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'buckets': list(zip(self.bounds + (float('inf'),), self.counts)),
+        }
+
+
+class ActionStats(object):
+    """
+    The counters of one (product, action, region).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.error_codes = {}
+        self.latency = LatencyHistogram()
+
+    def add(self, call):
+        self.calls += 1
+        self.retries += call.retries
+        if call.error is not None:
+            self.errors += 1
+            self.error_codes[call.error_code] = self.error_codes.get(call.error_code, 0) + 1
+        self.latency.add(call.elapsed)
+
+    def snapshot(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'error_codes': dict(self.error_codes),
+            'latency': self.latency.snapshot(),
+        }
+
+
+class Instrumentation(object):
+    """
+    Runs hooks before and after each API request of the connections using
+    it, and keeps :class:`ActionStats` per (product, action, region). A
+    request costs one attribute test when there are no hooks and
+    ``collect_stats`` is off.
+
+    :type collect_stats: bool
+    :param collect_stats: Whether to keep per-action statistics.
+    """
+
+    def __init__(self, collect_stats=True):
+        self.collect_stats = collect_stats
+        self.before_request = []
+        self.after_request = []
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.collect_stats or self.before_request or self.after_request)
+
+    def add_hook(self, before=None, after=None):
+        """
+        Register functions called with the :class:`RequestCall` before each
+        request is sent, and after it completes or fails.
+        """
+        if before is not None:
+            self.before_request.append(before)
+        if after is not None:
+            self.after_request.append(after)
+
+    def remove_hook(self, hook):
+        for hooks in (self.before_request, self.after_request):
+            if hook in hooks:
+                hooks.remove(hook)
+
+    def start(self, product, action, region, params):
+        """
+        Return the :class:`RequestCall` of a request about to be sent, or
+        None when nothing is instrumented.
+        """
+        if not self.enabled:
+            return None
+        call = RequestCall(product, action, region, params)
+        for hook in self.before_request:
+            hook(call)
+        return call
+
+    def finish(self, call, body=None, error=None):
+        call.elapsed = time.time() - call.start
+        call.body = body
+        if error is not None:
+            call.error = error
+            call.error_code = error_code(error)
+        if self.collect_stats:
+            with self._lock:
+                stats = self._stats.get(call.key)
+                if stats is None:
+                    stats = self._stats[call.key] = ActionStats()
+                stats.add(call)
+        for hook in self.after_request:
+            hook(call)
+
+    def stats(self):
+        """
+        Return the statistics as a dict mapping each (product, action,
+        region) to its calls, errors, retries, counts per error code and
+        latency histogram.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return dict((key, stats.snapshot()) for key, stats in self._stats.items())
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def error_code(error):
+    """
+    The error code of an SDK exception, or the name of the exception type.
+    """
+    get_error_code = getattr(error, 'get_error_code', None)
+    if get_error_code is not None:
+        return get_error_code()
+    return getattr(error, 'error_code', None) or type(error).__name__
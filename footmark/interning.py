@@ -0,0 +1,80 @@
+"""
+Represents a table of canonical strings shared by all parsed responses.
+"""
+import sys
+import threading
+
+# Response fields whose values repeat across many objects, e.g. every
+# instance of a region carries the same region_id, zone_id and vpc_id.
+DefaultInternFields = frozenset([
+    'region_id', 'zone_id', 'instance_type', 'instance_type_family', 'instance_charge_type',
+    'internet_charge_type', 'status', 'vpc_id', 'vswitch_id', 'image_id', 'security_group_id',
+    'os_type', 'os_name', 'network_type', 'io_optimized', 'category', 'type', 'tag_key', 'tag_value',
+])
+
+# Upper bound of the table, so that a field wrongly configured as
+# low-cardinality cannot grow it without limit.
+DefaultMaxEntries = 65536
+
+
+class Interner(object):
+    """
+    Maps each string to one canonical copy, so that equal values parsed from
+    different responses share a single allocation. Works for both ``str``
+    and ``unicode``, which the builtin ``intern`` does not.
+
+    :type max_entries: int
+    :param max_entries: Strings seen once the table is full are returned as is.
+    """
+
+    def __init__(self, max_entries=DefaultMaxEntries):
+        self.max_entries = max_entries
+        self._table = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    def intern(self, value):
+        """
+        Return the canonical copy of the string ``value``.
+        """
+        canonical = self._table.get(value)
+        if canonical is not None:
+            if canonical is not value:
+                self.hits += 1
+                self.saved_bytes += sys.getsizeof(value)
+            return canonical
+        with self._lock:
+            canonical = self._table.get(value)
+            if canonical is None:
+                self.misses += 1
+                if len(self._table) >= self.max_entries:
+                    return value
+                self._table[value] = canonical = value
+        return canonical
+
+    def stats(self):
+        """
+        Return the number of entries, hits and misses of the table and an
+        estimate of the bytes saved by returning canonical copies.
+        """
+        return {
+            'entries': len(self._table),
+            'hits': self.hits,
+            'misses': self.misses,
+            'saved_bytes': self.saved_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._table.clear()
+            self.hits = self.misses = self.saved_bytes = 0
+
+
+# Shared by all connections, so that objects from different connections of
+# one inventory share their strings too.
+default_interner = Interner()
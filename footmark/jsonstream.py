@@ -0,0 +1,165 @@
+"""
+Incremental JSON parsing of the item arrays of large responses.
+"""
+import codecs
+import json
+
+import six
+
+# Matches any key of an object on the path.
+Wildcard = '*'
+
+DefaultChunkSize = 64 * 1024
+
+if six.PY2:
+    def _native(value):
+        # Like the yaml parser of full responses, return ASCII text as str
+        # and only other text as unicode, whatever mode a listing is read in.
+        if isinstance(value, six.text_type):
+            try:
+                return value.encode('ascii')
+            except UnicodeEncodeError:
+                return value
+        if isinstance(value, list):
+            return [_native(item) for item in value]
+        return value
+
+    _decoder = json.JSONDecoder(object_pairs_hook=lambda pairs: dict((_native(k), _native(v)) for k, v in pairs))
+else:
+    def _native(value):
+        return value
+
+    _decoder = json.JSONDecoder()
+
+_whitespace = ' \t\n\r'
+
+
+class _Reader(object):
+    """
+    A window over a JSON text read from a string, a file-like object or an
+    iterable of chunks. With chunked sources the consumed text is dropped
+    whenever a chunk is read, so at most one chunk and the value being
+    decoded are held in memory.
+    """
+
+    def __init__(self, source, chunk_size):
+        # Python 3 bytes are decoded incrementally, as a chunk may end inside
+        # a multi-byte character. Python 2 decodes str values while parsing.
+        self._decode = codecs.getincrementaldecoder('utf-8')().decode
+        if isinstance(source, (six.string_types, bytes)):
+            self._chunks = iter([source])
+        elif hasattr(source, 'read'):
+            self._chunks = iter(lambda: source.read(chunk_size), type(source.read(0)))
+        else:
+            self._chunks = iter(source)
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        Read the next chunk; return False at the end of the text.
+        """
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.eof = True
+            return False
+        if isinstance(chunk, bytes) and not isinstance(chunk, str):
+            chunk = self._decode(chunk)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character, or '' at the end.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _whitespace:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars):
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError('Expected %s at offset %d of the JSON text, got %r' % (' or '.join(chars), self.pos, ch))
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """
+        Decode and return the next complete value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if self.fill():
+                    continue
+                raise
+            # A number or literal ending with the buffer may continue in the next chunk.
+            if end < len(self.buffer) or self.eof or self.buffer[self.pos] in '{["':
+                self.pos = end
+                return _native(value)
+            if not self.fill():
+                self.pos = end
+                return _native(value)
+
+
+def iter_items(source, path, chunk_size=DefaultChunkSize):
+    """
+    Yield, one by one, the elements of the arrays found at ``path`` in a JSON
+    text, e.g. ``['Instances', '*']`` for the instances of a DescribeInstances
+    response. ``*`` matches any key. An object found at the end of the path
+    is yielded as a single element. Only one element is decoded at a time;
+    values off the path are decoded and dropped. On Python 2 ASCII text is
+    returned as str, as by yaml, and other text as unicode.
+
+    :type source: str, file-like object or iterable of str
+    :param source: The JSON text, or its chunks.
+    """
+    reader = _Reader(source, chunk_size)
+    for item in _walk_object(reader, list(path)):
+        yield item
+
+
+def _walk_object(reader, path):
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == path[0] or path[0] == Wildcard:
+            ch = reader.peek()
+            if len(path) > 1 and ch == '{':
+                for item in _walk_object(reader, path[1:]):
+                    yield item
+            elif len(path) == 1 and ch == '[':
+                for item in _walk_array(reader):
+                    yield item
+            else:
+                value = reader.value()
+                if len(path) == 1 and isinstance(value, dict):
+                    yield value
+        else:
+            reader.value()
+        if reader.expect(',}') == '}':
+            return
+
+
+def _walk_array(reader):
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(',]') == ']':
+            return
@@ -0,0 +1,221 @@
+"""
+Debug logging of request parameters and response bodies, and the queue
+handler footmark logs through.
+"""
+import atexit
+import logging
+import random
+import re
+
+import six
+from six.moves import queue
+
+# Characters of a body kept in a log record; the rest is dropped.
+DefaultMaxBodySize = 4096
+
+# Names of the request parameters and response keys whose values are
+# replaced by RedactedValue, matched case-insensitively anywhere in the name.
+DefaultRedactedKeys = ('password', 'secret', 'token', 'privatekey', 'accesskey', 'signature')
+
+RedactedValue = '******'
+
+
+class LazyBody(object):
+    """
+    A response body formatted only when a log record using it is emitted:
+    truncated to ``max_size`` characters, with the values of secret keys
+    redacted.
+    """
+
+    __slots__ = ('body', 'max_size', 'pattern')
+
+    def __init__(self, body, max_size, pattern):
+        self.body = body
+        self.max_size = max_size
+        self.pattern = pattern
+
+    def __str__(self):
+        body = self.body
+        if isinstance(body, bytes) and not isinstance(body, str):
+            body = body.decode('utf-8', 'replace')
+        text = body[:self.max_size]
+        text = self.pattern.sub(lambda m: m.group(1) + RedactedValue + m.group(3), text)
+        if len(body) > self.max_size:
+            text += '... (%d more characters)' % (len(body) - self.max_size)
+        return text
+
+
+class LazyParams(object):
+    """
+    Request parameters formatted only when a log record using them is
+    emitted, with the values of secret parameters redacted.
+    """
+
+    __slots__ = ('params', 'is_secret')
+
+    def __init__(self, params, is_secret):
+        self.params = params
+        self.is_secret = is_secret
+
+    def __str__(self):
+        return '{%s}' % ', '.join('%s: %r' % (name, RedactedValue if self.is_secret(name) else value)
+                                  for name, value in sorted(six.iteritems(self.params or {})))
+
+
+class BodyLogger(object):
+    """
+    Logs request parameters and response bodies at DEBUG level. Nothing is
+    formatted unless the logger is ``active``, DEBUG is enabled for
+    ``logger`` and the call is sampled; a body is then cut to ``max_size`` characters before the values
+    of secret keys are redacted, so the cost of a record does not grow with
+    the size of the body.
+
+    :type max_size: int
+    :param max_size: Characters of a body kept in a record.
+
+    :type sample_rate: float
+    :param sample_rate: The fraction of calls logged, between 0 and 1.
+
+    :type redacted_keys: tuple
+    :param redacted_keys: Substrings of the parameter and key names whose
+        values are redacted.
+
+    :type active: bool
+    :param active: Whether anything is logged at all. Off by default, as
+        the ``footmark`` logger is at DEBUG level by default.
+    """
+
+    def __init__(self, logger=None, max_size=DefaultMaxBodySize, sample_rate=1.0,
+                 redacted_keys=DefaultRedactedKeys, active=False):
+        self.logger = logger
+        self.active = active
+        self.max_size = max_size
+        self.sample_rate = sample_rate
+        self.redacted_keys = tuple(key.lower() for key in redacted_keys)
+        # Matches "Key": "value" in a JSON text, the value possibly cut short
+        # by the truncation.
+        self.pattern = re.compile(r'("[^"]*(?:%s)[^"]*"\s*:\s*")((?:[^"\\]|\\.)*)("|$)'
+                                  % '|'.join(re.escape(key) for key in self.redacted_keys), re.IGNORECASE)
+
+    def _logger(self):
+        if self.logger is None:
+            import footmark
+            return footmark.log
+        return self.logger
+
+    def enabled(self):
+        """
+        Whether the current call is logged.
+        """
+        if not self.active or not self._logger().isEnabledFor(logging.DEBUG):
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def is_secret(self, name):
+        name = name.lower()
+        return any(key in name for key in self.redacted_keys)
+
+    def log_request(self, action, params):
+        if self.enabled():
+            self._logger().debug('%s params= %s', action, LazyParams(params, self.is_secret))
+
+    def log_response(self, action, body):
+        if self.enabled():
+            self._logger().debug('%s body= %s', action, LazyBody(body, self.max_size, self.pattern))
+
+
+default_body_logger = BodyLogger()
+
+
+try:
+    from logging.handlers import QueueHandler, QueueListener
+except ImportError:
+    class QueueHandler(logging.Handler):
+        """
+        Puts records on a queue, for a :class:`QueueListener` to emit them.
+        Backport of the handler of Python 3.2.
+        """
+
+        def __init__(self, queue):
+            logging.Handler.__init__(self)
+            self.queue = queue
+
+        def prepare(self, record):
+            # Format the message now, as its arguments may change or be
+            # unpicklable by the time the listener emits it.
+            self.format(record)
+            record.msg = record.message
+            record.args = None
+            record.exc_info = None
+            return record
+
+        def emit(self, record):
+            try:
+                self.queue.put_nowait(self.prepare(record))
+            except Exception:
+                self.handleError(record)
+
+    class QueueListener(object):
+        """
+        Emits the records of a queue to ``handlers`` from a background
+        thread. Backport of the listener of Python 3.2.
+        """
+        _sentinel = None
+
+        def __init__(self, queue, *handlers, **kwargs):
+            # Handler levels are always respected, as with
+            # respect_handler_level=True on Python 3.
+            self.queue = queue
+            self.handlers = handlers
+            self._thread = None
+
+        def start(self):
+            import threading
+            self._thread = threading.Thread(target=self._monitor)
+            self._thread.daemon = True
+            self._thread.start()
+
+        def handle(self, record):
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+        def _monitor(self):
+            while True:
+                record = self.queue.get()
+                if record is self._sentinel:
+                    break
+                self.handle(record)
+
+        def stop(self):
+            if self._thread is not None:
+                self.queue.put_nowait(self._sentinel)
+                self._thread.join()
+                self._thread = None
+
+
+def use_queue_handler(logger):
+    """
+    Move the handlers of ``logger`` behind a queue, so that logging does not
+    block the caller on console or file I/O. The records still queued are
+    emitted at exit.
+
+    :rtype: :class:`QueueListener`
+    :return: The started listener, or None if ``logger`` has no handlers.
+    """
+    handlers = list(logger.handlers)
+    if not handlers:
+        return None
+    records = queue.Queue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(records))
+    listener.start()
+    atexit.register(_stop, listener)
+    return listener
+
+
+def _stop(listener):
+    if listener._thread is not None:
+        listener.stop()
@@ -0,0 +1,206 @@
+"""
+Compact, slot-based base class for the resource models.
+
+A model declares its known response fields and its attribute aliases as
+class-level tables instead of hand-written ``__getattr__``/``__setattr__``
+chains::
+
+    class Disk(TaggedECSObject):
+        _fields = ('disk_id', 'disk_name', 'status', ...)
+        _aliases = {'id': 'disk_id', 'name': 'disk_name', 'state': 'status'}
+        _prefix_aliases = (('volume', 'disk'),)
+        _converters = {'status': lower}
+
+:class:`ModelMeta` turns the known fields into ``__slots__`` and merges the
+tables along the class hierarchy once, when the class is created. Fields a
+response carries beyond the declared ones are kept in a per-object overflow
+dict, so no response data is lost.
+"""
+import six
+
+from footmark.interning import default_interner
+
+
+def lower(value):
+    return default_interner.intern(value.lower()) if isinstance(value, six.string_types) else value
+
+
+def first_ip(value):
+    """
+    Convert an ``{"ip_address": [...]}`` structure to its first address.
+    """
+    if isinstance(value, dict):
+        addresses = value.get('ip_address')
+        return addresses[0] if addresses else None
+    return value
+
+
+def tag_dict(value):
+    """
+    Convert a ``{"tag": [{"tag_key": ..., "tag_value": ...}]}`` structure to
+    a dict of tag keys and values.
+    """
+    if isinstance(value, dict) and isinstance(value.get('tag'), list):
+        tags = {}
+        for tag in value['tag']:
+            key = tag.get('tag_key', tag.get('TagKey'))
+            if key:
+                tags[key] = tag.get('tag_value', tag.get('TagValue'))
+        return tags
+    return value
+
+
+class ModelMeta(type):
+    """
+    Builds ``__slots__`` from ``_fields`` and merges ``_fields``, ``_aliases``,
+    ``_prefix_aliases``, ``_converters`` and ``_computed`` with those of the
+    base classes.
+    """
+
+    def __new__(mcs, name, bases, attrs):
+        inherited = set()
+        for base in bases:
+            inherited.update(getattr(base, '_all_fields', ()))
+        fields = [f for f in attrs.get('_fields', ()) if f not in inherited]
+        if '__slots__' not in attrs:
+            attrs['__slots__'] = tuple(fields)
+
+        for table in ('_aliases', '_converters', '_computed'):
+            merged = {}
+            for base in reversed(bases):
+                merged.update(getattr(base, table, {}))
+            merged.update(attrs.get(table, {}))
+            attrs[table] = merged
+        prefixes = list(attrs.get('_prefix_aliases', ()))
+        for base in bases:
+            prefixes.extend(getattr(base, '_prefix_aliases', ()))
+        attrs['_prefix_aliases'] = tuple(prefixes)
+        attrs['_all_fields'] = frozenset(inherited.union(fields))
+        attrs['_alias_cache'] = {}
+
+        cls = super(ModelMeta, mcs).__new__(mcs, name, bases, attrs)
+        cls._descriptors = frozenset(n for klass in cls.__mro__ for n, v in vars(klass).items()
+                                     if hasattr(v, '__set__') and not n.startswith('__') and n not in cls._all_fields)
+        return cls
+
+
+class Model(six.with_metaclass(ModelMeta, object)):
+    """
+    Base class of all resource models.
+    """
+    __slots__ = ('_extra', '__weakref__')
+
+    # Return None instead of raising AttributeError for unknown attributes.
+    _lenient = False
+
+    @classmethod
+    def _resolve(cls, name):
+        """
+        Return the attribute an alias stands for, or ``name`` itself.
+        """
+        try:
+            return cls._alias_cache[name]
+        except KeyError:
+            pass
+        target = name
+        seen = set()
+        while target not in seen:
+            seen.add(target)
+            if target in cls._aliases:
+                target = cls._aliases[target]
+                continue
+            for prefix, replacement in cls._prefix_aliases:
+                if target.startswith(prefix) and not target.startswith(replacement):
+                    target = replacement + target[len(prefix):]
+                    break
+            else:
+                break
+        cls._alias_cache[name] = target
+        return target
+
+    def __getattr__(self, name):
+        if name == '_extra' or name.startswith('__'):
+            raise AttributeError(name)
+        cls = type(self)
+        target = cls._resolve(name)
+        if target != name:
+            return getattr(self, target)
+        try:
+            return object.__getattribute__(self, '_extra')[name]
+        except (AttributeError, KeyError):
+            pass
+        computed = cls._computed.get(name)
+        if computed is not None:
+            try:
+                return computed(self)
+            except (AttributeError, KeyError, IndexError, TypeError):
+                pass
+        if cls._lenient:
+            return None
+        raise AttributeError("Object {0} does not have attribute {1}".format(cls.__name__, name))
+
+    def __setattr__(self, name, value):
+        cls = type(self)
+        name = cls._resolve(name)
+        converter = cls._converters.get(name)
+        if converter is not None:
+            value = converter(value)
+        if name in cls._all_fields or name in cls._descriptors:
+            object.__setattr__(self, name, value)
+        else:
+            try:
+                extra = object.__getattribute__(self, '_extra')
+            except AttributeError:
+                extra = {}
+                object.__setattr__(self, '_extra', extra)
+            extra[name] = value
+
+    def _items(self):
+        """
+        Yield the ``(name, value)`` pairs of every attribute that is set.
+        """
+        for name in type(self)._all_fields:
+            try:
+                yield name, object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        try:
+            extra = object.__getattribute__(self, '_extra')
+        except AttributeError:
+            return
+        for item in extra.items():
+            yield item
+
+    def _update(self, updated, fields=None):
+        """
+        Copy the attributes of ``updated``, or only ``fields``, onto this object.
+        """
+        cls = type(self)
+        if fields is not None:
+            fields = set(cls._resolve(name) for name in fields)
+        all_fields = cls._all_fields
+        for name, value in updated._items():
+            if fields is not None and name not in fields:
+                continue
+            if name in all_fields:
+                object.__setattr__(self, name, value)
+            else:
+                try:
+                    extra = object.__getattribute__(self, '_extra')
+                except AttributeError:
+                    extra = {}
+                    object.__setattr__(self, '_extra', extra)
+                extra[name] = value
+
+    def to_dict(self):
+        """
+        Return the response fields of this object as a dict.
+        """
+        return dict((name, value) for name, value in self._items() if name != 'connection')
+
+    def __getstate__(self):
+        return dict(self._items())
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
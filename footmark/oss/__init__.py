@@ -2,6 +2,7 @@
 This module provides an interface to the Object Storage Service (OSS) service from Alicloud.
 """
 from footmark.oss.connection import OSSConnection
+from footmark import regioninfo
 from footmark.regioninfo import get_regions
 from footmark.oss.bucket import Bucket
 
@@ -40,6 +41,8 @@ def get_region(region_id, **kw_params):
     """
     Find and return a :class:`footmark.oss.regioninfo.RegionInfo` object
     given a region name.
+    Any additional keyword arguments, e.g. ``region_cls``, are passed on to
+    :func:`footmark.regioninfo.get_region`.
 
     :type: str
     :param: The name of the region.
@@ -48,10 +51,8 @@ def get_region(region_id, **kw_params):
     :return: The RegionInfo object for the given region or None if
              an invalid region name is provided.
     """
-    for region in regions(**kw_params):
-        if region.id == region_id:
-            return region
-    return None
+    kw_params.setdefault('connection_cls', OSSConnection)
+    return regioninfo.get_region('oss', region_id, **kw_params)
 
 
 def connect_to_oss(region_id, **kw_params):
@@ -4,8 +4,6 @@ Represents a connection to the OSS service.
 """
 
 from footmark.oss.connection import OSSConnection
-import oss2
-import yaml
 
 GMT_FORMAT = '%a, %d %b %Y %H:%M:%S GMT'
 
@@ -22,6 +20,7 @@ class Bucket(OSSConnection):
         """
         super(Bucket, self).__init__(acs_access_key_id, acs_secret_access_key, region, bucket_name)
         self.bucket_name = bucket_name
+        import oss2
         self.bucket = oss2.Bucket(self.auth, self.endpoint, self.bucket_name)
         # self.grant = self.bucket.get_bucket_acl()
 
@@ -99,6 +98,7 @@ class Bucket(OSSConnection):
         :return: `PutObjectResult <oss2.models.PutObjectResult>`
         """
         if headers and not isinstance(headers, dict):
+            import yaml
             headers = yaml.load(headers)
 
         if not overwrite:
@@ -131,6 +131,7 @@ class Bucket(OSSConnection):
         :return: `PutObjectResult <oss2.models.PutObjectResult>`
         """
         if headers and not isinstance(headers, dict):
+            import yaml
             headers = yaml.load(headers)
 
         if not overwrite:
@@ -176,6 +177,7 @@ class Bucket(OSSConnection):
         :return: `RequestResult <oss2.models.RequestResults>`
         """
         if headers and not isinstance(headers, dict):
+            import yaml
             headers = yaml.load(headers)
         return self.bucket.update_object_meta(key, headers)
 
@@ -195,6 +197,7 @@ class Bucket(OSSConnection):
         :return: Download Object content
         """
         if headers and not isinstance(headers, dict):
+            import yaml
             headers = yaml.load(headers)
         return self.bucket.get_object(key, byte_range=byte_range, headers=headers,
                                       progress_callback=progress_callback)
@@ -217,6 +220,7 @@ class Bucket(OSSConnection):
         :return: Download Object file
         """
         if headers and not isinstance(headers, dict):
+            import yaml
             headers = yaml.load(headers)
 
         if byte_range:
@@ -233,15 +237,10 @@ class Bucket(OSSConnection):
         :rtype class: <oss2.models.SimplifiedObjectInfo>
         :return one specified object info
         """
-        max_keys = 500
-
-        while True:
-            objects = self.list_objects(prefix=key, max_keys=max_keys)
-            for obj in objects:
-                if key == obj.key:
-                    return obj
-            if len(objects) < max_keys:
-                return None
+        for obj in self.iter_objects(prefix=key, max_keys=500):
+            if key == obj.key:
+                return obj
+        return None
 
     def list_objects(self, prefix='', marker="", max_keys=100):
         """
@@ -259,6 +258,23 @@ class Bucket(OSSConnection):
 
         return self.bucket.list_objects(prefix=prefix, marker=marker, max_keys=max_keys).object_list
 
+    def iter_objects(self, prefix='', marker='', max_keys=100):
+        """
+        Iterate over Bucket Objects Info, listing the next ``max_keys`` objects
+        only when the previous ones are consumed
+        :type prefix: str
+        :param prefix: retrieving all objects that have one specified prefix
+        :type marker: str
+        :param marker: the key to start after
+        :type max_keys: int
+        :param max_keys: Number of objects to list per request
+        :rtype iterator class: <oss2.models.SimplifiedObjectInfo>
+        :return iterator over all retrieved objects
+        """
+
+        import oss2
+        return oss2.ObjectIterator(self.bucket, prefix=prefix, marker=marker, max_keys=max_keys)
+
     def delete_object(self, key):
         """
         Delete Object in Bucket
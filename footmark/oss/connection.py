@@ -5,7 +5,6 @@ Represents a connection to the OSS service.
 
 
 from footmark.connection import ACSQueryConnection
-import oss2
 from footmark.exception import OSSResponseError
 
 
@@ -27,6 +26,8 @@ class OSSConnection(ACSQueryConnection):
 
         self.endpoint = "http://oss-" + self.region + ".aliyuncs.com"
 
+        import oss2
+
         self.auth = oss2.Auth(acs_access_key_id, acs_secret_access_key)
 
         # self.user_agent = user_agent
@@ -60,6 +61,7 @@ class OSSConnection(ACSQueryConnection):
         :return: Returns list of Buckets
         """
 
+        import oss2
         keys = []
 
         if max_keys is None:
@@ -73,6 +75,23 @@ class OSSConnection(ACSQueryConnection):
 
         return keys
 
+    def iter_buckets(self, prefix='', marker='', max_keys=100):
+        """
+        Iterate over the names of all Buckets, listing the next ``max_keys``
+        buckets only when the previous ones are consumed
+        :type prefix: str
+        :param prefix: prefix to search bucket
+        :type marker: str
+        :param marker: the bucket name to start after
+        :type max_keys: int
+        :param max_keys: Number of buckets to list per request
+        :return: Returns an iterator over bucket names
+        """
+
+        import oss2
+        for bucket in oss2.BucketIterator(self.service, prefix=prefix, marker=marker, max_keys=max_keys):
+            yield bucket.name
+
     def error_handler(self, exception):
         """
 
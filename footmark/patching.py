@@ -0,0 +1,48 @@
+"""
+Patches of classes and modules shared by the tracer and the profiler.
+"""
+import threading
+
+from footmark.exception import FootmarkClientError
+
+_missing = object()
+
+# One layer per owner that has patches applied, the last applied on top:
+# [owner, [(target, name, previous value), ...]]
+_layers = []
+_lock = threading.Lock()
+
+
+def patch(owner, target, name, value):
+    """
+    Set attribute ``name`` of ``target`` to ``value`` on behalf of ``owner``,
+    e.g. a tracer or a profiler. The patches of an owner form a layer over
+    those of the owners that patched before it, so an owner can only patch
+    while no other owner patched since its first patch.
+    """
+    with _lock:
+        if not _layers or _layers[-1][0] is not owner:
+            if any(layer[0] is owner for layer in _layers):
+                raise FootmarkClientError('%r cannot patch over the patches of %r.' % (owner, _layers[-1][0]))
+            _layers.append([owner, []])
+        _layers[-1][1].append((target, name, vars(target).get(name, _missing)))
+        setattr(target, name, value)
+
+
+def unpatch(owner):
+    """
+    Restore the attributes patched by ``owner``, in the reverse order they
+    were patched. The layers are removed last in, first out: an owner whose
+    patches were wrapped by another owner's cannot be removed before it.
+    """
+    with _lock:
+        if not any(layer[0] is owner for layer in _layers):
+            return
+        if _layers[-1][0] is not owner:
+            raise FootmarkClientError('%r must be stopped before %r.' % (_layers[-1][0], owner))
+        for target, name, previous in reversed(_layers.pop()[1]):
+            if previous is _missing:
+                delattr(target, name)
+            else:
+                setattr(target, name, previous)
+
@@ -0,0 +1,285 @@
+"""
+Profiles the API calls, parsing and waits made by connection methods.
+"""
+import inspect
+import sys
+import threading
+import time
+
+from footmark import patching
+from footmark.exception import FootmarkClientError
+
+# Connection methods timed as parsing rather than as methods.
+ParseMethods = frozenset(['parse_response', 'parse_rows', 'parse_value', 'build_element', 'convert_name',
+                          'project_value', 'projection'])
+
+# Connection methods too small to be worth a node.
+IgnoredMethods = frozenset(['build_list_params', 'region_id', 'send_request'])
+
+# Kinds of nodes in a profile.
+METHOD = 'method'
+REQUEST = 'request'
+NETWORK = 'network'
+PARSE = 'parse'
+SLEEP = 'sleep'
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def bind(func):
+    """
+    Return ``func`` wrapped to run under the node being recorded when
+    ``bind`` was called, so that the calls it makes on another thread are
+    recorded as children of that node. ``func`` is returned as is when no
+    profiler is active.
+    """
+    profiler = _active
+    if profiler is None:
+        return func
+    node = profiler._stack()[-1]
+
+    def bound(*args, **kwargs):
+        previous = getattr(profiler._local, 'stack', None)
+        profiler._local.stack = [node]
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler._local.stack = previous
+    return bound
+
+
+class Node(object):
+    """
+    A call path of a profile: the calls made with the same names from the
+    root, aggregated. ``total`` is the wall time in seconds, children
+    included.
+    """
+
+    __slots__ = ('name', 'kind', 'calls', 'total', 'children')
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.calls = 0
+        self.total = 0.0
+        self.children = {}
+
+    def child(self, name, kind):
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = Node(name, kind)
+        return node
+
+    @property
+    def self_time(self):
+        return max(self.total - sum(child.total for child in self.children.values()), 0.0)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'calls': self.calls,
+            'total': self.total,
+            'children': [child.to_dict() for child in self.children.values()],
+        }
+
+
+class Profiler(object):
+    """
+    While active, records the public methods of the connection classes, the
+    API requests each made, and the time spent sending them over the
+    network, parsing responses and in the ``time.sleep`` calls of footmark's
+    modules, as a tree of :class:`Node`. The ``time`` module itself is not
+    patched, so sleeps of other libraries and threads are not recorded. A request retried because the server was unreachable
+    has one network child per attempt. Calls made on other threads are
+    recorded under the node of the caller when the function run there is
+    wrapped with :func:`bind`, as in
+    :func:`footmark.utils.run_concurrently`, and under the root otherwise.
+
+    Only one profiler can be active at a time, as it patches classes. The
+    patches are layered with those of a :class:`footmark.tracing.Tracer`,
+    see :mod:`footmark.patching`: a tracer installed while the profiler is
+    active must be uninstalled before it is stopped, and conversely.
+    """
+
+    def __init__(self):
+        self.root = Node('all', METHOD)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        global _active
+        with _active_lock:
+            if _active is not None:
+                raise FootmarkClientError('A profiler is already active.')
+            _active = self
+        try:
+            self._patch_all()
+        except Exception:
+            self.stop()
+            raise
+
+    def _patch_all(self):
+        from aliyunsdkcore import client
+
+        for cls, name, function in connection_methods():
+            if name == 'make_request':
+                self._patch(cls, name, self._wrap(function, REQUEST, _request_label))
+            elif name in ParseMethods:
+                self._patch(cls, name, self._wrap(function, PARSE, lambda args, kwargs: 'parse'))
+            else:
+                label = '%s.%s' % (cls.__name__, name)
+                self._patch(cls, name, self._wrap(function, METHOD, lambda args, kwargs, label=label: label))
+        network = client.AcsClient.__dict__['do_action_with_exception']
+        self._patch(client.AcsClient, 'do_action_with_exception', self._wrap(network, NETWORK, lambda args, kwargs: 'network'))
+        # The time module of footmark's modules is replaced by a stand-in
+        # with a timed sleep, which calls time.sleep when called.
+        sleep = self._wrap(lambda seconds: time.sleep(seconds), SLEEP, lambda args, kwargs: 'sleep')
+        for module in footmark_modules():
+            self._patch(module, 'time', _Time(sleep))
+
+    def stop(self):
+        global _active
+        patching.unpatch(self)
+        with _active_lock:
+            if _active is self:
+                _active = None
+
+    def _patch(self, owner, name, wrapper):
+        patching.patch(self, owner, name, wrapper)
+
+    def _wrap(self, function, kind, label):
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            stack = profiler._stack()
+            # Everything called while parsing counts as parsing.
+            if stack[-1].kind == PARSE:
+                return function(*args, **kwargs)
+            with profiler._lock:
+                node = stack[-1].child(label(args, kwargs), kind)
+                node.calls += 1
+            stack.append(node)
+            start = time.time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.time() - start
+                stack.pop()
+                with profiler._lock:
+                    node.total += elapsed
+        wrapper.__name__ = getattr(function, '__name__', kind)
+        wrapper.__doc__ = getattr(function, '__doc__', None)
+        return wrapper
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = [self.root]
+        return stack
+
+    def totals(self):
+        """
+        Return the wall time spent in each kind of node, without their
+        children: ``method``, ``request``, ``network``, ``parse`` and
+        ``sleep``.
+
+        :rtype: dict
+        """
+        totals = dict((kind, 0.0) for kind in (METHOD, REQUEST, NETWORK, PARSE, SLEEP))
+        for path, node in self.walk():
+            if node is not self.root:
+                totals[node.kind] += node.self_time
+        return totals
+
+    def walk(self):
+        """
+        Yield the path of names and the node of each node, depth first.
+        """
+        pending = [((self.root.name,), self.root)]
+        while pending:
+            path, node = pending.pop()
+            yield path, node
+            for name in sorted(node.children, reverse=True):
+                pending.append((path + (name,), node.children[name]))
+
+    def folded(self):
+        """
+        Return the profile in the folded stacks format read by flame graph
+        tools: one line per call path with its self time in microseconds.
+
+        :rtype: str
+        """
+        lines = []
+        for path, node in self.walk():
+            micros = int(round(node.self_time * 1e6))
+            if micros:
+                lines.append('%s %d' % (';'.join(path), micros))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            f.write(self.folded())
+
+    def to_dict(self):
+        return self.root.to_dict()
+
+
+def connection_methods():
+    """
+    Yield the class, name and function of the public methods defined by
+    ACSQueryConnection and its loaded subclasses, except generator methods
+    and IgnoredMethods.
+    """
+    from footmark.connection import ACSQueryConnection
+
+    for cls in _subclasses(ACSQueryConnection):
+        for name, function in list(cls.__dict__.items()):
+            if name.startswith('_') or name in IgnoredMethods or not inspect.isfunction(function) \
+                    or inspect.isgeneratorfunction(function):
+                continue
+            yield cls, name, function
+
+
+def footmark_modules():
+    """
+    Yield the loaded footmark modules using the time module, except the
+    profiler and the tracer.
+    """
+    for name, module in sorted(sys.modules.items()):
+        if (name == 'footmark' or name.startswith('footmark.')) and module is not None \
+                and name not in ('footmark.profiler', 'footmark.tracing') and vars(module).get('time') is time:
+            yield module
+
+
+class _Time(object):
+    """
+    Stands for the time module, with ``sleep`` replaced.
+    """
+
+    def __init__(self, sleep):
+        self.sleep = sleep
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def _request_label(args, kwargs):
+    return 'request %s' % (args[1] if len(args) > 1 else kwargs.get('action'))
+
+
+def _subclasses(cls):
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        for c in _subclasses(subclass):
+            if c not in classes:
+                classes.append(c)
+    return classes
@@ -14,6 +14,7 @@ from footmark.rds.regioninfo import RegionInfo
 from footmark.rds.rds import Account
 from footmark.resultset import ResultSet
 from footmark.exception import RDSResponseError
+from footmark.utils import to_native
 
 
 class RDSConnection(ACSQueryConnection):
@@ -23,7 +24,8 @@ class RDSConnection(ACSQueryConnection):
     ResponseError = RDSResponseError
 
     def __init__(self, acs_access_key_id=None, acs_secret_access_key=None,
-                 region=None, sdk_version=None, security_token=None, user_agent=None):
+                 region=None, sdk_version=None, security_token=None, user_agent=None,
+                 identity_map=False, intern_fields=None, interner=None):
         """
         Init method to create a new connection to RDS.
         """
@@ -38,7 +40,9 @@ class RDSConnection(ACSQueryConnection):
 
         super(RDSConnection, self).__init__(acs_access_key_id,
                                             acs_secret_access_key,
-                                            self.region, self.RDSSDK, security_token, user_agent=user_agent)
+                                            self.region, self.RDSSDK, security_token, user_agent=user_agent,
+                                            identity_map=identity_map,
+                                            intern_fields=intern_fields, interner=interner)
 
     def create_rds_instance(self, db_engine, engine_version, db_instance_class, db_instance_storage,
                             instance_net_type, security_ip_list, pay_type, period=None,zone=None,
@@ -283,7 +287,7 @@ class RDSConnection(ACSQueryConnection):
             changed = True
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append({"Error Code": error_code, "Error Message": error_msg})
 
         return changed, results
@@ -307,7 +311,7 @@ class RDSConnection(ACSQueryConnection):
             results = self.get_status('DescribeDBInstances', params)            
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append({"Error Code": error_code, "Error Message": error_msg})
 
         return changed, results
@@ -458,7 +462,7 @@ class RDSConnection(ACSQueryConnection):
 
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append({"Error Code": error_code, "Error Message": error_msg})
 
         return changed, results
@@ -1077,7 +1081,7 @@ class RDSConnection(ACSQueryConnection):
             changed = True
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append({"Error Code": error_code, "Error Message": error_msg})
 
         return changed, results
@@ -1243,20 +1247,22 @@ class RDSConnection(ACSQueryConnection):
         self.build_list_params(params, db_name, 'DBName')
         return self.get_status('RevokeAccountPrivilege', params)
 
-    def list_account(self, db_instance_id, account_name = None):
+    def list_account(self, db_instance_id, account_name = None, fields=None):
         """
         Reset account
         :type db_instance_id: str
         :param db_instance_id: Id of instance
         :type account_name: str
         :param account_name: Name of an account
+        :type fields: list
+        :param fields: Only set these attributes of the accounts
         :return: object list of accounts
         """
         params = {}
         self.build_list_params(params, db_instance_id, 'DBInstanceId')
         if account_name:
             self.build_list_params(params, account_name, 'AccountName')
-        return self.get_list('DescribeAccounts', params, ['Accounts', Account])
+        return self.get_list('DescribeAccounts', params, ['Accounts', Account], fields=fields)
 
     def switch_between_primary_standby_database(self, instance_id, node_id, force):
         """
@@ -1,6 +1,12 @@
 from footmark.rds.rdsobject import TaggedRDSObject
 
 class Account(TaggedRDSObject):
+    _fields = ('account_name', 'account_status', 'account_description', 'account_type', 'database_privileges',
+               'dbinstance_id', 'priv_exceeded', 'request_id')
+    _aliases = {'name': 'account_name', 'status': 'account_status', 'description': 'account_description',
+                'privileges': 'database_privileges'}
+    _lenient = True
+
     def __init__(self, connection=None, owner_id=None,
                  name=None, description=None, id=None):
         super(Account, self).__init__(connection)
@@ -9,27 +15,6 @@ class Account(TaggedRDSObject):
     def __repr__(self):
         return 'Account:%s' % self.name
 
-    def __getattr__(self, name):
-        if name == 'name':
-             return self.account_name
-        if name == 'status':
-             return self.account_status
-        if name == 'description':
-             return self.account_description
-        if name == 'privileges':
-             return self.database_privileges
-
-    def __setattr__(self, name, value):
-        if name == 'name':
-             self.account_name=value
-        if name == 'status':
-             self.account_status=value
-        if name == 'description':
-             self.account_description=value
-        if name == 'privileges':
-             self.database_privileges=value
-        super(TaggedRDSObject, self).__setattr__(name, value)
-    
     def reset(self, dbinstance_id, account_password):
         '''
         reset
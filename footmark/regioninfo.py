@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 
 import footmark
 from footmark.exception import FootmarkClientError
@@ -59,13 +60,7 @@ def load_regions():
     """
     # Load the defaults first.
     endpoints = load_endpoint_json(footmark.ENDPOINTS_PATH)
-    additional_path = None
-
-    # Try the ENV var. If not, check the config file.
-    if os.environ.get('FOOTMARK_ENDPOINTS'):
-        additional_path = os.environ['FOOTMARK_ENDPOINTS']
-    elif footmark.config.get('Footmark', 'endpoints_path'):
-        additional_path = footmark.config.get('Footmark', 'endpoints_path')
+    additional_path = get_additional_path()
 
     # If there's a file provided, we'll load it & additively merge it into
     # the endpoints.
@@ -76,6 +71,121 @@ def load_regions():
     return endpoints
 
 
+def get_additional_path():
+    """
+    Returns the path of the user's endpoints file, if any.
+
+    :rtype: string
+    """
+    # Try the ENV var. If not, check the config file.
+    if os.environ.get('FOOTMARK_ENDPOINTS'):
+        return os.environ['FOOTMARK_ENDPOINTS']
+    config = getattr(footmark, 'config', None)
+    if config is not None:
+        return config.get('Footmark', 'endpoints_path')
+    return None
+
+
+class EndpointSnapshot(object):
+    """
+    The endpoint data loaded from a given set of files, indexed by service
+    and region ID. A snapshot is never modified once built; a registry
+    replaces its snapshot instead, so readers need no lock.
+    """
+
+    def __init__(self, endpoints, stamp=None):
+        self.endpoints = endpoints
+        self.stamp = stamp
+        self.services = frozenset(endpoints)
+        self._regions = dict((service, tuple(sorted(regions))) for service, regions in endpoints.items())
+
+    def regions(self, service_name):
+        """
+        Returns the region IDs of a service, sorted.
+
+        :rtype: tuple
+        """
+        return self._regions.get(service_name, ())
+
+    def endpoint(self, service_name, region_id):
+        """
+        Returns the endpoint of a service in a region, or None.
+
+        :rtype: string
+        """
+        return self.endpoints.get(service_name, {}).get(region_id)
+
+
+class EndpointRegistry(object):
+    """
+    Loads the endpoint data once and serves lookups from an
+    :class:`EndpointSnapshot`. The data is loaded again when the
+    modification time of the default or user endpoints file changes, or
+    when the user file is switched to another one.
+
+    :type path: string
+    :param path: The default endpoints file. ``footmark.ENDPOINTS_PATH``
+        by default.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def paths(self):
+        """
+        Returns the default endpoints file and the user file, if any.
+
+        :rtype: list
+        """
+        paths = [self.path or footmark.ENDPOINTS_PATH]
+        additional_path = get_additional_path()
+        if additional_path:
+            paths.append(additional_path)
+        return paths
+
+    def snapshot(self):
+        """
+        Returns the current endpoint data, loading it first when the files
+        changed since it was last loaded.
+
+        :rtype: :class:`EndpointSnapshot`
+        """
+        paths = self.paths()
+        stamp = tuple((path, _mtime(path)) for path in paths)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.stamp == stamp:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.stamp != stamp:
+                endpoints = {}
+                for path, mtime in stamp:
+                    # A missing default file contributes nothing.
+                    if mtime is not None or path != paths[0]:
+                        endpoints = merge_endpoints(endpoints, load_endpoint_json(path))
+                self._snapshot = EndpointSnapshot(endpoints, stamp)
+            return self._snapshot
+
+    def clear(self):
+        """
+        Drops the loaded data, so that the next lookup loads it again.
+        """
+        with self._lock:
+            self._snapshot = None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+# The registry shared by get_regions() and get_region().
+default_registry = EndpointRegistry()
+
+
 def get_regions(service_name, region_cls=None, connection_cls=None):
     """
     Given a service name (like ``ecs``), returns a list of ``RegionInfo``
@@ -100,9 +210,9 @@ def get_regions(service_name, region_cls=None, connection_cls=None):
     :returns: A list of configured ``RegionInfo`` objects
     :rtype: list
     """
-    endpoints = load_regions()
+    snapshot = default_registry.snapshot()
 
-    if service_name not in endpoints:
+    if service_name not in snapshot.services:
         raise FootmarkClientError(
             "Service '%s' not found in endpoints." % service_name
         )
@@ -112,11 +222,11 @@ def get_regions(service_name, region_cls=None, connection_cls=None):
 
     region_objs = []
 
-    for region_name, endpoint in endpoints.get(service_name, {}).items():
+    for region_name in snapshot.regions(service_name):
         region_objs.append(
             region_cls(
-                name=region_name,
-                endpoint=endpoint,
+                region=region_name,
+                endpoint=snapshot.endpoint(service_name, region_name),
                 connection_cls=connection_cls
             )
         )
@@ -124,15 +234,41 @@ def get_regions(service_name, region_cls=None, connection_cls=None):
     return region_objs
 
 
+def get_region(service_name, region_id, region_cls=None, connection_cls=None):
+    """
+    Given a service name and a region ID, returns the ``RegionInfo`` object
+    for that region, or ``None`` if the service has no such region. Takes
+    the same arguments as :func:`get_regions`.
+
+    :rtype: :class:`RegionInfo`
+    """
+    snapshot = default_registry.snapshot()
+
+    if service_name not in snapshot.services:
+        raise FootmarkClientError(
+            "Service '%s' not found in endpoints." % service_name
+        )
+
+    endpoint = snapshot.endpoint(service_name, region_id)
+    if endpoint is None:
+        return None
+
+    if region_cls is None:
+        region_cls = RegionInfo
+
+    return region_cls(region=region_id, endpoint=endpoint, connection_cls=connection_cls)
+
+
 class RegionInfo(object):
     """
     Represents an Aliyun Region
     """
-    def __init__(self, connection=None, region=None, local_name=None, connection_cls=None):
+    def __init__(self, connection=None, region=None, local_name=None, connection_cls=None, endpoint=None):
         self.connection = connection
         self.connection_cls = connection_cls
         self.region_id = region
         self.local_name = local_name
+        self.endpoint = endpoint
 
     def __repr__(self):
         return 'RegionInfo:%s' % self.id
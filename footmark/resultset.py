@@ -1,22 +1,65 @@
 """
 Exception classes - Subclassing allows you to check for specific errors
 """
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from footmark.model import Model
 
 StandardError = Exception
 
 
-class ResultSet(object):
+class ResultSet(Model):
     """
-    General Footmark Client error (error accessing Aliyun)
+    The fields of one response that is not parsed into a resource model.
+
+    Each call gets its own object, so concurrent calls never see each other's
+    fields. The fields most responses carry are slots; any other field is
+    kept in the overflow dict of the object.
     """
+    _fields = ('request_id', 'total_count', 'page_number', 'page_size', 'instance_id', 'disk_id',
+               'security_group_id', 'vpc_id', 'vswitch_id', 'vrouter_id', 'route_table_id', 'allocation_id',
+               'eip_address', 'order_id')
+    _aliases = {'id': 'request_id'}
+
+    def __init__(self, connection=None):
+        pass
 
     def __repr__(self):
         return 'ResultSet:%s' % self.id
 
-    def __getattr__(self, name):
-        if name == 'id':
-            return self.request_id
-        raise AttributeError
+    def view(self):
+        """
+        Return a read-only dict view of the fields of this result set.
+        """
+        return ResultSetView(self)
+
+
+class ResultSetView(Mapping):
+    """
+    A read-only mapping over the fields of a :class:`ResultSet`. Values are
+    read from the result set on access, nothing is copied up front.
+    """
+
+    def __init__(self, result_set):
+        self._result_set = result_set
+
+    def __getitem__(self, name):
+        result_set = self._result_set
+        try:
+            if name in type(result_set)._all_fields:
+                return object.__getattribute__(result_set, name)
+            return object.__getattribute__(result_set, '_extra')[name]
+        except (AttributeError, KeyError):
+            raise KeyError(name)
 
-    def __setattr__(self, name, value):
-        super(object, self).__setattr__(name, value)
+    def __iter__(self):
+        return (key for key, value in self._result_set._items())
+
+    def __len__(self):
+        return sum(1 for _ in self._result_set._items())
+
+    def __repr__(self):
+        return 'ResultSetView(%r)' % dict(self)
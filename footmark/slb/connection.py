@@ -9,6 +9,7 @@ from footmark.connection import ACSQueryConnection
 from footmark.slb.regioninfo import RegionInfo
 from footmark.exception import SLBResponseError
 from footmark.slb.slb import LoadBalancer, BackendServer, VServerGroup, LoadBalancerListener
+from footmark.utils import to_native
 
 
 class SLBConnection(ACSQueryConnection):
@@ -18,7 +19,8 @@ class SLBConnection(ACSQueryConnection):
     ResponseError = SLBResponseError
 
     def __init__(self, acs_access_key_id=None, acs_secret_access_key=None,
-                 region=None, sdk_version=None, security_token=None, user_agent=None):
+                 region=None, sdk_version=None, security_token=None, user_agent=None,
+                 identity_map=False, intern_fields=None, interner=None):
         """
         Init method to create a new connection to SLB.
         """
@@ -33,7 +35,9 @@ class SLBConnection(ACSQueryConnection):
 
         super(SLBConnection, self).__init__(acs_access_key_id,
                                             acs_secret_access_key,
-                                            self.region, self.SLBSDK, security_token, user_agent=user_agent)
+                                            self.region, self.SLBSDK, security_token, user_agent=user_agent,
+                                            identity_map=identity_map,
+                                            intern_fields=intern_fields, interner=interner)
     
     def describe_vserver_group_attribute(self, vserver_group_id):
         """
@@ -889,12 +893,15 @@ class SLBConnection(ACSQueryConnection):
 
         return self.get_list('SetBackendServers', params, ["BackendServers", BackendServer])
 
-    def describe_backend_servers_health_status(self, load_balancer_id=None, port=None):
+    def describe_backend_servers_health_status(self, load_balancer_id=None, port=None, fields=None):
         """
         :type load_balancer_id: str
         :param load_balancer_id: ID of server load balancer
         :type port: list
         :param port: list of Ports used by the Server Load Balancer instance frontend for health check
+        :type fields: list
+        :param fields: Only keep these fields of the backend servers, see
+            :meth:`footmark.connection.ACSQueryConnection.get_list`
         :return: return backend servers with health status and message with descriptive information
         """
         params = {}
@@ -906,7 +913,7 @@ class SLBConnection(ACSQueryConnection):
         if port:
             self.build_list_params(params, port, 'ListenerPort')
 
-        return self.get_list('DescribeHealthStatus', params, ["BackendServers", BackendServer])
+        return self.get_list('DescribeHealthStatus', params, ["BackendServers", BackendServer], fields=fields)
 
     def set_load_balancer_status(self, load_balancer_id, load_balancer_status):
         """
@@ -995,13 +1002,15 @@ class SLBConnection(ACSQueryConnection):
 
         return self.get_object('DescribeLoadBalancerAttribute', params, LoadBalancer)
     
-    def describe_load_balancers(self, load_balancer_id = None, load_balancer_name = None):
+    def describe_load_balancers(self, load_balancer_id = None, load_balancer_name = None, fields=None):
         """
         Describe Load Balancers
         :type load_balancer_id: string
         :param load_balancer_id: id of the load balancer
         :type Load_balancer_name: string
         :param Load_balancer_name: name of the load balancer
+        :type fields: list
+        :param fields: Only set these attributes of the load balancers
         :return: load balance in dictionary format if found else None
         """
 
@@ -1010,7 +1019,7 @@ class SLBConnection(ACSQueryConnection):
             self.build_list_params(params, load_balancer_id, 'LoadBalancerId')
         if load_balancer_name:
             self.build_list_params(params, load_balancer_name, 'LoadBalancerName')
-        return self.get_list('DescribeLoadBalancers', params,  ['LoadBalancers', LoadBalancer])
+        return self.get_list('DescribeLoadBalancers', params,  ['LoadBalancers', LoadBalancer], fields=fields)
 
     def add_vservergroup_backend_server(self, vserver_group_id, backend_servers):
         """
@@ -1047,7 +1056,7 @@ class SLBConnection(ACSQueryConnection):
             changed = True
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append("Error Code:" + error_code + " ,Error Message:" + error_msg)
 
         return changed, results
@@ -1086,7 +1095,7 @@ class SLBConnection(ACSQueryConnection):
             changed = True 
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append({"Error Code": error_code, "Error Message": error_msg})
 
         return changed, results
@@ -1184,7 +1193,7 @@ class SLBConnection(ACSQueryConnection):
                 del results['VServerGroupName']
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append({"Error Code": error_code, "Error Message": error_msg})
 
         return changed, results
@@ -1228,7 +1237,7 @@ class SLBConnection(ACSQueryConnection):
                 results = result_vsgs
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append("Error Code:" + error_code + " ,Error Message:" + error_msg)
 
         return changed_flag, results
@@ -1273,7 +1282,7 @@ class SLBConnection(ACSQueryConnection):
                 results = result_vsgs
         except Exception as ex:
             error_code = str(ex.error_code)
-            error_msg = str(ex.message)
+            error_msg = to_native(ex.message)
             results.append("Error Code:" + error_code + " ,Error Message:" + error_msg)
 
         return changed_flag, results
@@ -4,6 +4,10 @@ Represents an SLB Security Group
 from footmark.slb.slbobject import TaggedSLBObject
 
 class VServerGroup(TaggedSLBObject):
+    _fields = ('vserver_group_id', 'vserver_group_name', 'backend_servers', 'request_id')
+    _aliases = {'id': 'vserver_group_id', 'name': 'vserver_group_name'}
+    _lenient = True
+
     def __init__(self, connection=None, owner_id=None,
                  name=None, description=None, id=None):
         super(VServerGroup, self).__init__(connection)
@@ -12,19 +16,6 @@ class VServerGroup(TaggedSLBObject):
     def __repr__(self):
         return 'VServerGroup:%s' % self.id
 
-    def __getattr__(self, name):
-        if name == 'id':
-            return self.vserver_group_id
-        if name == 'name':
-             return self.vserver_group_name
-
-    def __setattr__(self, name, value):
-        if name == 'id':
-            self.vserver_group_id = value
-        if name == 'name':
-             self.vserver_group_name = value
-        super(TaggedSLBObject, self).__setattr__(name, value)
-    
     def set_attribute(self, vserver_group_name='', backend_servers = []):
         '''
         set attribute
@@ -62,6 +53,15 @@ class VServerGroup(TaggedSLBObject):
         return self.connection.describe_vserver_group_attribute(self.vserver_group_id)
 
 class LoadBalancerListener(TaggedSLBObject):
+    _fields = ('listener_port', 'backend_server_port', 'listener_protocol', 'status', 'bandwidth', 'scheduler',
+               'sticky_session', 'sticky_session_type', 'cookie_timeout', 'cookie', 'health_check',
+               'health_check_type', 'health_check_domain', 'health_check_uri', 'health_check_connect_port',
+               'healthy_threshold', 'unhealthy_threshold', 'health_check_timeout', 'health_check_interval',
+               'health_check_http_code', 'vserver_group_id', 'server_certificate_id', 'persistence_timeout',
+               'gzip', 'request_id')
+    _aliases = {'port': 'listener_port'}
+    _lenient = True
+
     def __init__(self, connection=None, owner_id=None,
                  name=None, description=None, id=None):
         super(LoadBalancerListener, self).__init__(connection)
@@ -70,15 +70,6 @@ class LoadBalancerListener(TaggedSLBObject):
     def __repr__(self):
         return 'LoadBalancerListener:%s' % self.port
 
-    def __getattr__(self, name):
-        if name == 'port':
-            return self.listener_port
-    
-    def __setattr__(self, name, value):
-        if name == 'port':
-            self.listener_port = value
-        super(TaggedSLBObject, self).__setattr__(name, value)
-    
     def set_access_control_status(self, load_balancer_id, access_control_status):
         '''
         set listener access control status
@@ -183,6 +174,14 @@ class LoadBalancerListener(TaggedSLBObject):
         return self.connection.describe_load_balancer_listener_attribute(load_balancer_id, self.listener_port, listener_type)
         
 class LoadBalancer(TaggedSLBObject):
+    _fields = ('load_balancer_id', 'load_balancer_name', 'load_balancer_status', 'address', 'address_type',
+               'region_id', 'region_id_alias', 'network_type', 'vpc_id', 'vswitch_id', 'create_time',
+               'create_time_stamp', 'pay_type', 'internet_charge_type', 'bandwidth', 'master_zone_id',
+               'slave_zone_id', 'listener_ports', 'listener_ports_and_protocal', 'listener_ports_and_protocol',
+               'backend_servers', 'request_id')
+    _aliases = {'id': 'load_balancer_id', 'name': 'load_balancer_name'}
+    _lenient = True
+
     def __init__(self, connection=None, owner_id=None,
                  name=None, description=None, id=None):
         super(LoadBalancer, self).__init__(connection)
@@ -191,19 +190,6 @@ class LoadBalancer(TaggedSLBObject):
     def __repr__(self):
         return 'LoadBalancer:%s' % self.id
 
-    def __getattr__(self, name):
-        if name == 'id':
-            return self.load_balancer_id
-        if name == 'name':
-            return self.load_balancer_name
-
-    def __setattr__(self, name, value):
-        if name == 'id':
-            self.load_balancer_id = value
-        if name == 'name':
-            self.load_balancer_name = value
-        super(TaggedSLBObject, self).__setattr__(name, value)
-    
     def set_status(self, load_balancer_status):
         '''
         set load balancer status
@@ -229,6 +215,10 @@ class LoadBalancer(TaggedSLBObject):
         return self.connection.delete_load_balancer(self.load_balancer_id)
     
 class BackendServer(TaggedSLBObject):
+    _fields = ('server_id', 'server_health_status', 'weight', 'port', 'listener_port', 'request_id')
+    _aliases = {'id': 'server_id', 'instance_id': 'server_id',
+                'status': 'server_health_status', 'health_status': 'server_health_status'}
+
     def __init__(self, connection=None, owner_id=None,
                  name=None, description=None, id=None):
         super(BackendServer, self).__init__(connection)
@@ -236,17 +226,3 @@ class BackendServer(TaggedSLBObject):
 
     def __repr__(self):
         return 'BackendServer:%s' % self.id
-
-    def __getattr__(self, name):
-        if name in ['id', 'instance_id']:
-            return self.server_id
-        if name in ['status', 'health_status']:
-            return self.server_health_status
-        raise AttributeError('There is no ')
-
-    def __setattr__(self, name, value):
-        if name in ['id', 'instance_id']:
-            self.server_id = value
-        if name in ['status', 'health_status']:
-            self.server_health_status = value
-        super(TaggedSLBObject, self).__setattr__(name, value)
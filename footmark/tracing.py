@@ -0,0 +1,318 @@
+"""
+Tracing spans around connection methods and API requests, sent to a
+pluggable exporter.
+"""
+import binascii
+import json
+import os
+import re
+import threading
+import time
+
+from footmark import patching
+from footmark.exception import FootmarkClientError
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+# The current span. With contextvars, asyncio tasks inherit the span of the
+# code that created them; threads do not, see bind().
+if contextvars is not None:
+    _current = contextvars.ContextVar('footmark_span', default=None)
+
+    def current_span():
+        """
+        Return the active :class:`Span`, or None.
+        """
+        return _current.get()
+
+    def _set_current(span):
+        previous = _current.get()
+        _current.set(span)
+        return previous
+else:
+    _local = threading.local()
+
+    def current_span():
+        """
+        Return the active :class:`Span`, or None.
+        """
+        return getattr(_local, 'span', None)
+
+    def _set_current(span):
+        previous = getattr(_local, 'span', None)
+        _local.span = span
+        return previous
+
+_request_id = re.compile(r'"RequestId"\s*:\s*"([^"]*)"')
+_request_id_bytes = re.compile(br'"RequestId"\s*:\s*"([^"]*)"')
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def bind(func):
+    """
+    Return ``func`` wrapped to run with the span active when ``bind`` was
+    called, so that the spans it creates on another thread are children of
+    that span. ``func`` is returned as is when no span is active.
+    """
+    span = current_span()
+    if span is None:
+        return func
+
+    def bound(*args, **kwargs):
+        previous = _set_current(span)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _set_current(previous)
+    return bound
+
+
+class Span(object):
+    """
+    A timed operation of a trace. ``status`` is ``ok`` or ``error`` once the
+    span has ended.
+    """
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else _random_id(16)
+        self.span_id = _random_id(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes or {}
+        self.start = time.time()
+        self.end = None
+        self.status = None
+        self.error = None
+
+    def __repr__(self):
+        return 'Span:%s' % self.name
+
+    @property
+    def duration(self):
+        return self.end - self.start if self.end is not None else None
+
+    def set_attribute(self, name, value):
+        self.attributes[name] = value
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start,
+            'end': self.end,
+            'duration': self.duration,
+            'status': self.status,
+            'error': self.error,
+            'attributes': self.attributes,
+        }
+
+
+class SpanExporter(object):
+    """
+    Receives each span when it ends. Subclasses implement :meth:`export`.
+    """
+
+    def export(self, span):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """
+    Keeps the ended spans in ``spans``, for tests.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            del self.spans[:]
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    Appends each span to a file as one JSON object per line.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a')
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), default=str, sort_keys=True)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class Tracer(object):
+    """
+    Creates spans and sends them to ``exporter`` when they end. While
+    installed, or used as a context manager, it creates a span for each
+    call of a public connection method, each ``make_request`` with its
+    ``action``, ``region``, ``retries`` and ``outcome``, and each attempt
+    to send a request with its ``request_id`` and ``outcome``.
+
+    Only one tracer can be installed at a time, as it patches classes. Its
+    patches are layered with those of a :class:`footmark.profiler.Profiler`,
+    see :mod:`footmark.patching`: a profiler started while the tracer is
+    installed must be stopped before the tracer is uninstalled, otherwise
+    :class:`footmark.exception.FootmarkClientError` is raised, and
+    conversely.
+    """
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def span(self, name, **attributes):
+        """
+        Return a context manager running the block in a new span, child of
+        the active span.
+        """
+        return _SpanContext(self, name, attributes)
+
+    def install(self):
+        global _active
+        with _active_lock:
+            if _active is not None:
+                raise FootmarkClientError('A tracer is already installed.')
+            _active = self
+        try:
+            self._patch_all()
+        except Exception:
+            self.uninstall()
+            raise
+
+    def uninstall(self):
+        global _active
+        patching.unpatch(self)
+        with _active_lock:
+            if _active is self:
+                _active = None
+
+    def _patch_all(self):
+        from aliyunsdkcore import client
+        from footmark.profiler import ParseMethods, connection_methods
+
+        for cls, name, function in connection_methods():
+            if name == 'make_request':
+                self._patch(cls, name, self._wrap_request(function))
+            elif name not in ParseMethods:
+                self._patch(cls, name, self._wrap_method(function, '%s.%s' % (cls.__name__, name)))
+        self._patch(client.AcsClient, 'do_action_with_exception',
+                    self._wrap_attempt(client.AcsClient.__dict__['do_action_with_exception']))
+
+    def _patch(self, owner, name, wrapper):
+        patching.patch(self, owner, name, wrapper)
+
+    def _wrap_method(self, function, name):
+        tracer = self
+
+        def wrapper(connection, *args, **kwargs):
+            with tracer.span(name, region=getattr(connection, 'region', None)):
+                return function(connection, *args, **kwargs)
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    def _wrap_request(self, function):
+        tracer = self
+
+        def make_request(connection, action, params=None):
+            with tracer.span('make_request', action=action, region=connection.region,
+                             product=connection.product, attempts=0, retries=0) as span:
+                try:
+                    body = function(connection, action, params)
+                except Exception:
+                    span.set_attribute('outcome', 'error')
+                    raise
+                span.set_attribute('outcome', 'ok')
+                return body
+        make_request.__doc__ = function.__doc__
+        return make_request
+
+    def _wrap_attempt(self, function):
+        tracer = self
+
+        def do_action_with_exception(client, request, *args, **kwargs):
+            parent = current_span()
+            attempt = 0
+            if parent is not None and parent.name == 'make_request':
+                attempt = parent.attributes['attempts']
+                parent.set_attribute('attempts', attempt + 1)
+                parent.set_attribute('retries', attempt)
+            with tracer.span('attempt', action=request.get_action_name(), attempt=attempt) as span:
+                try:
+                    body = function(client, request, *args, **kwargs)
+                except Exception as e:
+                    get_request_id = getattr(e, 'get_request_id', None)
+                    span.set_attribute('request_id', get_request_id() if get_request_id else None)
+                    span.set_attribute('outcome', 'error')
+                    raise
+                span.set_attribute('request_id', _find_request_id(body))
+                span.set_attribute('outcome', 'ok')
+                return body
+        return do_action_with_exception
+
+
+def _find_request_id(body):
+    if isinstance(body, bytes) and not isinstance(body, str):
+        found = _request_id_bytes.search(body)
+        return found.group(1).decode('utf-8') if found else None
+    found = _request_id.search(body) if body else None
+    return found.group(1) if found else None
+
+
+def _random_id(size):
+    return binascii.hexlify(os.urandom(size)).decode('ascii')
+
+
+class _SpanContext(object):
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.span = Span(self.name, current_span(), self.attributes)
+        self.previous = _set_current(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        span = self.span
+        span.end = time.time()
+        if exc_type is None:
+            span.status = 'ok'
+        else:
+            span.status = 'error'
+            span.error = '%s: %s' % (exc_type.__name__, exc_value)
+        _set_current(self.previous)
+        self.tracer.exporter.export(span)
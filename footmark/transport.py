@@ -0,0 +1,197 @@
+"""
+Transports sending the requests of a connection in place of the SDK client:
+recording real traffic into a cassette file, and replaying it offline.
+"""
+import gzip
+import json
+import threading
+import time
+
+from footmark.exception import FootmarkClientError
+from footmark.logs import BodyLogger, DefaultRedactedKeys, RedactedValue
+
+CassetteVersion = 1
+
+
+class Transport(object):
+    """
+    Sends the requests of the connections it is assigned to, as
+    ``connection.transport``. Subclasses implement :meth:`request`.
+    """
+
+    def request(self, connection, action, params):
+        """
+        Return the response body of a request, or raise its error.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Scrubber(object):
+    """
+    Replaces secrets in request parameters and response bodies with
+    ``footmark.logs.RedactedValue``, matching the same names as the body
+    logger.
+    """
+
+    def __init__(self, redacted_keys=DefaultRedactedKeys):
+        self._names = BodyLogger(redacted_keys=redacted_keys)
+
+    def params(self, params):
+        return dict((name, RedactedValue if self._names.is_secret(name) else value)
+                    for name, value in (params or {}).items())
+
+    def body(self, body):
+        if isinstance(body, bytes) and not isinstance(body, str):
+            body = body.decode('utf-8')
+        return self._names.pattern.sub(lambda m: m.group(1) + RedactedValue + m.group(3), body)
+
+
+def request_key(connection, action, params):
+    """
+    The key matching a replayed request with a recorded one.
+    """
+    return connection.product, action, connection.region, json.dumps(params, sort_keys=True, default=str)
+
+
+def _open(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 'b')
+    return open(path, mode)
+
+
+def _write_line(f, record):
+    line = json.dumps(record, sort_keys=True, separators=(',', ':')) + '\n'
+    if isinstance(f, gzip.GzipFile):
+        line = line.encode('utf-8')
+    f.write(line)
+
+
+class RecordingTransport(Transport):
+    """
+    Sends each request with ``connection.send_request`` and appends it to a
+    cassette file, with its response or error and the time it took. A
+    cassette is one JSON object per line after a header line, gzipped when
+    ``path`` ends with ``.gz``. Secrets are scrubbed from the parameters
+    and bodies before they are written.
+    """
+
+    def __init__(self, path, scrubber=None):
+        self.path = path
+        self.scrubber = scrubber or Scrubber()
+        self._lock = threading.Lock()
+        self._file = _open(path, 'w')
+        _write_line(self._file, {'version': CassetteVersion})
+
+    def request(self, connection, action, params):
+        record = {
+            'product': connection.product,
+            'action': action,
+            'region': connection.region,
+            'params': self.scrubber.params(params),
+        }
+        start = time.time()
+        try:
+            body = connection.send_request(action, params)
+        except Exception as e:
+            record['error'] = _dump_error(e)
+            raise
+        else:
+            record['body'] = self.scrubber.body(body) if body is not None else None
+            return body
+        finally:
+            record['elapsed'] = round(time.time() - start, 6)
+            with self._lock:
+                _write_line(self._file, record)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests with the responses of a cassette, without network.
+    The responses recorded for the same product, action, region and
+    parameters are replayed in order; with ``repeat`` they start over once
+    exhausted, otherwise a request without a response left raises
+    FootmarkClientError. Parameters are scrubbed as when recording before
+    they are matched.
+
+    :type latency: float or str
+    :param latency: Seconds slept before each response, or ``'recorded'``
+        to sleep the recorded time. No delay by default.
+    """
+
+    def __init__(self, path, latency=None, repeat=False, scrubber=None):
+        self.path = path
+        self.latency = latency
+        self.repeat = repeat
+        self.scrubber = scrubber or Scrubber()
+        self._lock = threading.Lock()
+        self._records = {}
+        self._positions = {}
+        with _open(path, 'r') as f:
+            lines = iter(f)
+            header = json.loads(next(lines))
+            if header.get('version') != CassetteVersion:
+                raise FootmarkClientError('Unsupported cassette version: %s' % header.get('version'))
+            for line in lines:
+                record = json.loads(line)
+                key = (record['product'], record['action'], record['region'],
+                       json.dumps(record['params'], sort_keys=True, default=str))
+                self._records.setdefault(key, []).append(record)
+
+    def __len__(self):
+        return sum(len(records) for records in self._records.values())
+
+    def request(self, connection, action, params):
+        key = request_key(connection, action, self.scrubber.params(params))
+        records = self._records.get(key)
+        with self._lock:
+            position = self._positions.get(key, 0)
+            if records and self.repeat:
+                position %= len(records)
+            if not records or position >= len(records):
+                raise FootmarkClientError('No recorded response left for %s %s in %s with %s.'
+                                          % (action, connection.region, self.path, key[3]))
+            self._positions[key] = position + 1
+        record = records[position]
+
+        delay = record.get('elapsed', 0) if self.latency == 'recorded' else self.latency
+        if delay:
+            time.sleep(delay)
+        if 'error' in record:
+            raise _load_error(record['error'])
+        return record['body']
+
+
+def _dump_error(error):
+    def get(name):
+        getter = getattr(error, name, None)
+        return getter() if getter is not None else None
+
+    return {
+        'type': type(error).__name__,
+        'code': get('get_error_code'),
+        'message': get('get_error_msg') or str(error),
+        'http_status': get('get_http_status'),
+        'request_id': get('get_request_id'),
+    }
+
+
+def _load_error(error):
+    from aliyunsdkcore.acs_exception.exceptions import ClientException, ServerException
+    if error['type'] == 'ServerException':
+        return ServerException(error['code'], error['message'], error['http_status'], error['request_id'])
+    if error['type'] == 'ClientException':
+        return ClientException(error['code'], error['message'])
+    return FootmarkClientError('%s: %s' % (error['type'], error['message']))
@@ -0,0 +1,115 @@
+"""
+Helpers shared by the service connections for batching and concurrency.
+"""
+import sys
+import threading
+import time
+
+import six
+from six.moves import queue
+
+from footmark import profiler, tracing
+
+
+def to_native(value):
+    """
+    Return ``value`` as a native ``str``. On Python 2 unicode text is
+    encoded as UTF-8 instead of with the default ASCII codec, so that
+    non-ASCII names, descriptions, tags and error messages survive. On
+    Python 3 bytes, e.g. a response body, are decoded as UTF-8.
+    """
+    if isinstance(value, six.text_type):
+        return value.encode('utf-8') if six.PY2 else value
+    if isinstance(value, bytes) and not six.PY2:
+        return value.decode('utf-8')
+    try:
+        return str(value)
+    except UnicodeEncodeError:
+        # An object, e.g. an exception, whose __str__ returns unicode.
+        return six.text_type(value).encode('utf-8')
+
+
+def chunked(items, size):
+    """
+    Split ``items`` into lists of at most ``size`` elements.
+
+    :rtype: list
+    :return: A list of lists
+    """
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_concurrently(func, items, max_workers):
+    """
+    Call ``func(item)`` for every item on up to ``max_workers`` threads, or
+    one after the other when ``max_workers`` is None or at most 1.
+
+    :rtype: list
+    :return: The results, in the same order as ``items``. If any call raised,
+        the exception of the first such item in ``items`` is re-raised once
+        all calls have finished.
+    """
+    items = list(items)
+    # Spans created by the calls are children of the caller's span, and so
+    # are their nodes in an active profile.
+    func = profiler.bind(tracing.bind(func))
+    results = [None] * len(items)
+    errors = []
+    pending = queue.Queue()
+    for pair in enumerate(items):
+        pending.put(pair)
+
+    def worker():
+        while True:
+            try:
+                index, item = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[index] = func(item)
+            except Exception:
+                errors.append((index, sys.exc_info()))
+
+    if max_workers is None or max_workers <= 1 or len(items) <= 1:
+        worker()
+    else:
+        threads = [threading.Thread(target=worker) for _ in range(min(max_workers, len(items)))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        six.reraise(*min(errors, key=lambda error: error[0])[1])
+    return results
+
+
+class RateLimiter(object):
+    """
+    A thread-safe token bucket allowing ``rate`` calls per second on average
+    and bursts of up to ``burst`` calls.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a call is allowed.
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -21,7 +21,8 @@ class VPCConnection(ACSQueryConnection):
     ResponseError = VPCResponseError
 
     def __init__(self, acs_access_key_id=None, acs_secret_access_key=None,
-                 region=None, sdk_version=None, security_token=None, user_agent=None):
+                 region=None, sdk_version=None, security_token=None, user_agent=None,
+                 identity_map=False, intern_fields=None, interner=None):
         """
         Init method to create a new connection to ECS.
         """
@@ -37,7 +38,9 @@ class VPCConnection(ACSQueryConnection):
         super(VPCConnection, self).__init__(acs_access_key_id=acs_access_key_id,
                                             acs_secret_access_key=acs_secret_access_key,
                                             region=self.region, product=self.VPCSDK,
-                                            security_token=security_token, user_agent=user_agent)
+                                            security_token=security_token, user_agent=user_agent,
+                                            identity_map=identity_map,
+                                            intern_fields=intern_fields, interner=interner)
 
     def build_filter_params(self, params, filters):
         if not isinstance(filters, dict):
@@ -125,7 +128,7 @@ class VPCConnection(ACSQueryConnection):
 
         return None
 
-    def get_all_vpcs(self, vpc_id=None, is_default=None, pagenumber=1, pagesize=10):
+    def get_all_vpcs(self, vpc_id=None, is_default=None, pagenumber=1, pagesize=10, fields=None):
         """
         Find Vpc in One Region
         :type vpc_id: string
@@ -137,6 +140,8 @@ class VPCConnection(ACSQueryConnection):
         :type pagesize: integer
         :param pagesize: Sets the number of lines per page for queries per page. The maximum value is 50.
         The default value is 10
+        :type fields: list
+        :param fields: Only set these attributes of the vpcs
         :rtype: list
         :return: Returns VPC list if vpcs found along with Vpc details.
         """
@@ -151,7 +156,7 @@ class VPCConnection(ACSQueryConnection):
         self.build_list_params(params, pagenumber, 'PageNumber')
         self.build_list_params(params, pagesize, 'PageSize')
 
-        return self.get_list('DescribeVpcs', params, ['Vpcs', Vpc])
+        return self.get_list('DescribeVpcs', params, ['Vpcs', Vpc], fields=fields)
 
     def modify_vpc(self, vpc_id, vpc_name=None, description=None, user_cidr=None, wait_timeout=None, wait=None):
 
@@ -247,7 +252,8 @@ class VPCConnection(ACSQueryConnection):
         changed = self.wait_for_vswitch_status(vsw_id, 'Available', 4, 16)
         return changed, self.get_vswitch_attribute(vsw_id)
 
-    def get_all_vswitches(self, vpc_id=None, vswitch_id=None, zone_id=None, is_default=None, pagenumber=1, pagesize=10):
+    def get_all_vswitches(self, vpc_id=None, vswitch_id=None, zone_id=None, is_default=None, pagenumber=1, pagesize=10,
+                          fields=None):
         """
         Find Vpc
         :type vpc_id: String
@@ -263,6 +269,8 @@ class VPCConnection(ACSQueryConnection):
         :type pagesize: integer
         :param pagesize: Sets the number of lines per page for queries per page. The maximum value is 50.
         The default value is 10
+        :type fields: list
+        :param fields: Only set these attributes of the vswitches
         :rtype: list
         :return: Return VSwitch list if VSwitches found along with VSwitch details.
         """
@@ -283,7 +291,7 @@ class VPCConnection(ACSQueryConnection):
         self.build_list_params(params, pagenumber, 'PageNumber')
         self.build_list_params(params, pagesize, 'PageSize')
 
-        return self.get_list('DescribeVSwitches', params, ['VSwitches', VSwitch])
+        return self.get_list('DescribeVSwitches', params, ['VSwitches', VSwitch], fields=fields)
 
     def get_vswitch_attribute(self, vswitch_id):
         """
@@ -431,7 +439,8 @@ class VPCConnection(ACSQueryConnection):
                     return entry
         return None
 
-    def get_all_route_entries(self, router_id=None, router_type=None, route_table_id=None, pagenumber=1, pagesize=10):
+    def get_all_route_entries(self, router_id=None, router_type=None, route_table_id=None, pagenumber=1, pagesize=10,
+                              fields=None):
         """
         Querying all route entries in the specified router or route_tables_id
         :type router_id: str
@@ -445,11 +454,16 @@ class VPCConnection(ACSQueryConnection):
         :type pagesize: integer
         :param pagesize: Sets the number of lines per page for queries per page. The maximum value is 50.
         The default value is 10 
+        :type fields: list
+        :param fields: Only set these attributes of the route entries
         :rtype list<>
         :return: List of route entry.
         """
         route_tables = self.get_all_route_tables(router_id=router_id, router_type=router_type, route_table_id=route_table_id,
-                                                 pagenumber=pagenumber, pagesize=pagesize)
+                                                 pagenumber=pagenumber, pagesize=pagesize,
+                                                 fields=None if fields is None else ['route_entrys'])
+        if fields is not None:
+            fields = self.projection(RouteEntry, fields)
         route_entries = []
         if route_tables:
             for table in route_tables:
@@ -457,7 +471,8 @@ class VPCConnection(ACSQueryConnection):
                     for entry in table.route_entrys['route_entry']:
                         route_entry = RouteEntry(self)
                         for k, v in entry.items():
-                            setattr(route_entry, k, v)
+                            if fields is None or k in fields:
+                                setattr(route_entry, k, v)
                         route_entries.append(route_entry)
 
         return route_entries
@@ -500,7 +515,8 @@ class VPCConnection(ACSQueryConnection):
         """
         return self.get_all_route_tables(route_table_id=route_table_id)
 
-    def get_all_route_tables(self, router_id=None, router_type=None, route_table_id=None, pagenumber=1, pagesize=10):
+    def get_all_route_tables(self, router_id=None, router_type=None, route_table_id=None, pagenumber=1, pagesize=10,
+                             fields=None):
         """
         Querying vrouter
         :type router_id: str
@@ -514,6 +530,8 @@ class VPCConnection(ACSQueryConnection):
         :type pagesize: integer
         :param pagesize: Sets the number of lines per page for queries per page. The maximum value is 50.
         The default value is 10 
+        :type fields: list
+        :param fields: Only set these attributes of the route tables
         :rtype list<>
         :return: List of route entry.
         """
@@ -534,7 +552,7 @@ class VPCConnection(ACSQueryConnection):
         if pagesize:
             self.build_list_params(params, pagesize, 'PageSize')
 
-        return self.get_list('DescribeRouteTables', params, ['RouteTables', RouteTable])
+        return self.get_list('DescribeRouteTables', params, ['RouteTables', RouteTable], fields=fields)
 
     def get_instance_info(self):
         """
@@ -579,7 +597,7 @@ class VPCConnection(ACSQueryConnection):
         return None
 
     def get_all_eip_addresses(self, status=None, ip_address=None, allocation_id=None, associated_instance_type=None,
-                              associated_instance_id=None, page_number=1, page_size=50):
+                              associated_instance_id=None, page_number=1, page_size=50, fields=None):
         """
         Get EIP details for a region
         :param status: The EIP status includes Associating | Unassociating | InUse | Available
@@ -589,6 +607,7 @@ class VPCConnection(ACSQueryConnection):
         :param associated_instance_id: The ID of the associate device
         :param pagenumber: Page number. The start value is 1. The default value is 1
         :param pagesize: Sets the number of lines per page for queries per page. The maximum value is 50. Default to 50.
+        :param fields: Only set these attributes of the EIPs
         :return:
         """
         params = {}
@@ -607,7 +626,7 @@ class VPCConnection(ACSQueryConnection):
         self.build_list_params(params, page_number, 'PageNumber')
         self.build_list_params(params, page_size, 'PageSize')
 
-        return self.get_list('DescribeEipAddresses', params, ['EipAddresses', Eip])
+        return self.get_list('DescribeEipAddresses', params, ['EipAddresses', Eip], fields=fields)
 
     def associate_eip(self, allocation_id, instance_id):
         """
@@ -680,7 +699,7 @@ class VPCConnection(ACSQueryConnection):
         raise Exception("Retry 10 times to release EIP failed."
                         "Please ensure EIP status is Available before releasing it.")
 
-    def get_all_vrouters(self, vrouter_id=None, pagenumber=None, pagesize=None):
+    def get_all_vrouters(self, vrouter_id=None, pagenumber=None, pagesize=None, fields=None):
         """
         Querying vrouter
         :param vrouter_id: VRouter_Id to be fetched
@@ -690,6 +709,10 @@ class VPCConnection(ACSQueryConnection):
         :type pagesize: integer
         :param pagesize: Sets the number of lines per page for queries per page. The maximum value is 50.
         The default value is 10
+        :type fields: list
+        :param fields: Only keep these snake_cased fields of the VRouters,
+            which are then returned as a list of dicts, see
+            :meth:`footmark.connection.ACSQueryConnection.get_rows`
         :return: VRouters in json format
         """
         params = {}
@@ -705,7 +728,10 @@ class VPCConnection(ACSQueryConnection):
             if pagesize is not None :
                 self.build_list_params(params, pagesize, 'PageSize')
 
-            results = self.get_status('DescribeVRouters', params)
+            if fields is not None:
+                results = self.get_rows('DescribeVRouters', params, ['VRouters'], frozenset(fields))
+            else:
+                results = self.get_status('DescribeVRouters', params)
         except Exception as ex:
             error_code = ex.error_code
             error_msg = ex.message
@@ -5,6 +5,13 @@ from footmark.vpc.vpcobject import TaggedVPCObject
 
 
 class Eip(TaggedVPCObject):
+    _fields = ('allocation_id', 'ip_address', 'status', 'region_id', 'bandwidth', 'internet_charge_type',
+               'instance_id', 'instance_type', 'instance_region_id', 'allocation_time', 'charge_type',
+               'expired_time', 'operation_locks', 'request_id')
+    _aliases = {'id': 'allocation_id', 'eip_id': 'allocation_id',
+                'ip': 'ip_address', 'eip': 'ip_address', 'eip_address': 'ip_address'}
+    _lenient = True
+
     def __init__(self, connection=None, owner_id=None,
                  name=None, description=None, id=None):
         super(Eip, self).__init__(connection)
@@ -13,26 +20,6 @@ class Eip(TaggedVPCObject):
     def __repr__(self):
         return 'Eip:%s' % self.id
 
-    def __getattr__(self, name):
-        if name in ('id', 'eip_id'):
-            return self.allocation_id
-        if name in ('ip', 'eip', 'eip_address'):
-            return self.ip_address
-
-        return getattr(self, name, None)
-
-    def __setattr__(self, name, value):
-        if name in ('id', 'eip_id'):
-            self.allocation_id = value
-        if name in ('ip', 'eip', 'eip_address'):
-            self.ip_address = value
-        if name == 'tags' and value:
-            v = {}
-            for tag in value['tag']:
-                v[tag.get('TagKey')] = tag.get('TagValue', None)
-            value = v
-        super(TaggedVPCObject, self).__setattr__(name, value)
-    
     def associate(self, instance_id):
         """
         bind eip
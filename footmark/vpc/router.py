@@ -5,6 +5,9 @@ from footmark.vpc.vpcobject import TaggedVPCObject
 
 
 class RouteTable(TaggedVPCObject):
+    _fields = ('route_table_id', 'route_table_type', 'vrouter_id', 'creation_time', 'route_entrys', 'request_id')
+    _aliases = {'id': 'route_table_id'}
+
     def __init__(self, connection=None, ):
         super(RouteTable, self).__init__(connection)
         self.tags = {}
@@ -12,39 +15,16 @@ class RouteTable(TaggedVPCObject):
     def __repr__(self):
         return 'RouteTable:%s' % self.id
 
-    def __getattr__(self, name):
-        if name == 'id':
-            return self.route_table_id
-        raise AttributeError
-
-    def __setattr__(self, name, value):
-        if name == 'id':
-            self.route_table_id = value
-        super(TaggedVPCObject, self).__setattr__(name, value)
-
 
 class RouteEntry(TaggedVPCObject):
+    _fields = ('destination_cidr_block', 'instance_id', 'next_hop_type', 'next_hops', 'route_table_id', 'status',
+               'type', 'request_id')
+    _aliases = {'destination_cidrblock': 'destination_cidr_block', 'next_hop_id': 'instance_id'}
+    _prefix_aliases = (('nexthop_', 'next_hop_'),)
+
     def __init__(self, connection=None, ):
         super(RouteEntry, self).__init__(connection)
         self.tags = {}
 
     def __repr__(self):
         return 'RouteEntry:%s' % self.destination_cidrblock
-
-    def __getattr__(self, name):
-        if name == 'destination_cidrblock':
-            return self.destination_cidr_block
-        if name == 'next_hop_id':
-            return self.instance_id
-        if name.startswith('nexthop_'):
-            return getattr(self, 'next_hop' + name[7:])
-        raise AttributeError
-
-    def __setattr__(self, name, value):
-        if name == 'destination_cidrblock':
-            self.destination_cidr_block = value
-        if name == 'next_hop_id':
-            self.instance_id = value
-        if name.startswith('nexthop_'):
-            setattr(self, 'next_hop' + name[7:], value)
-        super(TaggedVPCObject, self).__setattr__(name, value)
@@ -1,4 +1,9 @@
-class VPCObject(object):
+from footmark.model import Model, tag_dict
+
+
+class VPCObject(Model):
+    _fields = ('connection', 'region')
+
     def __init__(self, connection=None):
         self.connection = connection
         if self.connection and hasattr(self.connection, 'region'):
@@ -17,6 +22,8 @@ class TaggedVPCObject(VPCObject):
     into a dict that is stored in the "tags" attribute of the
     object.
     """
+    _fields = ('tags',)
+    _converters = {'tags': tag_dict}
 
     def __init__(self, connection=None):
         super(TaggedVPCObject, self).__init__(connection)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+"""
+Measures the time to import footmark modules in a fresh interpreter, as
+each Ansible module invocation does.
+
+    python -m tests.benchmarks.startup [runs]
+"""
+import subprocess
+import sys
+
+MODULES = ['footmark', 'footmark.connection', 'footmark.ecs.connection', 'footmark.oss.bucket']
+
+TIMER = """
+import time
+start = time.time()
+import %s
+print(time.time() - start)
+"""
+
+
+def time_import(module, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', TIMER % module])
+        timings.append(float(output.decode('utf-8').strip()))
+    return sorted(timings)[len(timings) // 2]
+
+
+def main(runs=10):
+    baseline = time_import('json', runs)
+    for module in MODULES:
+        print('%-28s %8.1f ms' % (module, (time_import(module, runs) - baseline) * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,474 @@
+#!/usr/bin/env python
+"""
+Benchmarks of the hot paths of footmark, compared with a stored baseline.
+
+    python -m tests.benchmarks.suite [--quick] [--save] [--threshold 0.5] [name ...]
+
+Each benchmark reports its best wall time of ``--repeat`` runs, the peak
+memory traced by tracemalloc where available, and for the benchmarks run
+against the emulator the number of API requests and the simulated seconds
+spent waiting. The results are compared with the baseline stored for the
+running Python version: the exit status is 1 when a time or memory grew
+by more than the threshold, or when a request count or simulated wait
+grew at all. Times are scaled by the speed of the machine relative to the
+baseline, measured with a fixed calibration workload before each
+benchmark. ``--save`` stores the results as the new baseline. Without
+it, nothing is run when there is no baseline for the running Python
+version, and a benchmark missing from the baseline is reported as
+skipped rather than passed: both exit with status 2, unless a benchmark
+regressed. Peak memory is only gated on Pythons with tracemalloc, i.e. not
+on Python 2.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import warnings
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.instance import Instance
+from footmark.emulator import Emulator, ManualClock
+from tests.compat import mock
+
+BaselinePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+DefaultThreshold = 0.5
+
+# Metrics that must not grow at all, as they do not depend on the machine.
+ExactMetrics = ('requests', 'simulated')
+
+Sizes = (10, 1000, 10000)
+QuickSizes = (10, 1000)
+
+# Smallest growth of a time, in seconds, reported as a regression.
+MinTimeDifference = 0.001
+
+# Fast benchmarks are repeated until they took MinBenchmarkTime seconds,
+# at most MaxRuns times; none is repeated after MaxBenchmarkTime seconds.
+MinBenchmarkTime = 0.5
+MaxBenchmarkTime = 5.0
+MaxRuns = 100
+
+timer = getattr(time, 'perf_counter', time.time)
+
+_benchmarks = []
+
+
+def benchmark(name, sizes=(None,), calibrate=True):
+    """
+    Register a benchmark. The decorated function is called with a size and
+    returns the function to time, which may return extra metrics as a dict.
+    Benchmarks mostly running C code are not ``calibrate``-d.
+    """
+    def register(setup):
+        for size in sizes:
+            label = name if size is None else '%s[%d]' % (name, size)
+            _benchmarks.append((label, setup, size, calibrate))
+        return setup
+    return register
+
+
+def connection():
+    return ECSConnection(acs_access_key_id='key', acs_secret_access_key='secret', region='cn-beijing')
+
+
+def instance_item(index):
+    return {
+        'InstanceId': 'i-%08d' % index,
+        'InstanceName': 'web-%d' % index,
+        'HostName': 'web-%d' % index,
+        'Description': '',
+        'Status': 'Running',
+        'ZoneId': 'cn-beijing-a',
+        'RegionId': 'cn-beijing',
+        'InstanceType': 'ecs.n4.small',
+        'ImageId': 'ubuntu_16_0402_64_20G_alibase_20180409.vhd',
+        'InstanceNetworkType': 'vpc',
+        'InstanceChargeType': 'PostPaid',
+        'InternetChargeType': 'PayByTraffic',
+        'InternetMaxBandwidthOut': 0,
+        'CreationTime': '2018-05-04T08:19Z',
+        'ExpiredTime': '2099-12-31T15:59Z',
+        'IoOptimized': True,
+        'Cpu': 1,
+        'Memory': 2048,
+        'VpcAttributes': {'VpcId': 'vpc-1', 'VSwitchId': 'vsw-1',
+                          'PrivateIpAddress': {'IpAddress': ['172.16.%d.%d' % (index // 250, index % 250)]}},
+        'SecurityGroupIds': {'SecurityGroupId': ['sg-1']},
+        'PublicIpAddress': {'IpAddress': []},
+        'InnerIpAddress': {'IpAddress': []},
+        'EipAddress': {'AllocationId': '', 'IpAddress': '', 'InternetChargeType': ''},
+        'Tags': {'Tag': [{'TagKey': 'env', 'TagValue': 'bench'}]},
+    }
+
+
+def instances_body(count):
+    return json.dumps({
+        'RequestId': 'AF3991A3-5203-4F83-8FAD-FDC1253AF15D',
+        'TotalCount': count,
+        'PageNumber': 1,
+        'PageSize': count,
+        'Instances': {'Instance': [instance_item(i) for i in range(count)]},
+    })
+
+
+def field_names(value, names):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            names.append(k)
+            field_names(v, names)
+    elif isinstance(value, list):
+        for v in value:
+            field_names(v, names)
+    return names
+
+
+@benchmark('parse_response', Sizes)
+def parse_response(size):
+    conn = connection()
+    body = instances_body(size)
+    return lambda: conn.parse_response(['Instances', Instance], body, conn)
+
+
+@benchmark('convert_name', Sizes)
+def convert_name(size):
+    import footmark.connection
+
+    conn = connection()
+    names = field_names([instance_item(i) for i in range(size)], [])
+    footmark.connection._converted_names.clear()
+
+    def run():
+        for name in names:
+            conn.convert_name(name)
+    return run
+
+
+@benchmark('build_element', Sizes)
+def build_element(size):
+    conn = connection()
+    rows = conn.parse_rows(['Instances', Instance], instances_body(size))
+
+    def run():
+        for row in rows:
+            conn.build_element(Instance, dict(row))
+    return run
+
+
+def emulated(latency=None):
+    clock = ManualClock()
+    conn = connection()
+    conn.transport = Emulator(clock=clock, latency=latency)
+    return conn, clock
+
+
+def seed_instances(conn, count, disks=0):
+    emulator = conn.transport
+    group_id = emulator.add('SecurityGroup', conn.region, 'Available', SecurityGroupName='web', VpcId='vpc-1')
+    for i in range(count):
+        item = instance_item(i)
+        item.pop('Status')
+        item['SecurityGroupIds'] = {'SecurityGroupId': [group_id]}
+        instance_id = emulator.add('Instance', conn.region, 'Running', **item)
+        for _ in range(disks):
+            emulator.add('Disk', conn.region, 'In_use', InstanceId=instance_id, ZoneId=item['ZoneId'],
+                         Category='cloud_efficiency', Size=40, Type='data')
+
+
+def emulator_metrics(conn, clock):
+    return {'requests': conn.transport.calls_count(), 'simulated': clock.now}
+
+
+@benchmark('paged_listing', (1000,))
+def paged_listing(size):
+    conn, clock = emulated()
+    seed_instances(conn, size)
+
+    def run():
+        conn.get_paged_list('DescribeInstances', {'set_PageSize': 100}, ['Instances', Instance], 100)
+        return emulator_metrics(conn, clock)
+    return run
+
+
+@benchmark('get_all_instances', (200,))
+def get_all_instances(size):
+    conn, clock = emulated()
+    seed_instances(conn, size, disks=2)
+
+    def run():
+        conn.get_all_instances()
+        return emulator_metrics(conn, clock)
+    return run
+
+
+@benchmark('create_instance')
+def create_instance(size):
+    conn, clock = emulated(latency=0.05)
+    group_id = conn.transport.add('SecurityGroup', conn.region, 'Available')
+
+    def run():
+        with mock.patch('time.sleep', clock.sleep):
+            conn.create_instance('ubuntu', 'ecs.n4.small', group_id=group_id, count=1)
+        return emulator_metrics(conn, clock)
+    return run
+
+
+@benchmark('attach_disks', (50,))
+def attach_disks(size):
+    conn, clock = emulated(latency=0.05)
+    emulator = conn.transport
+    instance_id = emulator.add('Instance', conn.region, 'Running')
+    pairs = [(emulator.add('Disk', conn.region, 'Available', InstanceId=''), instance_id) for _ in range(size)]
+
+    def run():
+        with mock.patch('time.sleep', clock.sleep):
+            conn.attach_disks(pairs)
+        return emulator_metrics(conn, clock)
+    return run
+
+
+class FakeOSSResponse(object):
+
+    def __init__(self, body=b'', headers=None):
+        from oss2.http import CaseInsensitiveDict
+
+        self.status_code = 200
+        self.body = body
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.headers.setdefault('x-oss-request-id', 'AF3991A3-5203-4F83-8FAD-FDC1253AF15D')
+
+    def iter_content(self, chunk_size=8192, decode_unicode=False):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+class FakeOSSSession(object):
+    """
+    Stands for the requests session of oss2: uploads are read to the end and
+    downloads return ``objects[key]``, so that only the client side cost is
+    measured.
+    """
+
+    def __init__(self):
+        self.objects = {}
+
+    def request(self, method, url, data=None, **kwargs):
+        from oss2.utils import Crc64
+
+        key = url.rsplit('/', 1)[-1]
+        crc = Crc64()
+        if method == 'PUT':
+            chunks = []
+            read = getattr(data, 'read', None)
+            for chunk in iter(lambda: read(65536), b'') if read else [data]:
+                chunks.append(chunk)
+            self.objects[key] = b''.join(chunks)
+            crc.update(self.objects[key])
+            return FakeOSSResponse(headers={'etag': '"etag"', 'x-oss-hash-crc64ecma': str(crc.crc)})
+        body = self.objects[key]
+        crc.update(body)
+        return FakeOSSResponse(body, {'content-length': str(len(body)), 'x-oss-hash-crc64ecma': str(crc.crc),
+                                      'etag': '"etag"', 'x-oss-object-type': 'Normal'})
+
+
+def bucket_with_fake_session():
+    from footmark.oss.bucket import Bucket
+
+    bucket = Bucket('key', 'secret', 'cn-beijing', 'bench')
+    bucket.bucket.session.session = FakeOSSSession()
+    return bucket
+
+
+@benchmark('oss_put_object', (8,), calibrate=False)
+def oss_put_object(size):
+    bucket = bucket_with_fake_session()
+    data = os.urandom(size * 1024 * 1024)
+
+    def run():
+        start = timer()
+        bucket.put_object('object', data, overwrite=True)
+        return {'throughput': size / (timer() - start)}
+    return run
+
+
+@benchmark('oss_get_object', (8,), calibrate=False)
+def oss_get_object(size):
+    bucket = bucket_with_fake_session()
+    bucket.bucket.session.session.objects['object'] = os.urandom(size * 1024 * 1024)
+
+    def run():
+        start = timer()
+        bucket.get_object('object').read()
+        return {'throughput': size / (timer() - start)}
+    return run
+
+
+def calibration(size):
+    """
+    A fixed pure Python workload, timed with the benchmarks so that their
+    times are compared relative to the speed of the machine.
+    """
+    items = [instance_item(i) for i in range(200)]
+
+    def run():
+        for item in json.loads(json.dumps(items)):
+            sorted(field_names(item, []))
+    return run
+
+
+def measure(setup, size, repeat, budget=MaxBenchmarkTime, memory=True):
+    """
+    Return the metrics of the best of at least ``repeat`` runs, each with a
+    fresh setup, and the peak traced memory of one more run where
+    available. Runs stop early once they took ``budget`` seconds in total.
+    """
+    best = None
+    total = 0.0
+    runs = 0
+    while runs < MaxRuns and total <= budget and (runs < repeat or total < MinBenchmarkTime):
+        run = setup(size)
+        gc.collect()
+        start = timer()
+        result = run()
+        elapsed = timer() - start
+        metrics = dict(result) if isinstance(result, dict) else {}
+        metrics['seconds'] = elapsed
+        total += elapsed
+        runs += 1
+        if best is None or metrics['seconds'] < best['seconds']:
+            best = metrics
+    if memory and tracemalloc is not None:
+        run = setup(size)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            best['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best
+
+
+def run_benchmarks(names=None, quick=False, repeat=5, output=sys.stdout):
+    results = {}
+    for label, setup, size, calibrate in _benchmarks:
+        if quick and size in Sizes and size not in QuickSizes:
+            continue
+        if names and not any(name in label for name in names):
+            continue
+        calibrated = measure(calibration, None, 3, memory=False)['seconds'] if calibrate else None
+        results[label] = metrics = measure(setup, size, min(repeat, 3) if quick else repeat)
+        if calibrated is not None:
+            metrics['calibration'] = calibrated
+        output.write('%-26s %s\n' % (label, format_metrics(metrics)))
+    return results
+
+
+def format_metrics(metrics):
+    parts = ['%10.3f ms' % (metrics['seconds'] * 1000)]
+    if 'throughput' in metrics:
+        parts.append('%8.1f MB/s' % metrics['throughput'])
+    if 'requests' in metrics:
+        parts.append('%5d requests' % metrics['requests'])
+    if 'simulated' in metrics:
+        parts.append('%8.1f s waited' % metrics['simulated'])
+    if 'peak_memory' in metrics:
+        parts.append('%8.1f KiB peak' % (metrics['peak_memory'] / 1024.0))
+    return '  '.join(parts)
+
+
+def compare(results, baseline, threshold=DefaultThreshold):
+    """
+    Return the (name, metric, baseline, current) of each metric of
+    ``results`` worse than ``baseline``: times and memory by more than
+    ``threshold``, a fraction of the baseline, and ExactMetrics at all.
+    Times must also have grown by MinTimeDifference, and are scaled by the
+    ratio of the calibration times measured before each benchmark when both
+    have one. Throughputs are not compared, as they follow the times.
+    """
+    regressions = []
+    for name in sorted(results):
+        metrics = results[name]
+        expected = baseline.get(name, {})
+        scale = 1.0
+        if metrics.get('calibration') and expected.get('calibration'):
+            scale = metrics['calibration'] / expected['calibration']
+        for metric, value in sorted(metrics.items()):
+            base = expected.get(metric)
+            if base is None or metric in ('throughput', 'calibration'):
+                continue
+            if metric in ExactMetrics:
+                limit = base + 1e-9
+            elif metric == 'seconds':
+                base *= scale
+                limit = max(base * (1 + threshold), base + MinTimeDifference)
+            else:
+                limit = base * (1 + threshold)
+            if value > limit:
+                regressions.append((name, metric, base, value))
+    return regressions
+
+
+def python_version():
+    return '%d.%d' % sys.version_info[:2]
+
+
+def load_baseline(path=BaselinePath):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BaselinePath):
+    baselines = load_baseline(path)
+    baselines.setdefault(python_version(), {}).update(results)
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths of footmark.')
+    parser.add_argument('names', nargs='*', help='Only run the benchmarks whose name contains one of these.')
+    parser.add_argument('--quick', action='store_true',
+                        help='Skip the largest sizes and run each benchmark at most 3 times.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=DefaultThreshold,
+                        help='Allowed slowdown, as a fraction of the baseline.')
+    parser.add_argument('--baseline', default=BaselinePath)
+    parser.add_argument('--save', action='store_true', help='Store the results as the baseline.')
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline).get(python_version())
+    if baseline is None and not args.save:
+        print('SKIPPED: no baseline for Python %s in %s, run with --save to store one.'
+              % (python_version(), args.baseline))
+        return 2
+
+    warnings.simplefilter('ignore', PendingDeprecationWarning)
+    results = run_benchmarks(args.names, args.quick, args.repeat)
+    if args.save:
+        save_baseline(results, args.baseline)
+        return 0
+
+    skipped = sorted(name for name in results if name not in baseline)
+    for name in skipped:
+        print('SKIPPED %s: no baseline for Python %s, run with --save to store one.' % (name, python_version()))
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, base, value in regressions:
+        print('REGRESSION %s %s: %s -> %s' % (name, metric, base, value))
+    if regressions:
+        return 1
+    return 2 if skipped else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
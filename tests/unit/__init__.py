@@ -1,6 +1,79 @@
+import threading
+
 from tests.compat import mock, unittest
 
 
+class CallBudget(object):
+    """
+    Counts the API requests a connection makes through ``make_request`` and
+    the seconds passed to ``time.sleep`` within a block, and fails the test
+    when they exceed ``max_calls`` or ``max_sleep``. Sleeps are not slept,
+    but passed to ``sleep`` if given, e.g. ``ManualClock.sleep`` of the
+    emulator.
+    """
+
+    def __init__(self, test_case, connection, max_calls=None, max_sleep=None, sleep=None):
+        self.test_case = test_case
+        self.connection = connection
+        self.max_calls = max_calls
+        self.max_sleep = max_sleep
+        self.sleep = sleep
+        self.actions = []
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self):
+        return len(self.actions)
+
+    @property
+    def slept(self):
+        return sum(self.sleeps)
+
+    def counts(self):
+        counts = {}
+        for action in self.actions:
+            counts[action] = counts.get(action, 0) + 1
+        return counts
+
+    def __enter__(self):
+        connection = self.connection
+        make_request = connection.make_request
+        self._patched = connection.__dict__.get('make_request')
+        budget = self
+
+        def counted(action, params=None):
+            with budget._lock:
+                budget.actions.append(action)
+            return make_request(action, params)
+        connection.make_request = counted
+        self._sleep_patch = mock.patch('time.sleep', self._sleep)
+        self._sleep_patch.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._sleep_patch.stop()
+        if self._patched is None:
+            del self.connection.make_request
+        else:
+            self.connection.make_request = self._patched
+        if exc_type is not None:
+            return
+        summary = ', '.join('%s x%d' % item for item in sorted(self.counts().items()))
+        if self.max_calls is not None and self.calls > self.max_calls:
+            self.test_case.fail('%d API calls made, at most %d expected: %s'
+                                % (self.calls, self.max_calls, summary))
+        if self.max_sleep is not None and self.slept > self.max_sleep:
+            self.test_case.fail('%.1f seconds slept, at most %.1f expected (%d sleeps, %s)'
+                                % (self.slept, self.max_sleep, len(self.sleeps), summary))
+
+    def _sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+        if self.sleep is not None:
+            self.sleep(seconds)
+
+
 class ACSMockServiceTestCase(unittest.TestCase):
     """Base class for mocking acs services."""
     # This param is used by the unittest module to display a full
@@ -47,6 +120,17 @@ class ACSMockServiceTestCase(unittest.TestCase):
     def default_body(self):
         return ''
 
+    def assertCallBudget(self, max_calls=None, max_sleep=None, sleep=None, connection=None):
+        """
+        Return a :class:`CallBudget` context manager failing the test when
+        the block makes more than ``max_calls`` API requests through the
+        service connection, or sleeps more than ``max_sleep`` seconds::
+
+            with self.assertCallBudget(max_calls=int(math.ceil(n / 100.0)) + 2):
+                self.service_connection.get_all_instances(fields=['id'])
+        """
+        return CallBudget(self, connection or self.service_connection, max_calls, max_sleep, sleep)
+
 
 class OSSMockServiceTestCase(unittest.TestCase):
     """Base class for mocking acs services."""
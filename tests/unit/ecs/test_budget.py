@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+import math
+import time
+
+from footmark.ecs.connection import ECSConnection
+from footmark.emulator import Emulator, ManualClock
+from tests.unit import ACSMockServiceTestCase
+
+
+def pages(count, size=100):
+    return int(math.ceil(count / float(size)))
+
+
+class TestCallBudget(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def test_counts_mocked_requests(self):
+        self.service_connection.make_request.return_value = '{"RequestId": "r-1"}'
+        with self.assertCallBudget(max_calls=2, max_sleep=1) as budget:
+            self.service_connection.get_status('StartInstance', {})
+            self.service_connection.get_status('StopInstance', {})
+        self.assertEqual(budget.counts(), {'StartInstance': 1, 'StopInstance': 1})
+        self.assertEqual(self.service_connection.make_request.call_count, 2)
+
+        with self.assertRaises(self.failureException) as raised:
+            with self.assertCallBudget(max_calls=1):
+                self.service_connection.get_status('StartInstance', {})
+                self.service_connection.get_status('StartInstance', {})
+        self.assertIn('StartInstance x2', str(raised.exception))
+
+        with self.assertRaises(self.failureException):
+            with self.assertCallBudget(max_sleep=5):
+                time.sleep(6)
+
+
+class TestECSCallBudgets(ACSMockServiceTestCase):
+    """
+    The number of API requests and the time slept by public ECS methods,
+    against the emulator.
+    """
+    connection_class = ECSConnection
+
+    def initialize_service_connection(self):
+        self.clock = ManualClock()
+        self.emulator = Emulator(clock=self.clock)
+        self.service_connection.transport = self.emulator
+        self.region = self.service_connection.region
+
+    def budget(self, max_calls=None, max_sleep=None):
+        return self.assertCallBudget(max_calls=max_calls, max_sleep=max_sleep, sleep=self.clock.sleep)
+
+    def add_instances(self, count, status='Running'):
+        group_id = self.emulator.add('SecurityGroup', self.region, 'Available')
+        return [self.emulator.add('Instance', self.region, status, SecurityGroupIds={'SecurityGroupId': [group_id]})
+                for _ in range(count)]
+
+    def test_get_all_instances(self):
+        for count in (1, 100, 250):
+            self.emulator = self.service_connection.transport = Emulator(clock=self.clock)
+            self.add_instances(count)
+            with self.budget(max_calls=pages(count) + 2):
+                instances = self.service_connection.get_all_instances(fields=['id', 'status'])
+            self.assertEqual(len(instances), count)
+            with self.budget(max_calls=pages(count) + 2):
+                self.service_connection.get_all_instances(as_columns=True)
+
+    def test_get_all_instances_group_lookups(self):
+        # One DescribeSecurityGroups and one DescribeSecurityGroupAttribute
+        # for the group shared by every instance.
+        self.add_instances(120)
+        with self.budget() as budget:
+            self.service_connection.get_all_instances()
+        counts = budget.counts()
+        self.assertEqual((counts['DescribeSecurityGroups'], counts['DescribeSecurityGroupAttribute']), (1, 1))
+
+    def test_get_all_instances_lookups(self):
+        # The disks of the region are paged through once, and the shared
+        # security group is described once.
+        instance_ids = self.add_instances(120)
+        for instance_id in instance_ids:
+            self.emulator.add('Disk', self.region, 'In_use', InstanceId=instance_id)
+        with self.budget(max_calls=pages(120) + pages(120) + 2):
+            instances = self.service_connection.get_all_instances()
+        self.assertTrue(all(len(instance.block_device_mapping) == 1 for instance in instances))
+
+    def test_get_volumes_by_ids(self):
+        ids = [self.emulator.add('Disk', self.region, 'Available', InstanceId='') for _ in range(250)]
+        with self.budget(max_calls=pages(250)):
+            volumes = self.service_connection.get_volumes_by_ids(ids + ids[:10])
+        self.assertEqual(len(volumes), 250)
+
+    def test_refresh(self):
+        instances = self.service_connection.get_all_instances(instance_ids=self.add_instances(150),
+                                                              fields=['id', 'status'])
+        with self.budget(max_calls=pages(150)):
+            self.assertEqual(self.service_connection.refresh(instances, fields=['status']), [])
+
+    def test_attach_disks(self):
+        instance_id = self.add_instances(1)[0]
+        pairs = [(self.emulator.add('Disk', self.region, 'Available', InstanceId=''), instance_id)
+                 for _ in range(50)]
+        with self.budget(max_calls=50 + 2, max_sleep=5):
+            self.assertTrue(self.service_connection.attach_disks(pairs))
+
+    def test_create_instance(self):
+        group_id = self.emulator.add('SecurityGroup', self.region, 'Available')
+        with self.budget(max_calls=8, max_sleep=15):
+            self.service_connection.create_instance('ubuntu', 'ecs.n4.small', group_id=group_id, count=1)
+
+    def test_terminate_instances(self):
+        ids = self.add_instances(5, status='Stopped')
+        with self.budget(max_calls=2 * 5, max_sleep=0):
+            self.assertEqual(self.service_connection.terminate_instances(ids), ids)
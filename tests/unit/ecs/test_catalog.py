@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+import os
+import shutil
+import tempfile
+import time
+
+from footmark.ecs.catalog import CatalogStore
+from footmark.ecs.connection import ECSConnection
+from tests.compat import mock
+from tests.unit import ACSMockServiceTestCase
+
+DESCRIBE_ZONES = '''
+{
+  "RequestId": "%s",
+  "Zones": {
+    "Zone": [
+      {
+        "ZoneId": "cn-beijing-a",
+        "LocalName": "Beijing Zone A",
+        "AvailableInstanceTypes": {"InstanceTypes": ["ecs.n4.small", "ecs.n4.large"]}
+      },
+      {
+        "ZoneId": "cn-beijing-b",
+        "LocalName": "Beijing Zone B",
+        "AvailableInstanceTypes": {"InstanceTypes": ["ecs.n4.small"]}
+      }
+    ]
+  }
+}
+'''
+
+DESCRIBE_INSTANCE_TYPES = '''
+{
+  "RequestId": "9C0E1EA0-8D4C-4E33-AB6B-0E7A0F6A3A45",
+  "InstanceTypes": {
+    "InstanceType": [
+      {"InstanceTypeId": "ecs.n4.small", "CpuCoreCount": 1, "MemorySize": 2.0, "InstanceTypeFamily": "ecs.n4"},
+      {"InstanceTypeId": "ecs.n4.large", "CpuCoreCount": 2, "MemorySize": 4.0, "InstanceTypeFamily": "ecs.n4"},
+      {"InstanceTypeId": "ecs.sn1.medium", "CpuCoreCount": 2, "MemorySize": 4.0, "InstanceTypeFamily": "ecs.sn1"}
+    ]
+  }
+}
+'''
+
+
+class TestCatalogStore(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestCatalogStore, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.service_connection.catalog = CatalogStore(path=self.path, ttl=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        super(TestCatalogStore, self).tearDown()
+
+    def default_body(self):
+        return DESCRIBE_ZONES % 'E4F6B7C1-1A2B-4C3D-9E8F-0A1B2C3D4E5F'
+
+    def cache_dir(self):
+        region_dir = os.path.join(self.path, 'cn-hangzhou')
+        account, = os.listdir(region_dir)
+        return os.path.join(region_dir, account)
+
+    def test_describe_zones_uses_cache(self):
+        self.service_connection.make_request.return_value = self.default_body()
+        zones = self.service_connection.describe_zones()
+        self.assertEqual([zone.id for zone in zones], ['cn-beijing-a', 'cn-beijing-b'])
+        self.assertEqual(zones[0].available_instance_types, {'instance_types': ['ecs.n4.small', 'ecs.n4.large']})
+
+        zones = self.service_connection.describe_zones(zone_id='cn-beijing-b')
+        self.assertEqual(len(zones), 1)
+        self.assertEqual(zones[0].local_name, 'Beijing Zone B')
+        self.assertEqual(self.service_connection.describe_zones(zone_id='cn-beijing-z'), [])
+        self.assertEqual(self.service_connection.make_request.call_count, 1)
+
+    def test_persisted_across_stores(self):
+        self.service_connection.make_request.return_value = self.default_body()
+        self.service_connection.describe_zones()
+
+        self.service_connection.catalog = CatalogStore(path=self.path, ttl=60)
+        zone = self.service_connection.catalog.lookup(self.service_connection, 'zones', 'cn-beijing-a')
+        self.assertEqual(zone.id, 'cn-beijing-a')
+        self.assertEqual(self.service_connection.make_request.call_count, 1)
+
+    def test_revalidate_unchanged_listing(self):
+        self.service_connection.make_request.return_value = self.default_body()
+        catalog = self.service_connection.catalog
+        catalog.entry(self.service_connection, 'zones')
+        items_file = os.path.join(self.cache_dir(), 'zones.json')
+        mtime = os.path.getmtime(items_file)
+
+        # A new request id does not change the listing digest.
+        catalog.ttl = 0
+        time.sleep(0.01)
+        self.service_connection.make_request.return_value = DESCRIBE_ZONES % 'another-request-id'
+        entry = catalog.entry(self.service_connection, 'zones')
+        self.assertEqual(self.service_connection.make_request.call_count, 2)
+        self.assertEqual(os.path.getmtime(items_file), mtime)
+        self.assertEqual(len(entry.items), 2)
+
+    def test_rewrite_without_overwriting_rename(self):
+        self.service_connection.make_request.return_value = self.default_body()
+        catalog = self.service_connection.catalog
+        catalog.entry(self.service_connection, 'zones')
+
+        # Like os.rename on Windows.
+        original_rename = os.rename
+
+        def rename(src, dst):
+            if os.path.exists(dst):
+                raise OSError(17, 'File exists')
+            original_rename(src, dst)
+        catalog.ttl = 0
+        with mock.patch('os.name', 'nt'), mock.patch('os.rename', rename):
+            entry = catalog.entry(self.service_connection, 'zones')
+        self.assertEqual(len(entry.items), 2)
+        self.assertEqual(sorted(os.listdir(self.cache_dir())), ['zones.json', 'zones.meta'])
+
+    def test_separate_accounts(self):
+        self.service_connection.make_request.return_value = self.default_body()
+        self.service_connection.describe_zones()
+
+        other = self.create_service_connection(acs_access_key_id='other_access_key_id',
+                                               acs_secret_access_key='acs_secret_access_key')
+        other.make_request = mock.Mock(return_value=self.default_body())
+        other.catalog = self.service_connection.catalog
+        other.describe_zones()
+        other.describe_zones()
+        self.assertEqual(other.make_request.call_count, 1)
+        self.assertEqual(len(os.listdir(os.path.join(self.path, 'cn-hangzhou'))), 2)
+
+        self.service_connection.catalog.invalidate('cn-hangzhou', 'zones')
+        other.describe_zones()
+        self.service_connection.describe_zones()
+        self.assertEqual(other.make_request.call_count, 2)
+        self.assertEqual(self.service_connection.make_request.call_count, 2)
+
+    def test_describe_instance_types_by_family(self):
+        self.service_connection.make_request.return_value = DESCRIBE_INSTANCE_TYPES
+        types = self.service_connection.describe_instance_types(instance_type_family='ecs.n4')
+        self.assertEqual([t.id for t in types], ['ecs.n4.small', 'ecs.n4.large'])
+        self.service_connection.catalog.invalidate()
+        self.service_connection.describe_instance_types()
+        self.assertEqual(self.service_connection.make_request.call_count, 2)
+
+    def test_projected_instance_types_by_family(self):
+        self.service_connection.make_request.return_value = DESCRIBE_INSTANCE_TYPES
+        types = self.service_connection.describe_instance_types(instance_type_family='ecs.n4', fields=['cpu_core_count'])
+        self.assertEqual([(t.id, t.cpu_core_count) for t in types], [('ecs.n4.small', 1), ('ecs.n4.large', 2)])
+        self.assertRaises(AttributeError, getattr, types[0], 'memory_size')
+        self.service_connection.make_request.return_value = self.default_body()
+        zone = self.service_connection.describe_zones(zone_id='cn-beijing-b', fields=['zone_id'])[0]
+        self.assertRaises(AttributeError, getattr, zone, 'local_name')
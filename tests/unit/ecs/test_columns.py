@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+import json
+import math
+
+from footmark import columns
+from footmark.columns import build_columns
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.volume import Disk
+from tests.compat import mock
+from tests.unit import ACSMockServiceTestCase
+from tests.unit.fixtures import describe_disks_body
+
+
+class TestColumns(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestColumns, self).setUp()
+        self.disk_ids = ['d-%03d' % i for i in range(250)]
+        self.service_connection.make_request.side_effect = self.describe_disks
+
+    def describe_disks(self, action, params=None):
+        if 'set_DiskIds' in params:
+            ids = json.loads(params['set_DiskIds'])
+        else:
+            page_size, page_number = int(params['set_PageSize']), int(params['set_PageNumber'])
+            ids = self.disk_ids[(page_number - 1) * page_size:page_number * page_size]
+        return describe_disks_body(ids)
+
+    def test_paged_columns(self):
+        result = self.service_connection.get_all_volumes(as_columns=True, fields=['disk_id', 'size', 'zone_id'])
+        self.assertEqual(result.size, 250)
+        self.assertEqual(sorted(result), ['disk_id', 'size', 'zone_id'])
+        self.assertEqual(list(result['disk_id'][:2]), ['d-000', 'd-001'])
+        self.assertEqual(sum(result['size']), 40 * 250)
+        self.assertTrue(result['zone_id'][0] is result['zone_id'][249])
+        self.assertEqual(self.service_connection.make_request.call_count, 3)
+
+        pages = list(self.service_connection.iter_paged_list(
+            'DescribeDisks', {'set_PageSize': '100'}, ['Disks', Disk], 100, as_columns=True))
+        self.assertEqual([page.size for page in pages], [100, 100, 50])
+        self.assertEqual(pages[0]['status'][0], 'Available')
+
+    def test_columns_by_ids(self):
+        result = self.service_connection.get_all_volumes(volume_ids=self.disk_ids[:150], as_columns=True)
+        self.assertEqual(result.size, 150)
+        self.assertEqual(sorted(result['disk_id']), self.disk_ids[:150])
+
+    def test_types_without_numpy(self):
+        rows = [{'size': 40, 'iops': 1.5, 'portable': True, 'name': 'a'},
+                {'size': 20, 'portable': False, 'tags': {'tag': []}}]
+        with mock.patch.object(columns, 'numpy', None):
+            result = build_columns(rows)
+        self.assertEqual(result['size'].typecode, columns.Int64Code)
+        self.assertEqual(result['iops'][0], 1.5)
+        self.assertTrue(math.isnan(result['iops'][1]))
+        self.assertEqual(list(result['portable']), [1, 0])
+        self.assertEqual(result['name'], ['a', None])
+        self.assertEqual(result['tags'], [None, {'tag': []}])
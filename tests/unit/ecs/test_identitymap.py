@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+import gc
+import json
+
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.volume import Disk
+from footmark.identitymap import IdentityMap
+from tests.unit import ACSMockServiceTestCase
+from tests.unit.fixtures import describe_disks_body
+
+
+class TestIdentityMap(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def create_service_connection(self, **kwargs):
+        return ECSConnection(identity_map=True, **kwargs)
+
+    def setUp(self):
+        super(TestIdentityMap, self).setUp()
+        self.status = 'Available'
+        self.service_connection.make_request.side_effect = \
+            lambda action, params=None: describe_disks_body(json.loads(params['set_DiskIds']), status=self.status)
+
+    def test_describe_updates_live_objects(self):
+        first = self.service_connection.get_volumes_by_ids(['d-1', 'd-2'])
+        self.status = 'In_use'
+        second = self.service_connection.get_volumes_by_ids(['d-2', 'd-1'])
+
+        self.assertTrue(first['d-1'] is second['d-1'])
+        self.assertEqual(first['d-1'].status, 'in_use')
+        disks = self.service_connection.get_all_volumes(volume_ids=['d-2'])
+        self.assertTrue(disks[0] is first['d-2'])
+        self.assertEqual(len(self.service_connection.identity_map), 2)
+
+    def test_weak_references(self):
+        disks = self.service_connection.get_volumes_by_ids(['d-1', 'd-2'])
+        kept = disks['d-1']
+        del disks
+        gc.collect()
+        self.assertEqual(len(self.service_connection.identity_map), 1)
+        self.assertTrue(self.service_connection.identity_map.get(Disk, 'd-1') is kept)
+
+        self.service_connection.identity_map.discard(kept)
+        self.assertEqual(len(self.service_connection.identity_map), 0)
+
+    def test_shared_and_disabled(self):
+        shared = IdentityMap()
+        one = ECSConnection(acs_access_key_id='a', acs_secret_access_key='b', identity_map=shared)
+        two = ECSConnection(acs_access_key_id='a', acs_secret_access_key='b', identity_map=shared)
+        self.assertTrue(one.build_element(Disk, {'disk_id': 'd-1'}) is two.build_element(Disk, {'disk_id': 'd-1'}))
+
+        plain = ECSConnection(acs_access_key_id='a', acs_secret_access_key='b')
+        self.assertEqual(plain.identity_map, None)
+        self.assertFalse(plain.build_element(Disk, {'disk_id': 'd-1'}) is plain.build_element(Disk, {'disk_id': 'd-1'}))
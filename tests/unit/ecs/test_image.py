@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+import json
+
+from aliyunsdkcore.acs_exception.exceptions import ServerException
+from footmark.ecs.connection import ECSConnection
+from tests.unit import ACSMockServiceTestCase
+
+
+def describe_images_body(images):
+    return json.dumps({
+        "RequestId": "5F1C5E1D-2B5E-4A7D-9C3B-1E2F3A4B5C6D",
+        "TotalCount": len(images),
+        "Images": {"Image": [{
+            "ImageId": image_id,
+            "ImageName": name,
+            "Status": "Available",
+            "Tags": {"Tag": [{"TagKey": k, "TagValue": v} for k, v in sorted(tags.items())]}
+        } for image_id, name, tags in images]}
+    })
+
+
+class TestImageCatalog(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestImageCatalog, self).setUp()
+        self.images = [('m-%03d' % i, 'web-%03d' % i, {'role': 'web' if i % 2 else 'db', 'env': 'prod'})
+                       for i in range(150)]
+        self.actions = []
+        self.service_connection.make_request.side_effect = self.fake_request
+
+    def fake_request(self, action, params=None):
+        self.actions.append(action)
+        if action == 'DescribeImages' and 'set_PageNumber' not in params:
+            return describe_images_body([image for image in self.images
+                                         if params.get('set_ImageId') == image[0] or
+                                         params.get('set_ImageName') == image[1]])
+        if action == 'DescribeImages':
+            size = int(params['set_PageSize'])
+            start = (int(params['set_PageNumber']) - 1) * size
+            return describe_images_body(self.images[start:start + size])
+        image_id = params['set_ImageId']
+        if image_id == 'm-003':
+            raise ServerException('IncorrectImageStatus', 'The image is in use.')
+        self.images = [image for image in self.images if image[0] != image_id]
+        return '{"RequestId": "8E2A9F7C-1B3D-4E5F-A6B7-C8D9E0F1A2B3"}'
+
+    def test_index_by_id_name_and_tag(self):
+        catalog = self.service_connection.images
+        self.assertEqual(catalog.get('m-042').name, 'web-042')
+        self.assertEqual(catalog.resolve('web-007'), 'm-007')
+        self.assertEqual(catalog.resolve('m-007'), 'm-007')
+        self.assertEqual(len(catalog.find(tags={'role': 'web', 'env': 'prod'})), 75)
+        self.assertEqual([image.id for image in catalog.find(name='web-008', tags={'role': 'db'})], ['m-008'])
+        self.assertEqual(catalog.find(name='web-008', tags={'role': 'web'}), [])
+        self.assertEqual(self.actions, ['DescribeImages', 'DescribeImages'])
+
+        # A miss is looked up by ID, then by name, and nothing is listed again.
+        self.assertEqual(catalog.resolve('nothing'), None)
+        self.assertEqual(self.actions.count('DescribeImages'), 4)
+
+    def test_resolve_image_created_after_listing(self):
+        catalog = self.service_connection.images
+        self.assertEqual(catalog.resolve('m-001'), 'm-001')
+        self.images.append(('m-900', 'late', {}))
+        self.assertEqual(catalog.resolve('late'), 'm-900')
+        self.assertEqual(catalog.resolve('m-900'), 'm-900')
+        self.assertEqual(catalog.get('m-900').name, 'late')
+        self.assertEqual(self.actions.count('DescribeImages'), 2 + 2)
+
+        changed, results = self.service_connection.delete_images(['m-900'])
+        self.assertTrue(changed)
+        self.assertEqual(results, [True])
+
+    def test_delete_images(self):
+        changed, results = self.service_connection.delete_images(['m-001', 'web-002', 'm-003', 'm-missing'])
+        self.assertTrue(changed)
+        self.assertEqual(results[:2], [True, True])
+        self.assertEqual(results[2]['Error Code'], 'IncorrectImageStatus')
+        self.assertEqual(results[3]['Error Code'], 'Image does not exist')
+        self.assertEqual(self.actions.count('DescribeImages'), 2 + 2)
+        self.assertEqual(self.actions.count('DeleteImage'), 3)
+
+        # Deleted images are dropped from the index without listing again.
+        catalog = self.service_connection.images
+        self.assertEqual(catalog.get('m-001'), None)
+        self.assertEqual(len(catalog.find(tags={'role': 'web'})), 74)
+        self.assertEqual(self.actions.count('DescribeImages'), 4)
+
+        changed, results = self.service_connection.delete_image('m-001')
+        self.assertFalse(changed)
+        self.assertEqual(results[0]['Error Code'], 'Image does not exist')
+
+    def test_delete_image_looks_up_directly(self):
+        changed, results = self.service_connection.delete_image('m-005')
+        self.assertTrue(changed)
+        self.assertEqual(results, [True])
+        self.assertEqual(self.actions, ['DescribeImages', 'DeleteImage'])
+        self.assertIsNone(self.service_connection.images.loaded_at)
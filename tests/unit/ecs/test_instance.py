@@ -2,6 +2,7 @@
 # import sys
 # sys.path.append("../../..")
 from footmark.ecs.connection import ECSConnection
+from aliyunsdkcore.acs_exception.exceptions import ServerException
 from tests.unit import ACSMockServiceTestCase
 import json
 
@@ -864,13 +865,31 @@ class TestDeleteImage(ACSMockServiceTestCase):
         self.assertEqual(result[0][u'RequestId'], "EB62BD82-B468-4CDC-BF97-91C9A97996FA")
 
 
-
-
-
-
-
-
-
-
-
-
+class TestNonAsciiParams(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+    name = u'\u4e2d\u6587\u540d'
+
+    def param(self, params, label):
+        value = params['set_%s' % label]
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def test_build_list_params(self):
+        params = {}
+        self.service_connection.build_list_params(params, self.name, 'InstanceName')
+        self.service_connection.build_tags_params(params, {self.name: self.name + u'\u503c'}, max_tag_number=5)
+        self.assertEqual(self.param(params, 'InstanceName'), self.name)
+        self.assertEqual(self.param(params, 'Tag1Key'), self.name)
+        self.assertEqual(self.param(params, 'Tag1Value'), self.name + u'\u503c')
+
+    def test_non_ascii_error_message(self):
+        self.service_connection.make_request.side_effect = ServerException(
+            'InvalidInstanceName.Malformed', u'\u5b9e\u4f8b\u540d\u79f0\u65e0\u6548', 400, 'r-1')
+        params = {}
+        self.service_connection.build_list_params(params, self.name, 'InstanceName')
+        self.assertRaises(ServerException, self.service_connection.get_status, 'ModifyInstanceAttribute', params)
+
+    def test_non_ascii_status_body(self):
+        body = u'{"RequestId": "r-1", "InstanceName": "%s"}' % self.name
+        for response in (body, body.encode('utf-8')):
+            self.service_connection.make_request.return_value = response
+            self.assertTrue(self.service_connection.get_status('DescribeInstanceAttribute', {}))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+import json
+
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.instance import Instance
+from footmark.interning import Interner
+from tests.unit import ACSMockServiceTestCase
+
+
+def describe_instances_body(count):
+    return json.dumps({
+        "RequestId": "B6C3E1F2-7A8B-4C9D-8E0F-1A2B3C4D5E6F",
+        "TotalCount": count,
+        "Instances": {"Instance": [{
+            "InstanceId": "i-%03d" % i,
+            "RegionId": "cn-beijing",
+            "ZoneId": "cn-beijing-a",
+            "InstanceName": "web-%03d" % i,
+            "Status": "Running",
+            "Tags": {"Tag": [{"TagKey": "env", "TagValue": "prod"}]}
+        } for i in range(count)]}
+    })
+
+
+class TestInterning(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def create_service_connection(self, **kwargs):
+        return ECSConnection(interner=Interner(), **kwargs)
+
+    def setUp(self):
+        super(TestInterning, self).setUp()
+        self.service_connection.make_request.side_effect = \
+            lambda action, params=None: describe_instances_body(3)
+
+    def test_values_and_names_are_shared(self):
+        first, second, third = self.service_connection.get_list('DescribeInstances', {}, ['Instances', Instance])
+        self.assertTrue(first.zone_id is second.zone_id is third.zone_id)
+        self.assertTrue(first.region_id is third.region_id)
+        self.assertTrue(first.status is second.status)
+        self.assertTrue(list(first.tags)[0] is list(second.tags)[0])
+        self.assertFalse(first.instance_name is second.instance_name)
+
+        stats = self.service_connection.intern_stats()
+        self.assertTrue(stats['hits'] > 0)
+        self.assertTrue(stats['saved_bytes'] > 0)
+
+    def test_custom_fields(self):
+        self.service_connection.intern_fields = frozenset()
+        first, second = self.service_connection.get_list('DescribeInstances', {}, ['Instances', Instance])[:2]
+        self.assertFalse(first.zone_id is second.zone_id)
+        self.assertEqual(first.zone_id, second.zone_id)
+
+    def test_capped_table(self):
+        interner = Interner(max_entries=1)
+        self.assertEqual(interner.intern('a'), 'a')
+        value = ''.join(['b', 'c'])
+        self.assertTrue(interner.intern(value) is value)
+        self.assertEqual(interner.stats()['entries'], 1)
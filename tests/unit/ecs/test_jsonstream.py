@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+
+import six
+from aliyunsdkcore.acs_exception.exceptions import ServerException
+
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.volume import Disk
+from footmark.exception import ECSResponseError
+from footmark.jsonstream import iter_items
+from tests.compat import mock, unittest
+from tests.unit import ACSMockServiceTestCase
+from tests.unit.fixtures import describe_disks_body
+
+
+def chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestIterItems(unittest.TestCase):
+    body = json.dumps({
+        "RequestId": "r-1",
+        "Skipped": {"Disk": [{"DiskId": "d-x"}]},
+        "Disks": {"Disk": [{"DiskId": "d-1", "Size": 12345, "Name": u"磁盘"},
+                           {"DiskId": "d-2", "Size": 40, "Encrypted": False}]},
+        "TotalCount": 2,
+    }, ensure_ascii=False)
+
+    def test_chunked_sources(self):
+        expected = json.loads(self.body)['Disks']['Disk']
+        encoded = self.body.encode('utf-8')
+        for source in (self.body, encoded, chunks(self.body, 7), chunks(encoded, 5)):
+            self.assertEqual(list(iter_items(source, ['Disks', '*'])), expected)
+
+    def test_single_object_and_empty(self):
+        self.assertEqual(list(iter_items('{"Zones": {"Zone": {"ZoneId": "z"}}}', ['Zones', '*'])), [{'ZoneId': 'z'}])
+        self.assertEqual(list(iter_items('{"Zones": {"Zone": []}, "Other": {}}', ['Zones', '*'])), [])
+        self.assertRaises(ValueError, list, iter_items('{"Zones": {"Zone": [{"a": 1}', ['Zones', '*']))
+
+
+class TestStreamedList(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestStreamedList, self).setUp()
+        disk_ids = ['d-%03d' % i for i in range(150)]
+        self.service_connection.make_request.side_effect = lambda action, params=None: describe_disks_body(
+            disk_ids[(int(params['set_PageNumber']) - 1) * 100:int(params['set_PageNumber']) * 100])
+
+    def test_iter_paged_list(self):
+        disks = self.service_connection.iter_paged_list('DescribeDisks', {'set_PageSize': '100'}, ['Disks', Disk], 100)
+        first = next(disks)
+        self.assertTrue(isinstance(first, Disk))
+        self.assertEqual((first.id, first.status, first.size), ('d-000', 'available', 40))
+        self.assertEqual(self.service_connection.make_request.call_count, 1)
+        self.assertEqual(len(list(disks)), 149)
+        self.assertEqual(self.service_connection.make_request.call_count, 2)
+
+    def test_lazy_matches_list(self):
+        params = {'set_PageNumber': '1'}
+        streamed = self.service_connection.get_list('DescribeDisks', params, ['Disks', Disk], lazy=True)
+        listed = self.service_connection.get_list('DescribeDisks', params, ['Disks', Disk])
+        self.assertEqual([disk.to_dict() for disk in streamed], [disk.to_dict() for disk in listed])
+        with mock.patch('warnings.warn') as warn:
+            deprecated = self.service_connection.get_list('DescribeDisks', params, ['Disks', Disk], stream=True)
+            self.assertEqual([disk.id for disk in deprecated], [disk.id for disk in listed])
+        self.assertEqual(warn.call_args[0][1], DeprecationWarning)
+
+    def test_value_types_match_across_modes(self):
+        body = json.dumps({"Disks": {"Disk": [{"DiskId": "d-1", "DiskName": u"磁盘", "Status": "Available",
+                                               "Tags": {"Tag": [{"TagKey": "env", "TagValue": "prod"}]}}]}},
+                          ensure_ascii=False).encode('utf-8')
+        self.service_connection.make_request.side_effect = lambda action, params=None: body
+        fields = ['id', 'name', 'status']
+        modes = [self.service_connection.get_list('DescribeDisks', {}, ['Disks', Disk])[0],
+                 list(self.service_connection.get_list('DescribeDisks', {}, ['Disks', Disk], lazy=True))[0],
+                 self.service_connection.get_list('DescribeDisks', {}, ['Disks', Disk], fields=fields)[0]]
+        for disk in modes:
+            self.assertEqual((type(disk.id), type(disk.status)), (str, str))
+            self.assertEqual((type(disk.name), disk.name), (six.text_type, u"磁盘"))
+        columns = self.service_connection.get_list('DescribeDisks', {}, ['Disks', Disk], as_columns=True)
+        self.assertEqual(type(columns['disk_id'][0]), str)
+
+    def test_lazy_errors(self):
+        def iter_elements(markers, body, fields=None):
+            yield Disk()
+            raise ServerException('InternalError', 'The request processing has failed.')
+        params = {'set_PageNumber': '1'}
+        with mock.patch.object(self.service_connection, 'iter_elements', iter_elements):
+            disks = self.service_connection.get_list('DescribeDisks', params, ['Disks', Disk], lazy=True)
+            next(disks)
+            self.assertRaises(ECSResponseError, next, disks)
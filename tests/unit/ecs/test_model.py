@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+import pickle
+import weakref
+
+from footmark.ecs.instance import Instance
+from footmark.ecs.volume import Disk
+from footmark.vpc.eip import Eip
+from tests.compat import unittest
+
+
+class TestModel(unittest.TestCase):
+
+    def test_slots_and_aliases(self):
+        disk = Disk()
+        self.assertFalse(hasattr(disk, '__dict__'))
+        disk.id = 'd-1'
+        disk.volume_name = 'data'
+        disk.state = 'In_use'
+        self.assertEqual(disk.disk_id, 'd-1')
+        self.assertEqual(disk.name, 'data')
+        self.assertEqual(disk.volume_name, 'data')
+        self.assertEqual(disk.status, 'in_use')
+        self.assertTrue(weakref.ref(disk)() is disk)
+
+    def test_extra_fields_and_errors(self):
+        disk = Disk()
+        disk.encrypted_by = 'kms'
+        self.assertEqual(disk.encrypted_by, 'kms')
+        self.assertEqual(disk.to_dict()['encrypted_by'], 'kms')
+        self.assertRaises(AttributeError, getattr, disk, 'missing')
+        self.assertEqual(Eip().missing, None)
+
+    def test_converters_and_computed(self):
+        instance = Instance()
+        instance.tags = {'tag': [{'tag_key': 'env', 'tag_value': 'prod'}]}
+        instance.public_ip_address = {'ip_address': ['1.2.3.4']}
+        instance.vpc_attributes = {'vswitch_id': 'vsw-1', 'private_ip_address': {'ip_address': ['10.0.0.2']}}
+        self.assertEqual(instance.tags, {'env': 'prod'})
+        self.assertEqual(instance.public_ip, '1.2.3.4')
+        self.assertEqual(instance.vswitch_id, 'vsw-1')
+        self.assertEqual(instance.private_ip, '10.0.0.2')
+
+    def test_update_and_pickle(self):
+        stale, fresh = Disk(), Disk()
+        stale.id, stale.disk_name, stale.status = 'd-1', 'old', 'creating'
+        fresh.id, fresh.disk_name, fresh.status = 'd-1', 'new', 'Available'
+        stale._update(fresh, ['state'])
+        self.assertEqual((stale.name, stale.status), ('old', 'available'))
+
+        copy = pickle.loads(pickle.dumps(stale))
+        self.assertEqual(copy.to_dict(), stale.to_dict())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+import json
+
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.instance import Instance
+from tests.compat import mock
+from tests.unit import ACSMockServiceTestCase
+from tests.unit.fixtures import describe_disks_body
+
+
+class TestProjection(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestProjection, self).setUp()
+        self.service_connection.make_request.side_effect = self.fake_request
+
+    def fake_request(self, action, params=None):
+        if action == 'DescribeDisks':
+            return describe_disks_body(json.loads(params['set_DiskIds']), status='In_use')
+        return json.dumps({
+            "RequestId": "B6C3E1F2-7A8B-4C9D-8E0F-1A2B3C4D5E6F",
+            "Instances": {"Instance": [{
+                "InstanceId": "i-%d" % i,
+                "Status": "Running",
+                "InstanceName": "web",
+                "VpcAttributes": {"VSwitchId": "vsw-1", "PrivateIpAddress": {"IpAddress": ["10.0.0.2"]}},
+                "Tags": {"Tag": [{"TagKey": "env", "TagValue": "prod"}]}
+            } for i in range(3)]}
+        })
+
+    def test_projected_objects(self):
+        with mock.patch.object(self.service_connection, 'parse_value',
+                               wraps=self.service_connection.parse_value) as parse_value:
+            instances = self.service_connection.describe_instances(fields=['state', 'tags'])
+        self.assertEqual(len(instances), 3)
+        self.assertEqual(sorted(instances[0].to_dict()), ['instance_id', 'region', 'status', 'tags'])
+        self.assertEqual((instances[0].id, instances[0].state, instances[0].tags), ('i-0', 'running', {'env': 'prod'}))
+        self.assertRaises(AttributeError, getattr, instances[0], 'instance_name')
+        # Only the Tags subtrees were normalized (dict, tag list and tag per
+        # instance); the VpcAttributes subtrees were dropped as they were.
+        self.assertEqual(parse_value.call_count, 9)
+
+    def test_projected_columns_and_polls(self):
+        columns = self.service_connection.get_list('DescribeInstances', {}, ['Instances', Instance],
+                                                   as_columns=True, fields=['instance_id', 'status'])
+        self.assertEqual(sorted(columns), ['instance_id', 'status'])
+
+        disks = self.service_connection.get_volumes_by_ids(['d-1', 'd-2'], fields=['status'])
+        self.assertEqual(sorted(disks['d-1'].to_dict()), ['disk_id', 'region', 'status', 'tags'])
+        self.assertTrue(self.service_connection.wait_for_disks_status(['d-1', 'd-2'], 'In_use'))
+
+
+class TestProjectedListings(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def default_body(self):
+        return json.dumps({
+            "RequestId": "C1D2E3F4-5A6B-4C7D-8E9F-0A1B2C3D4E5F",
+            "SecurityGroups": {"SecurityGroup": [{
+                "SecurityGroupId": "sg-%d" % i,
+                "SecurityGroupName": "web",
+                "VpcId": "vpc-1"
+            } for i in range(2)]}
+        })
+
+    def test_security_groups_without_rules(self):
+        self.service_connection.make_request.return_value = self.default_body()
+        groups = self.service_connection.get_all_security_groups(fields=['name'])
+        self.assertEqual([(g.id, g.name) for g in groups], [('sg-0', 'web'), ('sg-1', 'web')])
+        self.assertRaises(AttributeError, getattr, groups[0], 'vpc_id')
+        # No DescribeSecurityGroupAttribute per group without the rules.
+        self.assertEqual(self.service_connection.make_request.call_count, 1)
+
+    def test_zones(self):
+        self.service_connection.make_request.return_value = json.dumps({
+            "RequestId": "C1D2E3F4-5A6B-4C7D-8E9F-0A1B2C3D4E5F",
+            "Zones": {"Zone": [{"ZoneId": "cn-hangzhou-b", "LocalName": "Hangzhou Zone B",
+                                "AvailableDiskCategories": {"DiskCategories": ["cloud"]}}]}
+        })
+        zones = self.service_connection.describe_zones(fields=['local_name'])
+        self.assertEqual(sorted(zones[0].to_dict()), ['local_name', 'region', 'tags', 'zone_id'])
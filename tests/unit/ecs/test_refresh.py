@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+import json
+
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.instance import Instance
+from footmark.ecs.volume import Disk
+from footmark.exception import FootmarkClientError
+from tests.unit import ACSMockServiceTestCase
+from tests.unit.fixtures import describe_disks_body
+
+
+class TestRefresh(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestRefresh, self).setUp()
+        self.instances = dict(('i-%03d' % i, 'Running') for i in range(250))
+        self.service_connection.make_request.side_effect = self.fake_request
+
+    def fake_request(self, action, params=None):
+        if action == 'DescribeDisks':
+            return describe_disks_body(json.loads(params['set_DiskIds']), status='In_use')
+        ids = [i for i in json.loads(params['set_InstanceIds']) if i in self.instances]
+        return json.dumps({
+            "RequestId": "B6C3E1F2-7A8B-4C9D-8E0F-1A2B3C4D5E6F",
+            "TotalCount": len(ids),
+            "Instances": {"Instance": [{"InstanceId": i, "Status": self.instances[i], "InstanceName": "web",
+                                        "Cpu": 2, "Memory": 4096} for i in ids]}
+        })
+
+    def build_instance(self, instance_id):
+        instance = Instance(self.service_connection)
+        instance.id = instance_id
+        instance.status = 'Pending'
+        instance.instance_name = 'stale'
+        return instance
+
+    def test_refresh_in_batches(self):
+        instances = [self.build_instance('i-%03d' % i) for i in range(250)]
+        instances.append(self.build_instance('i-gone'))
+        disk = Disk(self.service_connection)
+        disk.id = 'd-1'
+        disk.status = 'Available'
+
+        missing = self.service_connection.refresh(instances + [disk])
+        self.assertEqual([obj.id for obj in missing], ['i-gone'])
+        self.assertEqual(instances[42].status, 'running')
+        self.assertEqual(instances[42].instance_name, 'web')
+        self.assertEqual(instances[42].memory, 4096)
+        self.assertEqual(disk.status, 'in_use')
+        self.assertEqual(self.service_connection.make_request.call_count, 4)
+
+    def test_refresh_fields(self):
+        instance = self.build_instance('i-001')
+        self.instances['i-001'] = 'Stopped'
+        self.service_connection.refresh([instance], fields=['status'])
+        self.assertEqual(instance.status, 'stopped')
+        self.assertEqual(instance.instance_name, 'stale')
+        self.assertFalse(hasattr(instance, 'memory'))
+
+    def test_update(self):
+        instance = self.build_instance('i-002')
+        self.assertEqual(instance.update(), 'running')
+        self.assertEqual(self.service_connection.make_request.call_args[0][0], 'DescribeInstances')
+        self.assertRaises(ValueError, self.build_instance('i-gone').update, validate=True)
+        self.assertRaises(FootmarkClientError, self.service_connection.refresh, [object()])
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+import json
+
+from footmark.ecs.connection import ECSConnection
+from footmark.resultset import ResultSet
+from footmark.utils import run_concurrently
+from tests.unit import ACSMockServiceTestCase
+
+
+class TestResultSet(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestResultSet, self).setUp()
+        self.service_connection.make_request.side_effect = lambda action, params=None: json.dumps({
+            "RequestId": "request-%s" % params['set_SecurityGroupName'],
+            "SecurityGroupId": "sg-%s" % params['set_SecurityGroupName'],
+            "QuotaLeft": 3,
+        })
+
+    def create(self, name):
+        return self.service_connection.get_object('CreateSecurityGroup', {'set_SecurityGroupName': name}, ResultSet)
+
+    def test_per_call_objects(self):
+        names = [str(i) for i in range(20)]
+        results = run_concurrently(self.create, names, max_workers=4)
+        for name, result in zip(names, results):
+            self.assertEqual(result.id, 'request-%s' % name)
+            self.assertEqual(result.security_group_id, 'sg-%s' % name)
+        self.assertFalse('quota_left' in vars(ResultSet))
+        self.assertFalse(hasattr(results[0], '__dict__'))
+
+    def test_view(self):
+        result = self.create('web')
+        view = result.view()
+        self.assertEqual(view['security_group_id'], 'sg-web')
+        self.assertEqual(view['quota_left'], 3)
+        self.assertEqual(dict(view), {'request_id': 'request-web', 'security_group_id': 'sg-web', 'quota_left': 3})
+        self.assertRaises(KeyError, view.__getitem__, 'vpc_id')
+        result.vpc_id = 'vpc-1'
+        self.assertEqual(view.get('vpc_id'), 'vpc-1')
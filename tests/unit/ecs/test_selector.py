@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+from footmark.ecs.catalog import CatalogStore
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs import selector
+from footmark.exception import FootmarkClientError
+from tests.compat import unittest
+from tests.unit import ACSMockServiceTestCase
+
+DESCRIBE_INSTANCE_TYPES = '''
+{
+  "RequestId": "9C0E1EA0-8D4C-4E33-AB6B-0E7A0F6A3A45",
+  "InstanceTypes": {
+    "InstanceType": [
+      {"InstanceTypeId": "ecs.n4.small", "CpuCoreCount": 1, "MemorySize": 2.0, "InstanceTypeFamily": "ecs.n4"},
+      {"InstanceTypeId": "ecs.n4.large", "CpuCoreCount": 2, "MemorySize": 4.0, "InstanceTypeFamily": "ecs.n4"},
+      {"InstanceTypeId": "ecs.n4.xlarge", "CpuCoreCount": 4, "MemorySize": 8.0, "InstanceTypeFamily": "ecs.n4"},
+      {"InstanceTypeId": "ecs.sn1.medium", "CpuCoreCount": 2, "MemorySize": 4.0, "InstanceTypeFamily": "ecs.sn1"},
+      {"InstanceTypeId": "ecs.t1.small", "CpuCoreCount": 1, "MemorySize": 1.0, "InstanceTypeFamily": "ecs.t1"}
+    ]
+  }
+}
+'''
+
+DESCRIBE_INSTANCE_TYPE_FAMILIES = '''
+{
+  "RequestId": "2D1E0C8B-4E0E-4F4F-9A6C-3C8D5D1A6E11",
+  "InstanceTypeFamilies": {
+    "InstanceTypeFamily": [
+      {"InstanceTypeFamilyId": "ecs.n4", "Generation": "ecs-3"},
+      {"InstanceTypeFamilyId": "ecs.sn1", "Generation": "ecs-2"},
+      {"InstanceTypeFamilyId": "ecs.t1", "Generation": "ecs-1"}
+    ]
+  }
+}
+'''
+
+DESCRIBE_ZONES = '''
+{
+  "RequestId": "E4F6B7C1-1A2B-4C3D-9E8F-0A1B2C3D4E5F",
+  "Zones": {
+    "Zone": [
+      {"ZoneId": "cn-beijing-a", "AvailableInstanceTypes": {"InstanceTypes": ["ecs.n4.small", "ecs.n4.large"]}},
+      {"ZoneId": "cn-beijing-b", "AvailableInstanceTypes": {"InstanceTypes": ["ecs.n4.large", "ecs.sn1.medium"]}}
+    ]
+  }
+}
+'''
+
+
+@unittest.skipIf(selector.numpy is None, 'numpy is not installed')
+class TestInstanceTypeSelector(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestInstanceTypeSelector, self).setUp()
+        bodies = {
+            'DescribeInstanceTypes': DESCRIBE_INSTANCE_TYPES,
+            'DescribeInstanceTypeFamilies': DESCRIBE_INSTANCE_TYPE_FAMILIES,
+            'DescribeZones': DESCRIBE_ZONES,
+        }
+        self.service_connection.make_request.side_effect = lambda action, params=None: bodies[action]
+        self.selector = selector.InstanceTypeSelector(self.service_connection, CatalogStore(persistent=False))
+
+    def test_constraints(self):
+        result = self.selector.select(cpu_core_count__ge=2, memory_size__le=4)
+        self.assertEqual([r[0] for r in result], ['ecs.n4.large', 'ecs.sn1.medium'])
+
+        result = self.selector.select(generation='ecs-3', instance_type_family__in=['ecs.n4', 'ecs.t1'])
+        self.assertEqual([r[0] for r in result], ['ecs.n4.small', 'ecs.n4.large', 'ecs.n4.xlarge'])
+
+        result = self.selector.select(memory_size__between=(2, 4), instance_type_family__ne='ecs.sn1')
+        self.assertEqual([r[0] for r in result], ['ecs.n4.small', 'ecs.n4.large'])
+        self.assertEqual(self.service_connection.make_request.call_count, 3)
+
+    def test_rank_by_cost(self):
+        prices = {'ecs.n4.large': 0.5, 'ecs.sn1.medium': 0.3, 'ecs.n4.xlarge': 0.9}
+        result = self.selector.select(cost=prices, cpu_core_count__ge=2)
+        self.assertEqual([(r[0], r[2]) for r in result],
+                         [('ecs.sn1.medium', 0.3), ('ecs.n4.large', 0.5), ('ecs.n4.xlarge', 0.9)])
+
+        result = self.selector.select(cost=lambda columns: -columns['memory_size'], limit=1)
+        self.assertEqual(result[0][0], 'ecs.n4.xlarge')
+
+    def test_cross_zones(self):
+        result = self.selector.select(zone_ids=['cn-beijing-a', 'cn-beijing-b'], fit=(2, 4), cpu_core_count__ge=2)
+        self.assertEqual([r[:2] for r in result], [('ecs.n4.large', 'cn-beijing-a'),
+                                                   ('ecs.n4.large', 'cn-beijing-b'),
+                                                   ('ecs.sn1.medium', 'cn-beijing-b')])
+        self.assertEqual(self.selector.select(zone_ids='cn-beijing-a', instance_type_family='ecs.sn1'), [])
+
+    def test_unknown_column(self):
+        self.assertRaises(FootmarkClientError, self.selector.select, disk_size__ge=1)
+        self.assertRaises(FootmarkClientError, self.selector.select, generation__ge='ecs-2')
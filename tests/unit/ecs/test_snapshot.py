@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+import json
+
+from aliyunsdkcore.acs_exception.exceptions import ServerException
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.snapshot import SnapshotTracker
+from tests.compat import mock
+from tests.unit import ACSMockServiceTestCase
+
+
+def describe_snapshots_body(snapshots):
+    return json.dumps({
+        "RequestId": "D3F5A7B3-2E5C-4C5D-9B1F-7A2E3C4D5E6F",
+        "TotalCount": len(snapshots),
+        "PageNumber": 1,
+        "PageSize": 100,
+        "Snapshots": {"Snapshot": [{
+            "SnapshotId": snapshot_id,
+            "SnapshotName": snapshot_id,
+            "Status": "accomplished" if progress == 100 else status,
+            "Progress": "%d%%" % progress,
+            "SourceDiskId": "d-" + snapshot_id,
+            "Tags": {"Tag": []}
+        } for snapshot_id, status, progress in snapshots]}
+    })
+
+
+class TestSnapshotTracker(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestSnapshotTracker, self).setUp()
+        self.now = [1000.0]
+        # snapshot id -> (status, percent gained per second)
+        self.rates = {}
+        self.requests = []
+        self.service_connection.make_request.side_effect = self.describe_snapshots
+
+        patchers = [mock.patch('time.sleep', side_effect=self.sleep),
+                    mock.patch('time.time', side_effect=lambda: self.now[0])]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now[0] += seconds
+
+    def describe_snapshots(self, action, params=None):
+        ids = json.loads(params['set_SnapshotIds'])
+        self.requests.append(ids)
+        elapsed = self.now[0] - 1000.0
+        return describe_snapshots_body([(i, self.rates[i][0], min(100, int(elapsed * self.rates[i][1])))
+                                        for i in ids if i in self.rates])
+
+    def test_batched_polls_scheduled_by_eta(self):
+        self.rates = {'s-fast': ('progressing', 2.0), 's-slow': ('progressing', 1.0)}
+        progress = []
+        tracker = self.service_connection.track_snapshots(
+            ['s-slow', 's-fast', 's-slow'], callback=lambda s, eta: progress.append((s.id, s.percent, eta)))
+        self.assertTrue(tracker.wait(timeout=600))
+
+        # Every poll describes all pending snapshots at once.
+        self.assertEqual(self.requests[0], ['s-slow', 's-fast'])
+        self.assertEqual(self.requests[-1], ['s-slow'])
+        # One blind poll, then each poll lands on the next expected completion.
+        self.assertEqual(self.sleeps, [5, 45.0, 50.0])
+        self.assertEqual(self.now[0], 1100.0)
+        self.assertEqual(progress[-1], ('s-slow', 100, 0))
+        self.assertEqual(progress[2], ('s-slow', 5, 95.0))
+        self.assertEqual(sorted(tracker.completed), ['s-fast', 's-slow'])
+
+    def test_snapshot_not_listed_yet(self):
+        self.rates = {'s-old': ('progressing', 2.0)}
+
+        def describe_snapshots(action, params=None):
+            # s-new only shows up from the second poll on.
+            if self.requests:
+                self.rates['s-new'] = ('progressing', 2.0)
+            return self.describe_snapshots(action, params)
+        self.service_connection.make_request.side_effect = describe_snapshots
+
+        tracker = self.service_connection.track_snapshots(['s-old', 's-new'])
+        self.assertEqual(tracker.poll(), ['s-old', 's-new'])
+        self.assertEqual(tracker.missing, set())
+        self.assertTrue(tracker.wait(timeout=600))
+        self.assertEqual(sorted(tracker.completed), ['s-new', 's-old'])
+
+        tracker = SnapshotTracker(self.service_connection, ['s-gone'], missing_polls=2)
+        self.assertEqual(tracker.poll(), ['s-gone'])
+        self.assertEqual(tracker.poll(), [])
+        self.assertEqual(tracker.missing, set(['s-gone']))
+
+    def test_create_image_waits_for_all_snapshots(self):
+        self.rates = {'s-root': ('progressing', 2.0), 's-data': ('progressing', 1.0)}
+        calls = []
+
+        def fake_request(action, params=None):
+            calls.append(action)
+            if action == 'DescribeSnapshots':
+                return self.describe_snapshots(action, params)
+            return '{"RequestId": "D3F5A7B3-2E5C-4C5D-9B1F-7A2E3C4D5E6F", "ImageId": "m-1"}'
+        self.service_connection.make_request.side_effect = fake_request
+
+        self.service_connection.create_image(snapshot_id='s-root', image_name='img',
+                                             disk_mapping=[{'device': '/dev/xvdb', 'snapshot_id': 's-data'}])
+        self.assertEqual(self.requests[0], ['s-root', 's-data'])
+        self.assertEqual(calls[-1], 'CreateImage')
+        self.assertTrue(all(ids in (['s-root', 's-data'], ['s-data']) for ids in self.requests))
+
+    def test_get_snapshot_image_errors(self):
+        self.rates = {'s-bad': ('failed', 0.0)}
+        results, progress, changed = self.service_connection.get_snapshot_image('s-missing')
+        self.assertFalse(changed)
+        self.assertEqual(results[0]['Error Code'], 'Invalid.SnapshotId')
+
+        results, progress, changed = self.service_connection.get_snapshot_image('s-bad')
+        self.assertFalse(changed)
+        self.assertEqual(results[0]['Error Code'], 'Snapshot.Failed')
+
+        self.rates = {'s-stuck': ('progressing', 0.1)}
+        self.now[0] = 1000.0
+        results, progress, changed = self.service_connection.get_snapshots_image(['s-stuck'], timeout=50)
+        self.assertEqual((results, changed), ([], False))
+        self.assertEqual(progress, '5%')
+
+    def test_get_snapshots_image_timeout_with_unseen_snapshot(self):
+        self.rates = {'s-stuck': ('progressing', 0.1)}
+        results, progress, changed = self.service_connection.get_snapshots_image(['s-stuck', 's-unseen'],
+                                                                                 timeout=4)
+        self.assertFalse(changed)
+        self.assertEqual(progress, '0%')
+        self.assertEqual(results[0]['Error Code'], 'Invalid.SnapshotId')
+        self.assertIn('s-unseen', results[0]['Error Message'])
+
+
+class TestSnapshotInstances(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestSnapshotInstances, self).setUp()
+        # instance id -> [(disk id, device)]
+        self.instances = {}
+        self.requests = []
+        # disk id -> number of CreateSnapshot calls still throttled
+        self.throttled = {}
+        self.service_connection.make_request.side_effect = self.fake_request
+        patcher = mock.patch('time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fake_request(self, action, params=None):
+        self.requests.append((action, params))
+        if action == 'DescribeDisks':
+            disks = [{"DiskId": disk_id, "InstanceId": instance_id, "Device": device, "Status": "In_use"}
+                     for instance_id, devices in sorted(self.instances.items())
+                     if params.get('set_InstanceId') in (None, instance_id)
+                     for disk_id, device in devices]
+            size = int(params['set_PageSize'])
+            start = (int(params['set_PageNumber']) - 1) * size
+            return json.dumps({"RequestId": "r", "TotalCount": len(disks), "Disks": {"Disk": disks[start:start + size]}})
+        if action == 'CreateSnapshot':
+            disk_id = params['set_DiskId']
+            if self.throttled.get(disk_id):
+                self.throttled[disk_id] -= 1
+                raise ServerException('Throttling.User', 'Request was denied due to user flow control.')
+            if disk_id == 'd-broken':
+                raise ServerException('IncorrectDiskStatus', 'The current disk status does not support this operation.')
+            return json.dumps({"RequestId": "r", "SnapshotId": "s-" + disk_id})
+        ids = json.loads(params['set_SnapshotIds'])
+        return describe_snapshots_body([(i, 'accomplished', 100) for i in ids])
+
+    def test_snapshot_small_fleet(self):
+        self.instances = {'i-1': [('d-1a', '/dev/xvda'), ('d-1b', '/dev/xvdb')],
+                          'i-2': [('d-2a', '/dev/xvda'), ('d-broken', '/dev/xvdb')]}
+        self.throttled['d-1b'] = 1
+        tracker = self.service_connection.snapshot_instances(
+            ['i-1', 'i-2'], snapshot_name='backup-{instance_id}-{device}', snapshot_tags={'Backup': 'nightly'},
+            client_token='night-1')
+
+        self.assertEqual(sorted(tracker.snapshot_ids), ['s-d-1a', 's-d-1b', 's-d-2a'])
+        self.assertEqual(list(tracker.errors.keys()), ['d-broken'])
+        creates = dict((p['set_DiskId'], p) for action, p in self.requests if action == 'CreateSnapshot')
+        self.assertEqual(creates['d-1b']['set_SnapshotName'], 'backup-i-1-xvdb')
+        self.assertEqual(creates['d-1b']['set_ClientToken'], 'night-1-d-1b')
+        self.assertEqual((creates['d-2a']['set_Tag1Key'], creates['d-2a']['set_Tag1Value']), ('Backup', 'nightly'))
+        describes = [p for action, p in self.requests if action == 'DescribeDisks']
+        self.assertEqual(sorted(p['set_InstanceId'] for p in describes), ['i-1', 'i-2'])
+
+        self.assertFalse(tracker.wait())
+        self.assertEqual(sorted(tracker.completed), ['s-d-1a', 's-d-1b', 's-d-2a'])
+
+    def test_throttled_retries_back_off(self):
+        self.instances = {'i-1': [('d-1a', '/dev/xvda')], 'i-2': [('d-2a', '/dev/xvda')]}
+        self.throttled = {'d-1a': 3, 'd-2a': 4}
+        with mock.patch('random.random', return_value=1.0):
+            tracker = self.service_connection.snapshot_instances(['i-1', 'i-2'], rate=1000, max_workers=1)
+        self.assertEqual(tracker.snapshot_ids, ['s-d-1a'])
+        self.assertEqual(tracker.errors['d-2a'].error_code, 'Throttling.User')
+        self.assertEqual([c[0][0] for c in self.sleep.call_args_list], [1, 2, 4] * 2)
+
+    def test_snapshot_large_fleet_scans_region(self):
+        self.instances = dict(('i-%03d' % i, [('d-%03d' % i, '/dev/xvda')]) for i in range(150))
+        wanted = ['i-%03d' % i for i in range(0, 150, 2)]
+        tracker = self.service_connection.snapshot_instances(wanted, rate=1000)
+
+        # Two pages of the region's disks, grouped by instance client-side.
+        describes = [p for action, p in self.requests if action == 'DescribeDisks']
+        self.assertEqual([p['set_PageNumber'] for p in describes], ['1', '2'])
+        self.assertTrue(all('set_InstanceId' not in p for p in describes))
+        self.assertEqual(sorted(tracker.snapshot_ids), ['s-d-%03d' % i for i in range(0, 150, 2)])
+        self.assertEqual(len(tracker.snapshot_ids), 75)
+        self.assertTrue(tracker.wait())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+import json
+
+from aliyunsdkcore.acs_exception.exceptions import ServerException
+from footmark.ecs.connection import ECSConnection
+from tests.compat import mock
+from tests.unit import ACSMockServiceTestCase
+from tests.unit.fixtures import describe_disks_body
+
+
+class TestGetVolumesByIds(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestGetVolumesByIds, self).setUp()
+        self.missing = set(['d-missing'])
+
+        def describe_disks(action, params=None):
+            ids = [i for i in json.loads(params['set_DiskIds']) if i not in self.missing]
+            page_size = int(params['set_PageSize'])
+            start = (int(params['set_PageNumber']) - 1) * page_size
+            return describe_disks_body(ids[start:start + page_size])
+
+        self.service_connection.make_request.side_effect = describe_disks
+
+    def test_chunks_and_merges(self):
+        disk_ids = ['d-%04d' % i for i in range(250)]
+        volumes = self.service_connection.get_volumes_by_ids(disk_ids + ['d-missing', 'd-0001'])
+        self.assertEqual(len(volumes), 250)
+        self.assertEqual(volumes['d-0042'].id, 'd-0042')
+        self.assertEqual(volumes['d-0042'].status, 'available')
+        self.assertEqual(self.service_connection.make_request.call_count, 3)
+
+        chunk_sizes = sorted(len(json.loads(call[0][1]['set_DiskIds']))
+                             for call in self.service_connection.make_request.call_args_list)
+        self.assertEqual(chunk_sizes, [51, 100, 100])
+
+    def test_get_all_volumes_by_ids(self):
+        disks = self.service_connection.get_all_volumes(volume_ids=['d-2', 'd-missing', 'd-1'])
+        self.assertEqual([disk.id for disk in disks], ['d-2', 'd-1'])
+        params = self.service_connection.make_request.call_args[0][1]
+        self.assertEqual(json.loads(params['set_DiskIds']), ['d-2', 'd-missing', 'd-1'])
+        self.assertEqual(params['set_PageNumber'], '1')
+
+    def test_pages_within_chunk(self):
+        disk_ids = ['d-%04d' % i for i in range(150)]
+        volumes = self.service_connection.get_volumes_by_ids(disk_ids, chunk_size=150)
+        self.assertEqual(len(volumes), 150)
+        pages = [call[0][1]['set_PageNumber'] for call in self.service_connection.make_request.call_args_list]
+        self.assertEqual(pages, ['1', '2'])
+
+
+class TestBulkDiskOperations(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def setUp(self):
+        super(TestBulkDiskOperations, self).setUp()
+        self.disks = {}
+        self.transitions = {}
+        self.actions = []
+        self.service_connection.make_request.side_effect = self.fake_request
+        patcher = mock.patch('time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fake_request(self, action, params=None):
+        self.actions.append(action)
+        if action == 'DescribeDisks':
+            ids = [i for i in json.loads(params['set_DiskIds']) if i in self.disks]
+            body = describe_disks_body(ids, statuses=self.disks)
+            # Every describe moves transitional disks one step forward.
+            for disk_id, steps in self.transitions.items():
+                if steps and disk_id in self.disks:
+                    self.disks[disk_id] = steps.pop(0)
+                elif steps == [] and disk_id in self.disks and self.disks[disk_id] == 'Deleting':
+                    del self.disks[disk_id]
+            return body
+        disk_id = params['set_DiskId']
+        if action == 'AttachDisk':
+            self.disks[disk_id] = 'Attaching'
+        elif action == 'DetachDisk':
+            self.disks[disk_id] = 'Detaching'
+        elif action == 'DeleteDisk':
+            if disk_id not in self.disks:
+                raise ServerException('InvalidDiskId.NotFound', 'Disk not exist')
+            if self.disks[disk_id] == 'Creating':
+                self.disks[disk_id] = 'Available'
+                raise ServerException('IncorrectInstanceStatus.Initializing', 'Disk is initializing')
+            self.disks[disk_id] = 'Deleting'
+        return '{"RequestId": "AF3991A3-5203-4F83-8FAD-FDC1253AF15D"}'
+
+    def test_attach_disks(self):
+        pairs = [('d-%d' % i, 'i-%d' % i) for i in range(5)]
+        for disk_id, _ in pairs:
+            self.disks[disk_id] = 'Available'
+            self.transitions[disk_id] = ['In_use']
+        self.transitions['d-4'] = ['Attaching', 'In_use']
+
+        self.assertTrue(self.service_connection.attach_disks(pairs, delete_with_instance='yes', delay=8))
+        self.assertEqual(self.actions.count('AttachDisk'), 5)
+        self.assertEqual(self.actions.count('DescribeDisks'), 3)
+        # 1 of 5 disks pending and attaching: 8 * 1 / 5 / 2, floored at min_delay.
+        self.assertEqual([call[0][0] for call in self.sleep.call_args_list], [4.0, 1])
+
+    def test_detach_disk(self):
+        self.disks['d-1'] = 'In_use'
+        self.transitions['d-1'] = ['Available']
+        self.assertTrue(self.service_connection.detach_disk('d-1', 'i-1'))
+        self.assertEqual(self.actions, ['DetachDisk', 'DescribeDisks', 'DescribeDisks'])
+
+    def test_wait_timeout(self):
+        self.disks['d-1'] = 'Available'
+        self.assertRaises(Exception, self.service_connection.wait_for_disks_status,
+                          ['d-1'], 'in_use', delay=5, timeout=12)
+        self.assertEqual(self.actions.count('DescribeDisks'), 3)
+
+    def test_delete_disks(self):
+        self.disks.update({'d-1': 'Available', 'd-2': 'Creating'})
+        self.transitions.update({'d-1': [], 'd-2': []})
+        self.assertTrue(self.service_connection.delete_disks(['d-1', 'd-2', 'd-missing']))
+        # d-2 is retried once after it finished initializing.
+        self.assertEqual(self.actions.count('DeleteDisk'), 4)
+        self.assertEqual(self.actions.count('DescribeDisks'), 3)
+        self.assertEqual(self.disks, {})
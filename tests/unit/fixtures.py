@@ -0,0 +1,25 @@
+"""
+Response bodies shared by the unit tests of several modules.
+"""
+import json
+
+
+def describe_disks_body(disk_ids, status='Available', instance_id='', statuses=None):
+    disks = []
+    for disk_id in disk_ids:
+        disks.append({
+            "DiskId": disk_id,
+            "Status": (statuses or {}).get(disk_id, status),
+            "InstanceId": instance_id,
+            "ZoneId": "cn-beijing-b",
+            "Category": "cloud_efficiency",
+            "Size": 40,
+            "Tags": {"Tag": []}
+        })
+    return json.dumps({
+        "RequestId": "AF3991A3-5203-4F83-8FAD-FDC1253AF15D",
+        "TotalCount": len(disks),
+        "PageNumber": 1,
+        "PageSize": 100,
+        "Disks": {"Disk": disks}
+    })
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+import json
+import os
+import shutil
+import tempfile
+
+from tests.benchmarks.suite import compare, main, measure, python_version
+from tests.compat import mock, unittest
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_compare(self):
+        baseline = {
+            'parse': {'seconds': 1.0, 'calibration': 0.01},
+            'listing': {'seconds': 1.0, 'requests': 11, 'simulated': 3.5},
+            'tiny': {'seconds': 0.0001},
+            'oss': {'seconds': 1.0, 'throughput': 8.0},
+        }
+        results = {
+            'parse': {'seconds': 2.5, 'calibration': 0.02},
+            'listing': {'seconds': 1.2, 'requests': 12, 'simulated': 3.5},
+            'tiny': {'seconds': 0.0004},
+            'oss': {'seconds': 1.6, 'throughput': 5.0},
+            'new': {'seconds': 10.0},
+        }
+        self.assertEqual(compare(results, baseline, threshold=0.5),
+                         [('listing', 'requests', 11, 12), ('oss', 'seconds', 1.0, 1.6)])
+        self.assertEqual(compare(results, baseline, threshold=0.1),
+                         [('listing', 'requests', 11, 12), ('listing', 'seconds', 1.0, 1.2),
+                          ('oss', 'seconds', 1.0, 1.6), ('parse', 'seconds', 2.0, 2.5)])
+
+    def test_measure(self):
+        runs = []
+
+        def setup(size):
+            def run():
+                runs.append(size)
+                return {'requests': size}
+            return run
+
+        metrics = measure(setup, 3, repeat=2, memory=False)
+        self.assertEqual(metrics['requests'], 3)
+        self.assertGreaterEqual(len(runs), 2)
+
+    def test_missing_baseline(self):
+        path = os.path.join(os.path.dirname(__file__), 'no-such-baseline.json')
+        self.assertEqual(main(['--baseline', path, 'no-such-benchmark']), 2)
+
+    def test_benchmark_missing_from_baseline(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'baseline.json')
+            with open(path, 'w') as f:
+                json.dump({python_version(): {'parse': {'seconds': 1.0}}}, f)
+            results = {'parse': {'seconds': 1.0}}
+            with mock.patch('tests.benchmarks.suite.run_benchmarks', return_value=results):
+                self.assertEqual(main(['--baseline', path]), 0)
+                results['new'] = {'seconds': 1.0}
+                self.assertEqual(main(['--baseline', path]), 2)
+                results['parse'] = {'seconds': 2.0}
+                self.assertEqual(main(['--baseline', path]), 1)
+        finally:
+            shutil.rmtree(tmpdir)
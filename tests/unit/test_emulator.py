@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+from aliyunsdkcore.acs_exception.exceptions import ServerException
+
+from footmark.ecs.connection import ECSConnection
+from footmark.ecs.volume import Disk
+from footmark.emulator import Emulator, ManualClock
+from footmark.exception import FootmarkServerError
+from tests.compat import mock
+from tests.unit import ACSMockServiceTestCase
+
+
+class TestEmulator(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def initialize_service_connection(self):
+        self.clock = ManualClock()
+        self.emulator = Emulator(clock=self.clock)
+        patcher = mock.patch('time.sleep', self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service_connection.transport = self.emulator
+
+    def test_instance_lifecycle(self):
+        conn = self.service_connection
+        group_id = conn.create_security_group(group_name='web').id
+        instances = conn.create_instance('ubuntu', 'ecs.n4.small', group_id=group_id, instance_name='web-1',
+                                       count=1)
+        self.assertEqual([(i.name, i.status) for i in instances], [('web-1', 'running')])
+        self.assertEqual(self.emulator.calls['StartInstance'], 1)
+        self.assertGreater(self.emulator.calls['DescribeInstanceAttribute'], 2)
+        self.assertGreaterEqual(self.clock.now, 4)
+
+        instance_id = instances[0].id
+        self.assertEqual(conn.stop_instances(instance_id), [instance_id])
+        conn.wait_for_instance_status(instance_id, 'Stopped', delay=1)
+        self.assertEqual(conn.terminate_instances(instance_id), [instance_id])
+        self.assertIsNone(self.emulator.get('Instance', instance_id))
+
+    def test_incorrect_status(self):
+        instance_id = self.emulator.add('Instance', self.service_connection.region, 'Stopped', InstanceName='db')
+        with self.assertRaises(ServerException) as raised:
+            self.service_connection.get_status('StopInstance', {'set_InstanceId': instance_id})
+        self.assertEqual(raised.exception.get_error_code(), 'IncorrectInstanceStatus')
+        self.assertRaises(ServerException, self.service_connection.get_instance_details, 'i-missing')
+
+    def test_paging(self):
+        region = self.service_connection.region
+        ids = [self.emulator.add('Disk', region, 'Available', InstanceId='') for _ in range(25)]
+        self.emulator.add('Disk', 'other-region', 'Available')
+        disks = self.service_connection.get_paged_list('DescribeDisks', {'set_PageSize': 10},
+                                                       ['Disks', Disk], 10)
+        self.assertEqual(len(disks), 25)
+        self.assertEqual(self.emulator.calls['DescribeDisks'], 3)
+        volumes = self.service_connection.get_all_volumes(volume_ids=ids[:3])
+        self.assertEqual(sorted(v.id for v in volumes), sorted(ids[:3]))
+
+    def test_throttling_and_injected_errors(self):
+        self.emulator.throttle(2, action='DescribeDisks')
+        self.service_connection.get_all_volumes()
+        self.service_connection.get_all_volumes()
+        with self.assertRaises(FootmarkServerError) as raised:
+            self.service_connection.get_all_volumes()
+        self.assertEqual(raised.exception.error.get_error_code(), 'Throttling')
+        self.clock.sleep(1)
+        self.service_connection.get_all_volumes()
+
+        self.emulator.inject_error('DescribeZones', 'ServiceUnavailable', http_status=503, times=2)
+        for _ in range(2):
+            self.assertRaises(FootmarkServerError, self.service_connection.describe_zones)
+        self.assertEqual(len(self.service_connection.describe_zones()), 2)
+        self.assertEqual(self.emulator.calls['DescribeZones'], 3)
+
+    def test_injected_errors_on_same_action(self):
+        # The first rule never fires, so the second must.
+        self.emulator.inject_error('DescribeZones', 'Rare', probability=0.0)
+        self.emulator.inject_error('DescribeZones', 'ServiceUnavailable', http_status=503)
+        with self.assertRaises(FootmarkServerError) as raised:
+            self.service_connection.describe_zones()
+        self.assertEqual(raised.exception.error.get_error_code(), 'ServiceUnavailable')
+        self.assertEqual(len(self.service_connection.describe_zones()), 2)
@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+import subprocess
+import sys
+
+from tests.compat import unittest
+
+CHECK = """
+import sys
+import footmark
+import footmark.ecs.connection
+import footmark.vpc.connection
+import footmark.slb.connection
+import footmark.rds.connection
+import footmark.oss.bucket
+heavy = ['aliyunsdkcore.client', 'yaml', 'oss2', 'numpy', 'logging.config']
+print(','.join(name for name in heavy if name in sys.modules))
+print(footmark._logging_initialized)
+"""
+
+
+class TestImport(unittest.TestCase):
+
+    def test_import_is_side_effect_free(self):
+        output = subprocess.check_output([sys.executable, '-c', CHECK]).decode('utf-8').split('\n')
+        self.assertEqual(output[0], '')
+        self.assertEqual(output[1], 'False')
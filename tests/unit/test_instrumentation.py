@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+from aliyunsdkcore.acs_exception.exceptions import ClientException, ServerException
+
+from footmark.ecs.connection import ECSConnection
+from footmark.instrumentation import Instrumentation, LatencyHistogram
+from tests.compat import mock, unittest
+from tests.unit import ACSMockServiceTestCase
+
+
+class TestInstrumentation(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def initialize_service_connection(self):
+        # Requests go through make_request; only the SDK client is faked.
+        patcher = mock.patch('aliyunsdkcore.client.AcsClient.do_action_with_exception')
+        self.do_action = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_disabled_by_default(self):
+        self.do_action.return_value = '{"RequestId": "r-1"}'
+        with mock.patch.object(Instrumentation, 'start') as start:
+            self.service_connection.make_request('DescribeRegions')
+        self.assertFalse(start.called)
+
+    def test_stats_and_hooks(self):
+        calls = []
+        self.service_connection.instrumentation.add_hook(before=lambda call: calls.append(('before', call.action)),
+                                                         after=lambda call: calls.append(('after', call.error_code)))
+        unreachable = ClientException('SDK.ServerUnreachable', 'Unable to connect server: timed out')
+        self.do_action.side_effect = ['{"RequestId": "r-1"}', unreachable, '{"RequestId": "r-2"}',
+                                      ServerException('Throttling', 'Request was denied due to request throttling.')]
+        with mock.patch('time.sleep'):
+            self.service_connection.make_request('DescribeRegions')
+            self.service_connection.make_request('DescribeRegions')
+        self.assertRaises(ServerException, self.service_connection.get_status, 'DescribeRegions', {})
+
+        stats = self.service_connection.stats()[(self.service_connection.product, 'DescribeRegions', 'cn-hangzhou')]
+        self.assertEqual((stats['calls'], stats['errors'], stats['retries']), (3, 1, 1))
+        self.assertEqual(stats['error_codes'], {'Throttling': 1})
+        self.assertEqual(stats['latency']['count'], 3)
+        self.assertEqual(calls, [('before', 'DescribeRegions'), ('after', None)] * 2 +
+                         [('before', 'DescribeRegions'), ('after', 'Throttling')])
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in [0.003] * 90 + [0.3] * 9 + [120]:
+            histogram.add(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual((snapshot['count'], snapshot['min'], snapshot['max']), (100, 0.003, 120))
+        self.assertEqual((snapshot['p50'], snapshot['p90'], snapshot['p99']), (0.005, 0.005, 0.5))
+        self.assertEqual(snapshot['buckets'][-1], (float('inf'), 1))
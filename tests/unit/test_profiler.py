@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+import time
+
+import footmark
+from aliyunsdkcore.acs_exception.exceptions import ClientException
+from aliyunsdkcore.client import AcsClient
+
+from footmark.ecs.connection import ECSConnection
+from footmark.exception import FootmarkClientError
+from tests.compat import mock
+from tests.unit import ACSMockServiceTestCase
+from tests.unit.fixtures import describe_disks_body
+
+
+class TestProfiler(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def initialize_service_connection(self):
+        patcher = mock.patch.object(AcsClient, 'do_action_with_exception')
+        self.do_action = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_call_tree(self):
+        unreachable = ClientException('SDK.ServerUnreachable', 'Unable to connect server: timed out')
+        self.do_action.side_effect = [unreachable, describe_disks_body(['d-1', 'd-2'])]
+        original_sleep = mock.Mock()
+        with mock.patch('time.sleep', original_sleep):
+            with footmark.profile() as profiler:
+                disks = self.service_connection.get_all_volumes(volume_ids=['d-1', 'd-2'])
+                self.assertRaises(FootmarkClientError, footmark.profile().start)
+            self.assertTrue(self.service_connection.get_all_volumes.__func__ is ECSConnection.__dict__['get_all_volumes'])
+        self.assertEqual(len(disks), 2)
+        self.assertEqual(original_sleep.call_count, 1)
+
+        paths = dict((path, node) for path, node in profiler.walk())
+        get_parsed = ('all', 'ECSConnection.get_all_volumes', 'ECSConnection.get_volumes_by_ids',
+                      'ECSConnection.get_by_ids', 'ACSQueryConnection.get_paged_list', 'ACSQueryConnection.get_list',
+                      'ACSQueryConnection.get_parsed')
+        self.assertEqual(sorted(paths[get_parsed].children), ['parse', 'request DescribeDisks'])
+        self.assertEqual(paths[get_parsed + ('parse',)].children, {})
+        request = paths[get_parsed + ('request DescribeDisks',)]
+        self.assertEqual(request.calls, 1)
+        self.assertEqual(sorted(request.children), ['network', 'sleep'])
+        self.assertEqual(request.children['network'].calls, 2)
+        self.assertEqual(sorted(profiler.totals()), ['method', 'network', 'parse', 'request', 'sleep'])
+        for line in profiler.folded().splitlines():
+            stack, micros = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('all;ECSConnection.get_all_volumes'))
+            self.assertTrue(int(micros) > 0)
+
+    def test_threads_record_under_caller(self):
+        # The profiler's wrapper passes the client along with the request.
+        self.do_action.side_effect = lambda client, request: describe_disks_body(
+            [str(request.get_query_params()['DiskIds']).strip('["]')])
+        with footmark.profile() as profiler:
+            disks = self.service_connection.get_volumes_by_ids(['d-1', 'd-2', 'd-3'], chunk_size=1, max_workers=3)
+        self.assertEqual(sorted(disks), ['d-1', 'd-2', 'd-3'])
+
+        self.assertEqual(list(profiler.root.children), ['ECSConnection.get_volumes_by_ids'])
+        paths = dict((path, node) for path, node in profiler.walk())
+        get_by_ids = ('all', 'ECSConnection.get_volumes_by_ids', 'ECSConnection.get_by_ids')
+        self.assertEqual(paths[get_by_ids + ('ACSQueryConnection.get_paged_list',)].calls, 3)
+
+    def test_only_footmark_sleeps(self):
+        import footmark.connection
+
+        with mock.patch('time.sleep'):
+            with footmark.profile() as profiler:
+                time.sleep(1)
+                footmark.connection.time.sleep(2)
+        self.assertEqual(profiler.root.children['sleep'].calls, 1)
+        self.assertTrue(footmark.connection.time is time)
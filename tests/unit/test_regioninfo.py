@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+import json
+import os
+import shutil
+import tempfile
+
+from footmark import ecs, regioninfo
+from footmark.ecs.connection import ECSConnection
+from footmark.exception import FootmarkClientError
+from tests.compat import mock, unittest
+
+
+class TestEndpointRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.defaults = self.write('endpoints.json', {
+            'ecs': {'cn-hangzhou': 'ecs.aliyuncs.com', 'cn-beijing': 'ecs.aliyuncs.com'},
+            'slb': {'cn-hangzhou': 'slb.aliyuncs.com'},
+        })
+        self.registry = regioninfo.EndpointRegistry(self.defaults)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, data, mtime=1000):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_loads_once_and_reloads_on_change(self):
+        with mock.patch.object(regioninfo, 'load_endpoint_json', wraps=regioninfo.load_endpoint_json) as load:
+            snapshot = self.registry.snapshot()
+            self.assertTrue(self.registry.snapshot() is snapshot)
+            self.assertEqual(load.call_count, 1)
+            self.assertEqual(snapshot.regions('ecs'), ('cn-beijing', 'cn-hangzhou'))
+            self.assertEqual(snapshot.endpoint('slb', 'cn-hangzhou'), 'slb.aliyuncs.com')
+            self.assertEqual(snapshot.endpoint('slb', 'cn-beijing'), None)
+
+            self.write('endpoints.json', {'ecs': {'cn-shanghai': 'ecs.aliyuncs.com'}}, mtime=2000)
+            self.assertEqual(self.registry.snapshot().services, frozenset(['ecs']))
+            self.assertEqual(load.call_count, 2)
+
+    def test_user_endpoints(self):
+        additions = self.write('more.json', {'ecs': {'eu-central-1': 'ecs.eu-central-1.aliyuncs.com'}})
+        with mock.patch.dict(os.environ, {'FOOTMARK_ENDPOINTS': additions}):
+            snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot.regions('ecs'), ('cn-beijing', 'cn-hangzhou', 'eu-central-1'))
+        self.assertEqual(snapshot.regions('slb'), ('cn-hangzhou',))
+        self.assertFalse(self.registry.snapshot() is snapshot)
+
+    def test_service_lookups(self):
+        with mock.patch.object(regioninfo, 'default_registry', self.registry):
+            region = ecs.get_region('cn-beijing')
+            self.assertEqual((region.id, region.endpoint, region.connection_cls), ('cn-beijing', 'ecs.aliyuncs.com', ECSConnection))
+            self.assertEqual(ecs.get_region('cn-shenzhen'), None)
+            self.assertEqual([r.id for r in ecs.regions()], ['cn-beijing', 'cn-hangzhou'])
+            self.assertRaises(FootmarkClientError, regioninfo.get_regions, 'rds')
+
+    def test_service_lookup_arguments(self):
+        class ECSRegion(regioninfo.RegionInfo):
+            pass
+
+        with mock.patch.object(regioninfo, 'default_registry', self.registry):
+            region = ecs.get_region('cn-beijing', region_cls=ECSRegion)
+            self.assertTrue(isinstance(region, ECSRegion))
+            self.assertEqual(region.connection_cls, ECSConnection)
+            self.assertRaises(TypeError, ecs.get_region, 'cn-beijing', validate_certs=False)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+import json
+import os
+import shutil
+import tempfile
+
+from aliyunsdkcore.acs_exception.exceptions import ClientException, ServerException
+from aliyunsdkcore.client import AcsClient
+
+from footmark.ecs.connection import ECSConnection
+import footmark
+from footmark.exception import FootmarkClientError, FootmarkServerError
+from footmark.tracing import InMemoryExporter, JsonLinesExporter, Tracer, current_span
+from footmark.utils import run_concurrently
+from tests.compat import mock
+from tests.unit import ACSMockServiceTestCase
+from tests.unit.fixtures import describe_disks_body
+
+
+class TestTracing(ACSMockServiceTestCase):
+    connection_class = ECSConnection
+
+    def initialize_service_connection(self):
+        patcher = mock.patch.object(AcsClient, 'do_action_with_exception')
+        self.do_action = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.exporter = InMemoryExporter()
+
+    def test_request_spans(self):
+        unreachable = ClientException('SDK.ServerUnreachable', 'Unable to connect server: timed out')
+        self.do_action.side_effect = [unreachable, describe_disks_body(['d-1']),
+                                      ServerException('Forbidden.RAM', 'Not authorized', 403, 'r-403')]
+        with mock.patch('time.sleep'):
+            with Tracer(self.exporter) as tracer:
+                with tracer.span('playbook') as root:
+                    self.service_connection.get_all_volumes(volume_ids=['d-1'])
+                    self.assertRaises(FootmarkServerError, self.service_connection.get_all_volumes, volume_ids=['d-2'])
+        self.assertEqual(current_span(), None)
+
+        spans = dict((span.span_id, span) for span in self.exporter.spans)
+        self.assertEqual(set(span.trace_id for span in spans.values()), set([root.trace_id]))
+        requests = [span for span in self.exporter.spans if span.name == 'make_request']
+        self.assertEqual([(span.attributes['action'], span.attributes['retries'], span.attributes['outcome'])
+                          for span in requests], [('DescribeDisks', 1, 'ok'), ('DescribeDisks', 0, 'error')])
+        attempts = [span for span in self.exporter.spans if span.name == 'attempt']
+        self.assertEqual([(span.attributes['attempt'], span.attributes['outcome'], span.status) for span in attempts],
+                         [(0, 'error', 'error'), (1, 'ok', 'ok'), (0, 'error', 'error')])
+        self.assertEqual([span.attributes['request_id'] for span in attempts[1:]],
+                         ['AF3991A3-5203-4F83-8FAD-FDC1253AF15D', 'r-403'])
+
+        # Each request span descends from the get_all_volumes span of its call.
+        parent = spans[requests[0].parent_id]
+        while parent.name != 'ECSConnection.get_all_volumes':
+            parent = spans[parent.parent_id]
+        self.assertEqual((parent.parent_id, parent.attributes['region']), (root.span_id, 'cn-hangzhou'))
+        self.assertTrue(self.service_connection.get_all_volumes.__func__ is ECSConnection.__dict__['get_all_volumes'])
+
+    def test_thread_propagation_and_json_lines(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        exporter = JsonLinesExporter(os.path.join(tmpdir, 'spans.jsonl'))
+        tracer = Tracer(exporter)
+
+        def work(item):
+            with tracer.span('work', item=item):
+                return current_span().parent_id
+
+        with tracer.span('batch') as batch:
+            parents = run_concurrently(work, range(6), max_workers=3)
+        exporter.shutdown()
+        self.assertEqual(parents, [batch.span_id] * 6)
+        with open(exporter.path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line['name'] for line in lines].count('work'), 6)
+        self.assertEqual(lines[-1]['name'], 'batch')
+
+    def test_interleaved_with_profiler(self):
+        self.do_action.return_value = describe_disks_body(['d-1'])
+        original = ECSConnection.__dict__['get_all_volumes']
+        tracer = Tracer(self.exporter)
+        tracer.install()
+        profiler = footmark.profile()
+        profiler.start()
+        # The profiler wraps the tracer's patches, so it must be stopped first.
+        self.assertRaises(FootmarkClientError, tracer.uninstall)
+        self.service_connection.get_all_volumes(volume_ids=['d-1'])
+        profiler.stop()
+        self.assertTrue(profiler.root.children)
+        self.assertTrue(self.exporter.spans)
+        tracer.uninstall()
+        self.assertTrue(ECSConnection.__dict__['get_all_volumes'] is original)
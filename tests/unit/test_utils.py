@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+import threading
+
+from footmark.utils import run_concurrently
+from tests.compat import unittest
+
+
+class TestRunConcurrently(unittest.TestCase):
+
+    def test_first_error_in_input_order(self):
+        started = threading.Event()
+        calls = []
+
+        def func(item):
+            calls.append(item)
+            if item == 0:
+                # Fail only after a later item has failed.
+                started.wait(5)
+                raise ValueError(item)
+            if item == 2:
+                started.set()
+                raise KeyError(item)
+            return item
+
+        for max_workers in (1, 4):
+            del calls[:]
+            started.clear()
+            if max_workers == 1:
+                started.set()
+            self.assertRaises(ValueError, run_concurrently, func, range(4), max_workers)
+            self.assertEqual(sorted(calls), [0, 1, 2, 3])
+
+        self.assertEqual(run_concurrently(lambda item: item * 2, range(5), 3), [0, 2, 4, 6, 8])
@@ -558,3 +558,40 @@ class TestReleaseEip(ACSMockServiceTestCase):
         result = self.service_connection.releasing_eip(allocation_id=self.allocation_id)
         self.assertEqual(result[u'RequestId'], "5C3360D0-A873-4E83-AB23-E784247228E9")
 # endregion
+
+
+class TestProjectedRouteEntries(ACSMockServiceTestCase):
+    connection_class = VPCConnection
+
+    def default_body(self):
+        return '''
+{
+    "RequestId": "3A9B7C2D-1E4F-4A5B-8C6D-7E8F9A0B1C2D",
+    "RouteTables": {
+        "RouteTable": [
+            {
+                "RouteTableId": "vtb-j6c2tf8y4uxycfmqoyf0o",
+                "VRouterId": "vrt-j6c00qrol733dg36iq4qj",
+                "RouteEntrys": {
+                    "RouteEntry": [
+                        {
+                            "RouteTableId": "vtb-j6c2tf8y4uxycfmqoyf0o",
+                            "DestinationCidrBlock": "192.168.0.1/32",
+                            "InstanceId": "i-j6c3nt8kraa5uotd4j79",
+                            "NextHopType": "Instance",
+                            "Status": "Available",
+                            "Type": "Custom"
+                        }
+                    ]
+                }
+            }
+        ]
+    }
+}
+'''
+
+    def test_get_all_route_entries_fields(self):
+        self.service_connection.make_request.return_value = self.default_body()
+        entries = self.service_connection.get_all_route_entries(fields=['destination_cidrblock', 'status'])
+        self.assertEqual((entries[0].destination_cidr_block, entries[0].status), ('192.168.0.1/32', 'Available'))
+        self.assertRaises(AttributeError, getattr, entries[0], 'next_hop_type')